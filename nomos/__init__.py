@@ -6,9 +6,10 @@ Define your agent's persona, tools, and step-by-step flows in Python or YAML—p
 
 from .client import AuthConfig, NomosClient, NomosClientSync
 from .config import AgentConfig, ServerConfig
-from .core import Agent
-from .models.agent import Action, Route, State, Step, StepIdentifier, Summary
+from .core import Agent, AgentTool
+from .models.agent import Action, Route, RouteRule, State, Step, StepIdentifier, Summary
 from .models.flow import Flow, FlowComponent, FlowConfig, FlowContext, FlowManager
+from .pool import AgentPool
 from .server import run_server
 from .state_machine import StateMachine
 from .testing import smart_assert
@@ -19,6 +20,8 @@ __author__ = "DoWhile"
 
 __all__ = [
     "Agent",
+    "AgentPool",
+    "AgentTool",
     "AgentConfig",
     "ServerConfig",
     "Action",
@@ -26,6 +29,7 @@ __all__ = [
     "StepIdentifier",
     "Summary",
     "Route",
+    "RouteRule",
     "Flow",
     "FlowManager",
     "FlowContext",
@@ -0,0 +1,411 @@
+"""Semantic cache of approved answers for FAQ-style steps."""
+
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+from .models.agent import Decision
+from .utils.logging import log_debug
+from .utils.metrics import record_cache_hit
+
+
+class CachedAnswer(BaseModel):
+    """
+    An answer of a step, served to questions similar to the one it was given for.
+
+    Attributes:
+        answer_id (str): Unique identifier of the answer.
+        step_id (str): Step the answer was given in.
+        question (str): User input the answer was given for.
+        decision (Decision): The RESPOND decision returned on a hit.
+        approved (bool): Whether the answer may be served. Pending answers wait for approval.
+        hits (int): Number of times the answer was served by this process.
+        created_at (float): Unix time the answer was added.
+    """
+
+    answer_id: str = Field(default_factory=lambda: uuid.uuid4().hex)
+    step_id: str
+    question: str
+    decision: Decision
+    approved: bool = False
+    hits: int = 0
+    created_at: float = Field(default_factory=time.time)
+
+
+class AnswerCache:
+    """
+    Nearest-neighbour index of answers, searched with the embedding of the user input.
+
+    Answers are indexed per step in an in-memory matrix of normalized
+    embeddings, so a lookup is a single matrix-vector product. Only approved
+    answers are served; answers produced by the LLM are added as pending
+    unless ``auto_approve`` is set. Once ``maxsize`` answers are stored, the
+    oldest pending answers are dropped first, then the oldest approved ones.
+
+    With a ``path``, answers and approvals are stored in a SQLite file, so they
+    survive restarts and are shared by every process using the file, such as
+    the workers of an :class:`~nomos.pool.AgentPool`. When another process
+    changed the file, only the answers written since the last load are read
+    again. The async methods run file access in a worker thread.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.9,
+        maxsize: int = 10_000,
+        auto_approve: bool = False,
+        path: Optional[str] = None,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        :param threshold: Minimum cosine similarity between questions for a hit.
+        :param maxsize: Maximum number of answers kept.
+        :param auto_approve: Serve answers produced by the LLM without approval.
+        :param path: Optional SQLite file storing the answers.
+        """
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self.auto_approve = auto_approve
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._answers: "OrderedDict[str, CachedAnswer]" = OrderedDict()
+        self._embeddings: Dict[str, np.ndarray] = {}
+        # Per step: IDs of its answers and their stacked embeddings, rebuilt after changes
+        self._index: Dict[str, Tuple[List[str], np.ndarray]] = {}
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        # Version of the file the index was loaded from, and the last row read from it
+        self._version: Optional[int] = None
+        self._seq = 0
+        if path:
+            with self._lock:
+                self._sync()
+
+    def __len__(self) -> int:
+        """Get the number of stored answers."""
+        with self._lock:
+            self._sync()
+            return len(self._answers)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Pickle the settings, and the answers unless they are reloaded from the file."""
+        with self._lock:
+            answers = (
+                []
+                if self.path
+                else [(a, self._embeddings[a.answer_id]) for a in self._answers.values()]
+            )
+        return {
+            "threshold": self.threshold,
+            "maxsize": self.maxsize,
+            "auto_approve": self.auto_approve,
+            "path": self.path,
+            "answers": answers,
+        }
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Restore the cache with the same settings and answers."""
+        self.__init__(state["threshold"], state["maxsize"], state["auto_approve"], state["path"])
+        for answer, vector in state["answers"]:
+            self._answers[answer.answer_id] = answer
+            self._embeddings[answer.answer_id] = vector
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get the connection of the current process, opening it if needed."""
+        assert self.path, "Answer cache has no file"
+        if self._conn is None or self._pid != os.getpid():
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            # Every write gets a new seq, so rows written since a load are those above it
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS answers (seq INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "answer_id TEXT NOT NULL UNIQUE, answer TEXT NOT NULL, embedding BLOB NOT NULL)"
+            )
+            self._pid = os.getpid()
+            self._version = None
+        return self._conn
+
+    def _sync(self) -> None:
+        """Load the answers other connections wrote or removed since the last load."""
+        if not self.path:
+            return
+        conn = self._connection()
+        version = conn.execute("PRAGMA data_version").fetchone()[0]
+        if version == self._version:
+            return
+        conn.execute("BEGIN")
+        try:
+            for seq, answer_id, data, embedding in conn.execute(
+                "SELECT seq, answer_id, answer, embedding FROM answers WHERE seq > ? ORDER BY seq",
+                (self._seq,),
+            ):
+                answer = CachedAnswer.model_validate_json(data)
+                previous = self._answers.get(answer_id)
+                if previous is not None:
+                    answer.hits = previous.hits
+                    self._index.pop(previous.step_id, None)
+                self._answers[answer_id] = answer
+                self._embeddings[answer_id] = np.frombuffer(embedding, dtype=np.float32)
+                self._index.pop(answer.step_id, None)
+                self._seq = seq
+            # Every stored answer is now loaded, so fewer rows means some were removed
+            if conn.execute("SELECT COUNT(*) FROM answers").fetchone()[0] != len(self._answers):
+                stored = {row[0] for row in conn.execute("SELECT answer_id FROM answers")}
+                for answer_id in [i for i in self._answers if i not in stored]:
+                    self._drop(answer_id)
+        finally:
+            conn.execute("COMMIT")
+        self._version = version
+
+    def _store(self, answer: CachedAnswer) -> None:
+        """Write an answer to the file, if any."""
+        if self.path:
+            cursor = self._connection().execute(
+                "INSERT OR REPLACE INTO answers (answer_id, answer, embedding) VALUES (?, ?, ?)",
+                (
+                    answer.answer_id,
+                    answer.model_dump_json(exclude={"hits"}),
+                    self._embeddings[answer.answer_id].tobytes(),
+                ),
+            )
+            # Skip reading the row back unless another connection wrote in between
+            if cursor.lastrowid == self._seq + 1:
+                self._seq = cursor.lastrowid
+
+    def _step_index(self, step_id: str) -> Tuple[List[str], np.ndarray]:
+        """Get the answer IDs and embedding matrix of a step, building them if needed."""
+        index = self._index.get(step_id)
+        if index is None:
+            ids = [a.answer_id for a in self._answers.values() if a.step_id == step_id]
+            matrix = (
+                np.stack([self._embeddings[answer_id] for answer_id in ids])
+                if ids
+                else np.empty((0, 0))
+            )
+            index = self._index[step_id] = (ids, matrix)
+        return index
+
+    def _nearest(
+        self, step_id: str, vector: np.ndarray, approved_only: bool
+    ) -> Optional[CachedAnswer]:
+        """Get the most similar answer of a step above the threshold."""
+        ids, matrix = self._step_index(step_id)
+        if not ids or matrix.shape[1] != vector.shape[0]:
+            return None
+        scores = matrix @ vector
+        for i in np.argsort(-scores):
+            if scores[i] < self.threshold:
+                break
+            answer = self._answers[ids[i]]
+            if answer.approved or not approved_only:
+                return answer
+        return None
+
+    @staticmethod
+    def _normalize(embedding: List[float]) -> np.ndarray:
+        """Convert an embedding to a unit vector."""
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def search(self, step_id: str, embedding: List[float]) -> Optional[Decision]:
+        """
+        Find the approved answer to the most similar question of a step.
+
+        :param step_id: Step the question is asked in.
+        :param embedding: Embedding of the question.
+        :return: A copy of the answer's decision, or None if no question is similar enough.
+        """
+        vector = self._normalize(embedding)
+        with self._lock:
+            self._sync()
+            answer = self._nearest(step_id, vector, approved_only=True)
+            if answer is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            answer.hits += 1
+        record_cache_hit()
+        log_debug(f"Answer cache hit in step {step_id}: {answer.question}")
+        return answer.decision.model_copy(deep=True)
+
+    async def asearch(self, step_id: str, embedding: List[float]) -> Optional[Decision]:
+        """Find an approved answer without blocking the event loop (see :meth:`search`)."""
+        if self.path:
+            return await asyncio.to_thread(self.search, step_id, embedding)
+        return self.search(step_id, embedding)
+
+    def add(
+        self,
+        step_id: str,
+        question: str,
+        embedding: List[float],
+        decision: Decision,
+        approved: Optional[bool] = None,
+    ) -> CachedAnswer:
+        """
+        Add an answer to a question.
+
+        An answer to a question similar to one already stored is not added again.
+
+        :param step_id: Step the answer was given in.
+        :param question: The user input answered.
+        :param embedding: Embedding of the question.
+        :param decision: The RESPOND decision to serve.
+        :param approved: Whether to serve the answer. Defaults to ``auto_approve``.
+        :return: The stored answer, or the existing answer to a similar question.
+        """
+        vector = self._normalize(embedding)
+        with self._lock:
+            self._sync()
+            existing = self._nearest(step_id, vector, approved_only=False)
+            if existing is not None:
+                return existing
+            answer = CachedAnswer(
+                step_id=step_id,
+                question=question,
+                decision=decision,
+                approved=self.auto_approve if approved is None else approved,
+            )
+            self._answers[answer.answer_id] = answer
+            self._embeddings[answer.answer_id] = vector
+            self._index.pop(step_id, None)
+            self._store(answer)
+            if len(self._answers) > self.maxsize:
+                self._evict()
+            return answer
+
+    async def aadd(
+        self,
+        step_id: str,
+        question: str,
+        embedding: List[float],
+        decision: Decision,
+        approved: Optional[bool] = None,
+    ) -> CachedAnswer:
+        """Add an answer without blocking the event loop (see :meth:`add`)."""
+        if self.path:
+            return await asyncio.to_thread(
+                self.add, step_id, question, embedding, decision, approved
+            )
+        return self.add(step_id, question, embedding, decision, approved)
+
+    def _evict(self) -> None:
+        """Drop the oldest answer, preferring pending ones."""
+        answer_id = next(
+            (a.answer_id for a in self._answers.values() if not a.approved),
+            next(iter(self._answers)),
+        )
+        self._remove(answer_id)
+
+    def _drop(self, answer_id: str) -> None:
+        """Remove an answer from the index, leaving the file as is."""
+        answer = self._answers.pop(answer_id)
+        del self._embeddings[answer_id]
+        self._index.pop(answer.step_id, None)
+
+    def _remove(self, answer_id: str) -> None:
+        """Remove an answer from the index and the file."""
+        self._drop(answer_id)
+        if self.path:
+            self._connection().execute("DELETE FROM answers WHERE answer_id = ?", (answer_id,))
+
+    def approve(self, answer_id: str) -> bool:
+        """
+        Approve an answer so it is served.
+
+        :param answer_id: ID of the answer.
+        :return: True if the answer exists.
+        """
+        with self._lock:
+            self._sync()
+            answer = self._answers.get(answer_id)
+            if answer is None:
+                return False
+            answer.approved = True
+            self._store(answer)
+            return True
+
+    def invalidate(self, step_id: Optional[str] = None, answer_id: Optional[str] = None) -> int:
+        """
+        Remove cached answers.
+
+        :param step_id: Only remove the answers of this step.
+        :param answer_id: Only remove this answer.
+        :return: Number of answers removed.
+        """
+        with self._lock:
+            self._sync()
+            ids = [
+                a.answer_id
+                for a in self._answers.values()
+                if (step_id is None or a.step_id == step_id)
+                and (answer_id is None or a.answer_id == answer_id)
+            ]
+            for i in ids:
+                self._remove(i)
+            return len(ids)
+
+    def answers(
+        self, step_id: Optional[str] = None, approved: Optional[bool] = None
+    ) -> List[CachedAnswer]:
+        """
+        List the cached answers.
+
+        :param step_id: Only list the answers of this step.
+        :param approved: Only list approved (True) or pending (False) answers.
+        :return: The answers, oldest first.
+        """
+        with self._lock:
+            self._sync()
+            return [
+                a
+                for a in self._answers.values()
+                if (step_id is None or a.step_id == step_id)
+                and (approved is None or a.approved == approved)
+            ]
+
+
+class AnswerCacheConfig(BaseModel):
+    """
+    Configuration of the semantic answer cache.
+
+    Attributes:
+        threshold (float): Minimum cosine similarity between questions for a hit.
+        maxsize (int): Maximum number of answers kept.
+        auto_approve (bool): Serve answers produced by the LLM without approval.
+        path (Optional[str]): Optional SQLite file storing answers and approvals across restarts
+            and processes. Required to review answers served by process workers.
+    """
+
+    threshold: float = 0.9
+    maxsize: int = 10_000
+    auto_approve: bool = False
+    path: Optional[str] = None
+
+    def get_cache(self) -> AnswerCache:
+        """
+        Create the configured answer cache.
+
+        :return: An AnswerCache instance.
+        """
+        return AnswerCache(
+            threshold=self.threshold,
+            maxsize=self.maxsize,
+            auto_approve=self.auto_approve,
+            path=self.path,
+        )
+
+
+__all__ = ["AnswerCache", "AnswerCacheConfig", "CachedAnswer"]
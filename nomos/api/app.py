@@ -1,19 +1,24 @@
 """Nomos Agent API."""
 
+import asyncio
+import hmac
 import pathlib
 import time
 from contextlib import asynccontextmanager
-from typing import Any, AsyncGenerator, Dict, List, Optional, Union
+from typing import Any, AsyncGenerator, Awaitable, Dict, List, Optional, Tuple, TypeVar, Union
 
 import redis.asyncio as redis
-from fastapi import Depends, FastAPI, HTTPException, Request, status
+from fastapi import Depends, FastAPI, HTTPException, Request, Response, status
 from fastapi.responses import HTMLResponse
 from fastapi.security import HTTPAuthorizationCredentials
 from fastapi.staticfiles import StaticFiles
 from fastapi_limiter import FastAPILimiter
 from fastapi_limiter.depends import RateLimiter
 
-from ..models.agent import Event, StepIdentifier, Summary
+from ..answers import AnswerCache
+from ..core import Agent, Session
+from ..models.agent import Event, StepIdentifier, Summary, TurnBudget, TurnMetrics
+from ..pool import AgentPool
 from .agent import agent, config
 from .db import init_db
 from .models import ChatRequest, ChatResponse, Message, SessionResponse
@@ -25,8 +30,12 @@ from .sessions import SessionStore, create_session_store
 
 session_store: Optional[SessionStore] = None
 security_manager: Optional[SecurityManager] = None
+agent_pool: Optional[AgentPool] = None
 
 BASE_DIR = pathlib.Path(__file__).parent.absolute()
+DISCONNECT_POLL_INTERVAL = 0.5  # Seconds between client disconnect checks while a turn runs
+
+T = TypeVar("T")
 
 deps = (
     [
@@ -45,7 +54,10 @@ deps = (
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Lifespan context manager for FastAPI app."""
-    global session_store, security_manager
+    global session_store, security_manager, agent_pool
+    # Fork the turn workers first, while the server process has no other threads
+    if config.server.process_workers > 0:
+        agent_pool = AgentPool(agent, workers=config.server.process_workers)
     # Initialize database
     await init_db()
     session_store = await create_session_store(config.server.session)
@@ -69,6 +81,9 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         await security_manager.close()
     if redis_client:
         await FastAPILimiter.close()
+    if agent_pool:
+        agent_pool.close()
+        agent_pool = None
 
 
 app = FastAPI(title=f"{config.name}-api", lifespan=lifespan)
@@ -101,6 +116,101 @@ async def authenticate_request(request: Request) -> Dict[str, Any]:
         )
 
 
+async def authenticate_admin(request: Request) -> None:
+    """
+    Authenticate a request to the answer cache admin endpoints.
+
+    These endpoints use their own key, sent in the ``X-Admin-Key`` header, so
+    chat clients cannot approve or remove answers. They are not served (404)
+    unless ``admin_api_key`` is configured.
+    """
+    admin_key = config.server.security.admin_api_key
+    if not admin_key:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    given = request.headers.get("x-admin-key", "")
+    if not hmac.compare_digest(given.encode(), admin_key.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid admin credentials"
+        )
+
+
+async def run_until_disconnected(request: Request, awaitable: Awaitable[T]) -> T:
+    """
+    Await a turn, cancelling it if the client disconnects before it completes.
+
+    :param request: The incoming request.
+    :param awaitable: The work to run for the request.
+    :return: The result of the awaitable.
+    :raises HTTPException: 499 if the client disconnected.
+    """
+    task = asyncio.ensure_future(awaitable)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_INTERVAL)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                raise HTTPException(status_code=499, detail="Client disconnected")
+    finally:
+        if not task.done():
+            task.cancel()
+
+
+async def save_session(session_id: str, session: Session, metrics: Optional[TurnMetrics]) -> None:
+    """Persist a session, recording the time taken in the turn's metrics."""
+    assert session_store is not None, "Session store not initialized"
+    started = time.perf_counter()
+    await session_store.set(session_id, session)
+    if metrics is not None:
+        metrics.timings["persistence"] = time.perf_counter() - started
+
+
+def set_server_timing(response: Response, metrics: Optional[TurnMetrics]) -> None:
+    """Expose the turn's stage timings in a ``Server-Timing`` header."""
+    if metrics is not None and metrics.timings:
+        response.headers["Server-Timing"] = metrics.server_timing()
+
+
+def request_budget(request_obj: ChatRequest) -> Optional[TurnBudget]:
+    """
+    Get the turn budget of a chat request with its own timeout.
+
+    A request may shorten the configured turn timeout, but never extend or remove it.
+
+    :param request_obj: The chat request.
+    :return: The budget with the request's timeout, or None to use the configured one.
+    """
+    if request_obj.timeout is None:
+        return None
+    timeout = request_obj.timeout
+    if config.turn_budget.timeout is not None:
+        timeout = min(timeout, config.turn_budget.timeout)
+    return config.turn_budget.model_copy(update={"timeout": timeout})
+
+
+def run_chat_turn(agent: Agent, body: bytes, verbose: bool) -> Tuple[bytes, str]:
+    """
+    Run a ``/chat`` turn in an agent pool worker.
+
+    Parses the request and serializes the response in the worker, so the
+    server process only moves bytes.
+
+    :param agent: The worker's agent.
+    :param body: Raw JSON body of the chat request.
+    :param verbose: Whether to print verbose output.
+    :return: JSON of the chat response and its ``Server-Timing`` header value.
+    """
+    request_obj = ChatRequest.model_validate_json(body)
+    budget = request_budget(request_obj)
+    res = agent.next(**request_obj.model_dump(exclude={"timeout"}), verbose=verbose, budget=budget)
+    content = ChatResponse(
+        response=res.decision.model_dump(mode="json"),
+        tool_output=res.tool_output,
+        session_data=res.state,
+    ).model_dump_json()
+    return content.encode(), res.metrics.server_timing() if res.metrics else ""
+
+
 # Serve chat UI at root
 @app.get("/", response_class=HTMLResponse)
 async def get_chat_ui() -> HTMLResponse:
@@ -144,6 +254,7 @@ if (
 @app.post("/session", response_model=SessionResponse, dependencies=deps)
 async def create_session(
     request: Request,
+    response: Response,
     initiate: Optional[bool] = False,
 ) -> SessionResponse:
     """Create a new session."""
@@ -156,8 +267,9 @@ async def create_session(
     await session_store.set(session_id, session)
     # Get initial message from agent
     if initiate:
-        res = session.next(None)
-        await session_store.set(session_id, session)
+        res = await run_until_disconnected(request, session.anext(None))
+        await save_session(session_id, session, res.metrics)
+        set_server_timing(response, res.metrics)
     return SessionResponse(
         session_id=session_id,
         message=(
@@ -173,6 +285,7 @@ async def send_message(
     id: str,
     message: Message,
     request: Request,
+    response: Response,
 ) -> SessionResponse:
     """Send a message to an existing session."""
     # Handle authentication
@@ -183,8 +296,9 @@ async def send_message(
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    res = session.next(message.content)
-    await session_store.set(id, session)
+    res = await run_until_disconnected(request, session.anext(message.content))
+    await save_session(id, session, res.metrics)
+    set_server_timing(response, res.metrics)
     return SessionResponse(session_id=id, message=res.decision.model_dump(mode="json"))
 
 
@@ -235,13 +349,26 @@ async def get_session_history(
 async def chat(
     request_obj: ChatRequest,
     request: Request,
+    response: Response,
     verbose: bool = False,
-) -> ChatResponse:
+) -> Union[ChatResponse, Response]:
     """Chat endpoint to get the next response from the agent based on the session data."""
     # Handle authentication
     await authenticate_request(request)
 
-    res = agent.next(**request_obj.model_dump(), verbose=verbose)
+    if agent_pool is not None:
+        content, server_timing = await run_until_disconnected(
+            request, agent_pool.arun(run_chat_turn, await request.body(), verbose)
+        )
+        headers = {"Server-Timing": server_timing} if server_timing else None
+        return Response(content=content, media_type="application/json", headers=headers)
+
+    budget = request_budget(request_obj)
+    res = await run_until_disconnected(
+        request,
+        agent.anext(**request_obj.model_dump(exclude={"timeout"}), verbose=verbose, budget=budget),
+    )
+    set_server_timing(response, res.metrics)
     return ChatResponse(
         response=res.decision.model_dump(mode="json"),
         tool_output=res.tool_output,
@@ -249,6 +376,60 @@ async def chat(
     )
 
 
+def get_answer_cache() -> AnswerCache:
+    """
+    Get the agent's answer cache, or fail with 404 if none is configured.
+
+    Process workers each hold their own copy of the cache, so with a pool only
+    a cache stored in a file can be reviewed; otherwise the request fails with 409.
+    """
+    if agent.answer_cache is None:
+        raise HTTPException(status_code=404, detail="Answer cache not configured")
+    if agent_pool is not None and not agent.answer_cache.path:
+        raise HTTPException(
+            status_code=409,
+            detail="Answer cache must be stored in a file (answer_cache.path) with process workers",
+        )
+    return agent.answer_cache
+
+
+@app.get("/answers", dependencies=deps)
+async def list_answers(
+    request: Request,
+    step_id: Optional[str] = None,
+    approved: Optional[bool] = None,
+) -> dict:
+    """List the answers in the answer cache, optionally of a step or approval status."""
+    await authenticate_admin(request)
+    answers = get_answer_cache().answers(step_id=step_id, approved=approved)
+    return {"answers": [answer.model_dump(mode="json") for answer in answers]}
+
+
+@app.post("/answers/{answer_id}/approve", dependencies=deps)
+async def approve_answer(answer_id: str, request: Request) -> dict:
+    """Approve a pending answer so it is served to similar questions."""
+    await authenticate_admin(request)
+    if not get_answer_cache().approve(answer_id):
+        raise HTTPException(status_code=404, detail="Answer not found")
+    return {"message": "Answer approved"}
+
+
+@app.delete("/answers/{answer_id}", dependencies=deps)
+async def delete_answer(answer_id: str, request: Request) -> dict:
+    """Remove an answer from the answer cache."""
+    await authenticate_admin(request)
+    if not get_answer_cache().invalidate(answer_id=answer_id):
+        raise HTTPException(status_code=404, detail="Answer not found")
+    return {"removed": 1}
+
+
+@app.delete("/answers", dependencies=deps)
+async def invalidate_answers(request: Request, step_id: Optional[str] = None) -> dict:
+    """Remove all answers from the answer cache, or only those of a step."""
+    await authenticate_admin(request)
+    return {"removed": get_answer_cache().invalidate(step_id=step_id)}
+
+
 if __name__ == "__main__":
     import sys
 
@@ -25,6 +25,7 @@ class ChatRequest(BaseModel):
 
     user_input: Optional[str] = None
     session_data: Optional[State] = None
+    timeout: Optional[float] = None  # Shortens the configured turn timeout (seconds)
 
 
 class ChatResponse(BaseModel):
@@ -0,0 +1,229 @@
+"""Immutable, precomputed view of an agent's steps shared by all of its sessions."""
+
+from collections import deque
+from dataclasses import dataclass, replace
+from types import MappingProxyType
+from typing import Dict, FrozenSet, List, Mapping, Optional, Tuple
+
+from .llms import LLMBase
+from .models.agent import Route, Step
+from .models.tool import MCPServer, Tool
+from .utils.logging import log_error
+
+
+@dataclass(frozen=True)
+class CompiledStep:
+    """
+    Precomputed lookup tables for a single step.
+
+    Attributes:
+        step (Step): The step definition.
+        routes (Tuple[str, ...]): Route targets, in declaration order.
+        route_set (FrozenSet[str]): Route targets, for membership checks.
+        rule_routes (Tuple[Route, ...]): Routes with a machine-evaluable rule, in declaration order.
+        tool_ids (Tuple[str, ...]): Names of the step's regular (non-deferred) tools.
+        deferred_tool_ids (Tuple[str, ...]): Identifiers of the step's deferred tools.
+        tools (Tuple[Tool, ...]): Resolved regular tools.
+        deferred_servers (Tuple[MCPServer, ...]): MCP servers whose tools are loaded at runtime.
+        prompt (Optional[str]): Static part of the step's system prompt (persona, instructions,
+            routes and tools), if compiled with the agent's LLMs.
+    """
+
+    step: Step
+    routes: Tuple[str, ...]
+    route_set: FrozenSet[str]
+    rule_routes: Tuple[Route, ...]
+    tool_ids: Tuple[str, ...]
+    deferred_tool_ids: Tuple[str, ...]
+    tools: Tuple[Tool, ...]
+    deferred_servers: Tuple[MCPServer, ...]
+    prompt: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class PromptInfo:
+    """
+    Compiled static system prompt of a step.
+
+    Attributes:
+        step_id (str): ID of the step.
+        prompt (str): The prompt, without the per-turn examples and history.
+        chars (int): Length of the prompt in characters.
+        tokens (int): Length of the prompt in tokens of the step's LLM.
+    """
+
+    step_id: str
+    prompt: str
+    chars: int
+    tokens: int
+
+
+@dataclass(frozen=True)
+class CompiledAgent:
+    """
+    Read-only step, route and tool tables compiled once per agent.
+
+    Sessions only read from it; anything that changes during a session (deferred
+    tools, the current step, flow context) lives on the session itself, so a
+    single compiled agent can serve many sessions concurrently.
+    """
+
+    steps: Mapping[str, CompiledStep]
+    transitions: Mapping[str, Tuple[str, ...]]
+    route_sets: Mapping[str, FrozenSet[str]]
+    paths: Mapping[str, Mapping[str, Tuple[str, ...]]]
+
+    def __post_init__(self) -> None:
+        """Wrap the tables in read-only views."""
+        for name in ("steps", "transitions", "route_sets"):
+            object.__setattr__(self, name, MappingProxyType(dict(getattr(self, name))))
+        paths = {k: MappingProxyType(dict(v)) for k, v in self.paths.items()}
+        object.__setattr__(self, "paths", MappingProxyType(paths))
+
+    def __reduce__(self) -> tuple:
+        """Pickle the tables as plain dictionaries (mapping proxies are not picklable)."""
+        return (
+            self.__class__,
+            (
+                dict(self.steps),
+                dict(self.transitions),
+                dict(self.route_sets),
+                {step_id: dict(paths) for step_id, paths in self.paths.items()},
+            ),
+        )
+
+    @staticmethod
+    def _shortest_paths(
+        transitions: Mapping[str, Tuple[str, ...]],
+        pass_through: FrozenSet[str] = frozenset(),
+    ) -> Dict[str, Dict[str, Tuple[str, ...]]]:
+        """
+        Compute the reachability table: shortest route paths from each step to the steps it reaches.
+
+        Paths list the steps moved through, ending with the target. Among paths of
+        equal length the one following routes in declaration order wins. Only
+        ``pass_through`` steps are crossed; any other step ends a path, so its
+        tools and rules are never skipped.
+        """
+        table: Dict[str, Dict[str, Tuple[str, ...]]] = {}
+        for source in transitions:
+            paths: Dict[str, Tuple[str, ...]] = {}
+            queue = deque([(source, ())])
+            while queue:
+                step_id, path = queue.popleft()
+                for target in transitions.get(step_id, ()):
+                    if target != source and target not in paths:
+                        paths[target] = path + (target,)
+                        if target in pass_through:
+                            queue.append((target, paths[target]))
+            table[source] = paths
+        return table
+
+    @classmethod
+    def compile(
+        cls,
+        steps: Dict[str, Step],
+        tools: Optional[Dict[str, Tool]] = None,
+        llms: Optional[Dict[str, LLMBase]] = None,
+        system_message: Optional[str] = None,
+        persona: Optional[str] = None,
+        max_move_hops: int = 1,
+    ) -> "CompiledAgent":
+        """
+        Compile steps against the agent's tools.
+
+        :param steps: Dictionary of step_id to Step.
+        :param tools: Dictionary of tool name to Tool (or MCPServer for deferred tools).
+            If omitted, only the route tables are compiled.
+        :param llms: Optional LLMs of the agent (``global`` and per-step overrides). If given,
+            the static system prompt of each step is compiled with the step's LLM.
+        :param system_message: Optional system message of the agent.
+        :param persona: Optional persona of the agent.
+        :param max_move_hops: Maximum number of steps a single MOVE may cross.
+        :return: CompiledAgent instance.
+        """
+        compiled: Dict[str, CompiledStep] = {}
+        for step_id, step in steps.items():
+            routes = tuple(step.get_available_routes())
+            tool_ids = tuple(dict.fromkeys(step.tool_ids))
+            deferred_tool_ids = tuple(dict.fromkeys(step.deferred_tool_ids))
+
+            resolved: List[Tool] = []
+            servers: List[MCPServer] = []
+            if tools is not None:
+                for tool_id in tool_ids:
+                    tool = tools.get(tool_id)
+                    if not tool:
+                        log_error(f"Tool '{tool_id}' not found in session tools. Skipping.")
+                        continue
+                    resolved.append(tool)
+
+                for tool_id in deferred_tool_ids:
+                    server = tools.get(tool_id)
+                    if not server:
+                        log_error(
+                            f"Deferred tool '{tool_id}' not found in session tools. Skipping."
+                        )
+                        continue
+                    if isinstance(server, MCPServer):
+                        servers.append(server)
+
+            compiled[step_id] = CompiledStep(
+                step=step,
+                routes=routes,
+                route_set=frozenset(routes),
+                rule_routes=tuple(route for route in step.routes if route.rule),
+                tool_ids=tool_ids,
+                deferred_tool_ids=deferred_tool_ids,
+                tools=tuple(resolved),
+                deferred_servers=tuple(servers),
+            )
+
+        transitions = {k: v.routes for k, v in compiled.items()}
+        paths = cls._shortest_paths(
+            transitions, frozenset(k for k, v in compiled.items() if v.step.pass_through)
+        )
+        if llms is not None and tools is not None:
+            for step_id, step in steps.items():
+                llm = llms.get(step.llm or "global", llms["global"])
+                if not isinstance(llm, LLMBase):
+                    continue
+                move_paths = (
+                    {t: p for t, p in paths[step_id].items() if len(p) <= max_move_hops}
+                    if max_move_hops > 1
+                    else None
+                )
+                prompt = llm.compile_system_prompt(
+                    steps=steps,
+                    current_step=step,
+                    tools=tools,
+                    system_message=system_message,
+                    persona=persona,
+                    move_paths=move_paths,
+                )
+                compiled[step_id] = replace(compiled[step_id], prompt=prompt)
+        return cls(
+            steps=compiled,
+            transitions=transitions,
+            route_sets={k: v.route_set for k, v in compiled.items()},
+            paths=paths,
+        )
+
+    def reachable(self, step_id: str, max_hops: int) -> Dict[str, Tuple[str, ...]]:
+        """
+        Get the steps reachable from a step within a number of moves.
+
+        :param step_id: The step to move from.
+        :param max_hops: Maximum number of moves.
+        :return: Target step ID to the path moved through, nearest targets first.
+        """
+        return {
+            target: path for target, path in self.paths[step_id].items() if len(path) <= max_hops
+        }
+
+    def __getitem__(self, step_id: str) -> CompiledStep:
+        """Get the compiled step for the given step ID."""
+        return self.steps[step_id]
+
+
+__all__ = ["CompiledAgent", "CompiledStep", "PromptInfo"]
@@ -11,9 +11,10 @@ from typing import Callable, Dict, List, Literal, Optional, Union
 from pydantic import BaseModel, Field
 from pydantic_settings import BaseSettings
 
-from .llms import LLMBase, LLMConfig
+from .answers import AnswerCacheConfig
+from .llms import EmbeddingCacheConfig, LLMBase, LLMConfig, ResponseCacheConfig
 from .memory import MemoryConfig
-from .models.agent import Step
+from .models.agent import ReasoningMode, Step, TurnBudget
 from .models.flow import FlowConfig
 from .models.tool import ToolDef, ToolWrapper
 from .utils.utils import convert_camelcase_to_snakecase
@@ -72,6 +73,9 @@ class ServerSecurity(BaseModel):
     enable_csrf_protection: bool = False  # Flag to enable CSRF protection
     csrf_secret_key: Optional[str] = None  # Secret key for CSRF protection
 
+    # Answer cache review configuration
+    admin_api_key: Optional[str] = None  # Key of the /answers endpoints (X-Admin-Key header)
+
     # Development/Testing configuration
     enable_token_endpoint: bool = (
         False  # Flag to enable JWT token generation endpoint (dev/test only)
@@ -84,6 +88,7 @@ class ServerConfig(BaseModel):
     port: int = 8000
     host: str = "0.0.0.0"
     workers: int = 1
+    process_workers: int = 0  # Worker processes running /chat turns (0 = in the server process)
     security: ServerSecurity = ServerSecurity()
     session: SessionConfig = SessionConfig()
 
@@ -228,8 +233,24 @@ class AgentConfig(BaseSettings):
         max_examples (int): Maximum number of examples to use in decision-making.
         threshold (float): Minimum similarity score to include an example.
         max_iter (int): Maximum number of iterations allowed.
+        turn_budget (TurnBudget): Per-turn limits on LLM calls, tool calls and wall time.
+        max_tool_concurrency (int): Maximum number of tool calls from one decision run at the same time.
+        speculative (bool): Precompute the next decision's tools and schema while tools run.
+        session_pool_size (int): Idle session shells kept for reuse by stateless requests.
+        llm_requests_per_minute (Optional[float]): Client-side limit on decision requests sent to the LLM, shared by all sessions
+            and split between AgentPool workers.
+        max_move_hops (int): Maximum number of steps a single MOVE decision may cross, walking the shortest route path
+            through ``pass_through`` steps.
+        reasoning (ReasoningMode): Reasoning asked for in decisions: ``full`` step by step, ``brief`` bullets or ``none``.
+        max_reasoning_steps (int): Maximum number of reasoning bullets in ``brief`` mode.
+        repair_decisions (bool): Fix invalid decisions locally (missing fields, tool argument types and defaults) before asking the LLM
+            again. Off by default.
+        schema_cache_size (int): Maximum number of decision models cached per agent.
         llm (Optional[LLMConfig]): Optional LLM configuration.
         embedding_model (Optional[LLMConfig]): Optional embedding model configuration.
+        embedding_cache (Optional[EmbeddingCacheConfig]): Optional cache of the embedding model's embeddings (examples, history, answer cache).
+        response_cache (Optional[ResponseCacheConfig]): Optional cache of LLM decisions, used by steps that enable ``cache`` in their overrides.
+        answer_cache (Optional[AnswerCacheConfig]): Optional semantic cache of approved answers, used by steps that enable ``answer_cache`` in their overrides.
         memory (Optional[MemoryConfig]): Optional memory configuration.
         flows (Optional[List[FlowConfig]]): Optional flow configurations.
         server (ServerConfig): Configuration for the FastAPI server.
@@ -250,9 +271,22 @@ class AgentConfig(BaseSettings):
     max_iter: int = 10
     max_examples: int = 5  # Maximum number of examples to use in decision-making
     threshold: float = 0.5  # Minimum similarity score to include an example
+    turn_budget: TurnBudget = TurnBudget()  # Per-turn limits for the decision loop
+    max_tool_concurrency: int = 4  # Parallel tool calls run at once for a single decision
+    speculative: bool = False  # Prefetch next decision inputs while tools run
+    session_pool_size: int = 16  # Idle sessions reused across stateless requests
+    llm_requests_per_minute: Optional[float] = None  # Shared LLM decision rate limit
+    max_move_hops: int = 1  # Steps a single MOVE may cross (1 = direct routes only)
+    reasoning: ReasoningMode = "full"  # Decision reasoning (overridable per step)
+    max_reasoning_steps: int = 3  # Bullets allowed in brief reasoning mode
+    repair_decisions: bool = False  # Fix invalid decisions locally before retrying
+    schema_cache_size: int = 1024  # Decision models kept per agent (bounded LRU)
 
     llm: Optional[LLMConfig | Dict[str, LLMConfig]] = None  # Optional LLM configuration
     embedding_model: Optional[LLMConfig] = None  # Optional embedding model configuration
+    embedding_cache: Optional[EmbeddingCacheConfig] = None  # Cache of computed embeddings
+    response_cache: Optional[ResponseCacheConfig] = None  # Exact-match LLM decision cache
+    answer_cache: Optional[AnswerCacheConfig] = None  # Semantic cache of approved answers
     memory: Optional[MemoryConfig] = None  # Optional memory configuration
     flows: Optional[List[FlowConfig]] = None  # Optional flow configurations
 
@@ -1,13 +1,41 @@
 """Core models and logic for the Nomos package, including flow management and session handling."""
 
 import asyncio
+import contextvars
+import copy
 import os
 import pickle
+import threading
+import time
 import uuid
-from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
+
+from pydantic import BaseModel
 
+from .answers import AnswerCache
+from .compiled import CompiledAgent, PromptInfo
 from .config import AgentConfig
-from .llms import LLMBase
+from .llms import LLMBase, ResponseCache
 from .memory.base import Memory
 from .memory.flow import FlowMemoryComponent
 from .models.agent import (
@@ -15,12 +43,18 @@ from .models.agent import (
     Decision,
     DecisionConstraints,
     Event,
+    Message,
     Response,
     State,
     Step,
     StepIdentifier,
+    ToolCall,
+    TurnBudget,
+    TurnMetrics,
+    TurnStats,
+    TurnTimeoutError,
 )
-from .models.flow import Flow
+from .models.flow import Flow, FlowManager
 from .models.tool import (
     FallbackError,
     InvalidArgumentsError,
@@ -29,9 +63,114 @@ from .models.tool import (
     ToolWrapper,
     get_tools,
 )
+from .schemas import SchemaRegistry
 from .state_machine import StateMachine
+from .testing.tape import Tape, TapeLLM
+from .utils.bindings import UnresolvedBinding, resolve_binding
+from .utils.executor import SharedExecutor
 from .utils.flow_utils import create_flows_from_config
 from .utils.logging import log_debug, log_error, pp_response
+from .utils.metrics import atimed_iter, collect, timed, timed_iter
+from .utils.ratelimit import RateLimiter
+from .utils.repair import DEFAULT_REPAIRERS, DecisionRepairer, RepairContext, repair_decision
+from .utils.streaming import ResponseStreamParser
+
+
+@dataclass
+class _Decide:
+    """Turn effect: ask the LLM for the next decision."""
+
+    constraints: Optional[DecisionConstraints] = None
+
+
+@dataclass
+class _LookupAnswer:
+    """
+    Turn effect: embed the user input and search the answer cache.
+
+    Sends back the cached decision, or None, and the embedding of the input.
+    """
+
+    question: str
+
+
+@dataclass
+class _StoreAnswer:
+    """Turn effect: add the answer to a user input to the answer cache."""
+
+    question: str
+    embedding: List[float]
+    decision: Decision
+
+
+@dataclass
+class _CallTool:
+    """Turn effect: run a tool and send back its result."""
+
+    tool_name: str
+    kwargs: Dict[str, Any]
+
+
+@dataclass
+class _CallTools:
+    """Turn effect: run independent tools concurrently and send back their outcomes."""
+
+    calls: List[Tuple[str, Dict[str, Any]]]
+
+
+@dataclass
+class _Remember:
+    """Turn effect: add an event or step identifier to memory."""
+
+    item: Union[Event, StepIdentifier]
+
+
+@dataclass
+class _FlowTransitions:
+    """Turn effect: enter or exit flows for a step."""
+
+    step_id: str
+    verbose: bool = False
+
+
+@dataclass
+class _ExitFlow:
+    """Turn effect: exit the current flow at a step."""
+
+    step_id: str
+
+
+TurnEffect = Union[
+    _Decide,
+    _LookupAnswer,
+    _StoreAnswer,
+    _CallTool,
+    _CallTools,
+    _Remember,
+    _FlowTransitions,
+    _ExitFlow,
+]
+Turn = Generator[TurnEffect, Any, Response]
+
+# Effects that may block on a provider or tool, and so run under the turn's deadline.
+# Bookkeeping effects are quick and run inline so they never outlive the turn.
+_DEADLINE_EFFECTS = (_Decide, _LookupAnswer, _CallTool, _CallTools)
+
+# Session whose tool call is running, so agent tools know who is delegating
+_calling_session: contextvars.ContextVar[Optional["Session"]] = contextvars.ContextVar(
+    "nomos_calling_session", default=None
+)
+
+# Set once the turn stops waiting for the effect running in this context
+_abandoned: contextvars.ContextVar[Optional[threading.Event]] = contextvars.ContextVar(
+    "nomos_abandoned", default=None
+)
+
+
+def _is_abandoned() -> bool:
+    """Check whether the turn gave up on the effect running in this context."""
+    event = _abandoned.get()
+    return event is not None and event.is_set()
 
 
 class Session:
@@ -54,6 +193,14 @@ class Session:
         max_iter: int = 5,
         config: Optional[AgentConfig] = None,
         state: Optional[State] = None,
+        compiled: Optional[CompiledAgent] = None,
+        flow_manager: Optional[FlowManager] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        repairers: Optional[List[DecisionRepairer]] = None,
+        schemas: Optional[SchemaRegistry] = None,
+        response_cache: Optional[ResponseCache] = None,
+        answer_cache: Optional[AnswerCache] = None,
+        executor: Optional[SharedExecutor] = None,
         **kwargs,
     ) -> None:
         """
@@ -71,6 +218,14 @@ class Session:
         :param max_iter: Maximum number of decision loops for single action. (Defaults to 5)
         :param config: Optional AgentConfig.
         :param state: Optional session state data.
+        :param compiled: Optional precompiled step tables shared with other sessions of the agent.
+        :param flow_manager: Optional flow manager shared with other sessions of the agent.
+        :param rate_limiter: Optional limiter for LLM decision requests, shared with other sessions.
+        :param repairers: Optional repairers tried on invalid decisions before asking the LLM again.
+        :param schemas: Optional decision model registry shared with other sessions of the agent.
+        :param response_cache: Optional cache of decisions, used in steps with caching enabled.
+        :param answer_cache: Optional semantic cache of answers, used in steps with it enabled.
+        :param executor: Optional thread pool for background work, shared with other sessions.
         """
         # Fixed
         self.session_id = state.session_id if state else f"{name}_{str(uuid.uuid4())}"
@@ -94,16 +249,58 @@ class Session:
         )
         self.embedding_model = embedding_model
 
-        self.deferred_tools: Dict[str, Tool] = {}
         self.tools: Dict[str, Tool] = tools
+        # Read-only tables shared by every session of the agent
+        self.compiled = compiled or CompiledAgent.compile(
+            steps,
+            tools,
+            llms=self.llm_dict,
+            system_message=system_message,
+            persona=persona,
+            max_move_hops=self.config.max_move_hops,
+        )
+
+        self.rate_limiter = rate_limiter or (
+            RateLimiter(self.config.llm_requests_per_minute)
+            if self.config.llm_requests_per_minute
+            else None
+        )
+
+        # Decision models of the agent's steps
+        self.schemas = (
+            schemas if schemas is not None else SchemaRegistry(self.config.schema_cache_size)
+        )
+
+        # Exact-match cache of decisions, shared with other sessions
+        self.response_cache = response_cache or (
+            self.config.response_cache.get_cache() if self.config.response_cache else None
+        )
+        self.answer_cache = (
+            answer_cache
+            if answer_cache is not None or not self.config.answer_cache
+            else self.config.answer_cache.get_cache()
+        )
+
+        # Thread pool running speculative prefetches, created on first use
+        self.executor = executor if executor is not None else SharedExecutor()
+
+        # Local fixes for invalid decisions, tried before an LLM retry
+        if repairers is None:
+            repairers = DEFAULT_REPAIRERS if self.config.repair_decisions else []
+        self.repairers: List[DecisionRepairer] = list(repairers)
+
+        # Per-session overlay of tools loaded at runtime
+        self.deferred_tools: Dict[str, Tool] = {}
 
         # Compile state machine for fast transitions and flow lookups
         self.state_machine = StateMachine(
             self.steps,
             flows=flows,
+            flow_manager=flow_manager,
             config=self.config,
             memory=memory,
             start_step_id=start_step_id,
+            compiled=self.compiled,
         )
         self.state_machine.load_state(state)
 
@@ -113,6 +310,21 @@ class Session:
         # For OpenTelemetry tracing context
         self._otel_root_span_ctx: Any = None
 
+        # Deferred tools prefetched in speculative mode: (step_id, tools)
+        self._prefetched: Optional[Tuple[str, List[Tool]]] = None
+
+        # Monotonic deadline of the running turn, if it has a timeout
+        self._deadline: Optional[float] = None
+
+        # Whether an LLM or tool call outlived a turn's deadline and may still be running
+        self._abandoned_effect = False
+
+        # Timings and token usage of the running turn
+        self._metrics: Optional[TurnMetrics] = None
+
+        # Tape LLM, embedding and tool calls are recorded to or replayed from
+        self._tape: Optional[Tape] = None
+
     @property
     def current_step(self) -> Step:
         """Get the current step object."""
@@ -159,6 +371,115 @@ class Session:
         )
         return state
 
+    def hydrate(self, state: Optional[State] = None) -> "Session":
+        """
+        Reset this session and attach the given state, keeping everything else.
+
+        Used to reuse a session between requests for different conversations:
+        only the per-session data (ID, history, current step, flow context and
+        deferred tools) is replaced.
+
+        :param state: The state to attach, or None to start a new conversation.
+        :return: This session.
+        """
+        self.session_id = state.session_id if state else f"{self.name}_{str(uuid.uuid4())}"
+        self.memory.clear()
+        self.deferred_tools = {}
+        self._prefetched = None
+        self._deadline = None
+        self._metrics = None
+        self.event_emitter = None
+        self._otel_root_span_ctx = None
+        self.state_machine.reset()
+        self.state_machine.load_state(state)
+        return self
+
+    def fork(self, session_id: Optional[str] = None) -> "Session":
+        """
+        Branch this session, e.g. to explore several possible user inputs concurrently.
+
+        The branch starts at the same step with the same history and flow
+        context. The history is shared copy-on-write, so forking costs the
+        same however long the conversation is, and neither session sees what
+        the other adds afterwards. Inside a flow, the flow's components are
+        forked too, so the branch gets its own copy of the flow memory. Other
+        agent-wide components (LLMs, tools and compiled tables) are shared as
+        between any two sessions.
+
+        :param session_id: Optional ID of the branch. Defaults to a new ID derived from this one.
+        :return: The branch.
+        """
+        branch = copy.copy(self)
+        branch.session_id = session_id or f"{self.session_id}_fork_{uuid.uuid4().hex[:8]}"
+        branch.deferred_tools = dict(self.deferred_tools)
+        branch._prefetched = None
+        branch._deadline = None
+        branch._metrics = None
+        branch._tape = None
+        branch.event_emitter = None
+        branch._otel_root_span_ctx = None
+
+        state_machine = copy.copy(self.state_machine)
+        state_machine.memory = self.memory.fork()
+        if self.state_machine.current_flow is not None:
+            state_machine.current_flow = self.state_machine.current_flow.fork()
+        if self.state_machine.flow_context is not None:
+            flow_context = self.state_machine.flow_context
+            state_machine.flow_context = flow_context.model_copy(
+                update={"metadata": dict(flow_context.metadata)}
+            )
+        branch.state_machine = state_machine
+        return branch
+
+    @contextmanager
+    def _use_tape(self, tape: Tape) -> Iterator[Tape]:
+        """Route the session's LLM, embedding and tool calls through a tape."""
+        llm_dict, embedding_model = self.llm_dict, self.embedding_model
+        memory_llm = getattr(self.memory, "llm", None)
+        self.llm_dict = {llm_id: TapeLLM(llm, tape) for llm_id, llm in llm_dict.items()}
+        self.embedding_model = TapeLLM(embedding_model, tape) if embedding_model else None
+        if memory_llm is not None:
+            self.memory.llm = TapeLLM(memory_llm, tape)  # type: ignore[attr-defined]
+        self._tape = tape
+        try:
+            yield tape
+        finally:
+            self.llm_dict, self.embedding_model = llm_dict, embedding_model
+            if memory_llm is not None:
+                self.memory.llm = memory_llm  # type: ignore[attr-defined]
+            self._tape = None
+
+    @contextmanager
+    def record(self, path: Optional[str] = None) -> Iterator[Tape]:
+        """
+        Record every LLM, embedding and tool call made within the block.
+
+        :param path: Optional file the tape is saved to on exit (gzip-compressed for ``.gz``).
+        :return: Context manager yielding the tape being recorded.
+        """
+        tape = Tape(mode="record")
+        try:
+            with self._use_tape(tape):
+                yield tape
+        finally:
+            if path:
+                tape.save(path)
+
+    @contextmanager
+    def replay(self, tape: Union[Tape, str]) -> Iterator[Tape]:
+        """
+        Serve LLM, embedding and tool calls within the block from a recorded tape.
+
+        No provider or tool is called: a request that was not recorded raises
+        :class:`~nomos.testing.tape.TapeMissError`.
+
+        :param tape: Tape or path of a saved tape.
+        :return: Context manager yielding the tape being replayed.
+        """
+        tape = Tape.load(tape) if isinstance(tape, str) else Tape(tape.entries, mode="replay")
+        with self._use_tape(tape):
+            yield tape
+
     def set_deferred_tools(self, tools: List[Tool]) -> None:
         """
         Set the list of deferred tools available in this session.
@@ -175,13 +496,12 @@ class Session:
         """
         self.deferred_tools = {}
 
-    def _run_tool(self, tool_name: str, kwargs: Dict[str, Any]) -> Any:  # noqa: ANN401
+    def _get_tool(self, tool_name: str) -> Tool:
         """
-        Run a tool with the given name and arguments.
+        Look up a session or deferred tool by name.
 
-        :param tool_name: Name of the tool to run.
-        :param kwargs: Arguments to pass to the tool.
-        :return: Result of the tool execution.
+        :param tool_name: Name of the tool.
+        :return: The Tool instance.
         """
         tool = self.tools.get(tool_name) or self.deferred_tools.get(tool_name)
         if not tool:
@@ -189,9 +509,92 @@ class Session:
             raise ValueError(
                 f"Tool '{tool_name}' not found in session tools. Please check the tool name."
             )
+        return tool
+
+    def _run_tool(self, tool_name: str, kwargs: Dict[str, Any]) -> Any:  # noqa: ANN401
+        """
+        Run a tool with the given name and arguments.
+
+        :param tool_name: Name of the tool to run.
+        :param kwargs: Arguments to pass to the tool.
+        :return: Result of the tool execution.
+        """
+        tool = self._get_tool(tool_name)
+        if _is_abandoned():
+            raise TurnTimeoutError(f"Turn deadline exceeded before running tool '{tool_name}'")
         log_debug(f"Running tool: {tool_name} with args: {kwargs}")
 
-        return tool.run(**kwargs)
+        token = _calling_session.set(self)
+        try:
+            if self._tape is not None:
+                tool._validate_args(kwargs)
+                return self._tape.call(
+                    "tool", {"tool": tool_name, "kwargs": kwargs}, lambda: tool.run(**kwargs)
+                )
+            return tool.run(**kwargs)
+        finally:
+            _calling_session.reset(token)
+
+    async def _arun_tool(self, tool_name: str, kwargs: Dict[str, Any]) -> Any:  # noqa: ANN401
+        """
+        Asynchronously run a tool with the given name and arguments.
+
+        :param tool_name: Name of the tool to run.
+        :param kwargs: Arguments to pass to the tool.
+        :return: Result of the tool execution.
+        """
+        tool = self._get_tool(tool_name)
+        log_debug(f"Running tool: {tool_name} with args: {kwargs}")
+
+        token = _calling_session.set(self)
+        try:
+            if self._tape is not None:
+                tool._validate_args(kwargs)
+                return await self._tape.acall(
+                    "tool", {"tool": tool_name, "kwargs": kwargs}, lambda: tool.arun(**kwargs)
+                )
+            return await tool.arun(**kwargs)
+        finally:
+            _calling_session.reset(token)
+
+    def _run_tools(self, calls: List[Tuple[str, Dict[str, Any]]]) -> List[Any]:
+        """
+        Run independent tool calls concurrently on a bounded thread pool.
+
+        :param calls: List of (tool name, arguments) pairs.
+        :return: The result, or the raised exception, of each call in order.
+        """
+
+        # Pool threads do not inherit the context, so pass on whether the turn gave up
+        abandoned = _abandoned.get()
+
+        def run(call: Tuple[str, Dict[str, Any]]) -> Any:  # noqa: ANN401
+            token = _abandoned.set(abandoned)
+            try:
+                return self._run_tool(*call)
+            except Exception as exc:
+                return exc
+            finally:
+                _abandoned.reset(token)
+
+        workers = max(1, min(len(calls), self.config.max_tool_concurrency))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(run, calls))
+
+    async def _arun_tools(self, calls: List[Tuple[str, Dict[str, Any]]]) -> List[Any]:
+        """
+        Asynchronously run independent tool calls concurrently.
+
+        :param calls: List of (tool name, arguments) pairs.
+        :return: The result, or the raised exception, of each call in order.
+        """
+        semaphore = asyncio.Semaphore(max(1, self.config.max_tool_concurrency))
+
+        async def run(call: Tuple[str, Dict[str, Any]]) -> Any:  # noqa: ANN401
+            async with semaphore:
+                return await self._arun_tool(*call)
+
+        return list(await asyncio.gather(*(run(call) for call in calls), return_exceptions=True))
 
     def _get_deferred_tools_for_step(self, step: Step) -> List[Tool]:
         """
@@ -200,23 +603,25 @@ class Session:
         :param step: The Step instance to populate deferred tools for.
         :return: List of Tool instances that are deferred for this step.
         """
-        if not step.deferred_tool_ids:
-            return []
-
         deferred_tools: List[Tool] = []
-        deferred_tool_names = step.deferred_tool_ids
-        for deferred_tool_name in deferred_tool_names:
-            tool = self.tools.get(deferred_tool_name)
-            if not tool:
-                log_error(
-                    f"Deferred tool '{deferred_tool_name}' not found in session tools. Skipping."
-                )
-                continue
+        for server in self._get_deferred_servers(step):
+            deferred_tools.extend(Tool.from_mcp_server(server))
+        return deferred_tools
 
-            if isinstance(tool, MCPServer):
-                deferred_tools.extend(Tool.from_mcp_server(tool))
+    async def _aget_deferred_tools_for_step(self, step: Step) -> List[Tool]:
+        """
+        Asynchronously get deferred tools for the given step.
 
-        return deferred_tools
+        :param step: The Step instance to populate deferred tools for.
+        :return: List of Tool instances that are deferred for this step.
+        """
+        servers = self._get_deferred_servers(step)
+        results = await asyncio.gather(*(Tool.afrom_mcp_server(server) for server in servers))
+        return [tool for tools in results for tool in tools]
+
+    def _get_deferred_servers(self, step: Step) -> List[MCPServer]:
+        """Get the MCP servers whose tools are loaded lazily for the given step."""
+        return list(self.compiled[step.step_id].deferred_servers)
 
     def _get_current_step_tools(self) -> Tuple[Tool, ...]:
         """
@@ -224,23 +629,136 @@ class Session:
 
         :return: List of Tool instances available in the current step.
         """
-        deferred_tools: List[Tool] = self._get_deferred_tools_for_step(self.current_step)
-        deferred_tool_names = [tool.name for tool in deferred_tools]
-        self.set_deferred_tools(deferred_tools)
-
-        log_debug(f"Adding deferred tools to step: {deferred_tool_names}")
-        self.current_step.extend_tools(deferred_tool_names)
-        tools = []
-        for tool in self.current_step.tool_ids:
-            _tool = self.tools.get(tool) or self.deferred_tools.get(tool)
-            if not _tool:
-                log_error(f"Tool '{tool}' not found in session tools. Skipping.")
-                continue
+        deferred_tools = self._take_prefetched_tools()
+        if deferred_tools is None:
+            deferred_tools = self._get_deferred_tools_for_step(self.current_step)
+        return self._collect_step_tools(deferred_tools)
+
+    async def _aget_current_step_tools(self) -> Tuple[Tool, ...]:
+        """
+        Asynchronously get the list of tools available in the current step.
+
+        :return: List of Tool instances available in the current step.
+        """
+        deferred_tools = self._take_prefetched_tools()
+        if deferred_tools is None:
+            deferred_tools = await self._aget_deferred_tools_for_step(self.current_step)
+        return self._collect_step_tools(deferred_tools)
+
+    def _collect_step_tools(self, deferred_tools: List[Tool]) -> Tuple[Tool, ...]:
+        """
+        Resolve the current step's tools, including the given deferred tools.
+
+        :param deferred_tools: Deferred tools fetched for the current step.
+        :return: Tuple of Tool instances available in the current step.
+        """
+        if not _is_abandoned():
+            self.set_deferred_tools(deferred_tools)
+        log_debug(f"Adding deferred tools to step: {[tool.name for tool in deferred_tools]}")
+        return self._step_tools(self.current_step, deferred_tools)
+
+    def _step_tools(self, step: Step, deferred_tools: List[Tool]) -> Tuple[Tool, ...]:
+        """
+        Resolve a step's tools, including the given deferred tools, without mutating the step.
+
+        :param step: The step to resolve tools for.
+        :param deferred_tools: Deferred tools fetched for the step.
+        :return: Tuple of Tool instances available in the step.
+        """
+        tools = self.compiled[step.step_id].tools
+        if not deferred_tools:
+            return tools
+        deferred = {tool.name: tool for tool in deferred_tools}
+        for tool in tools:
+            deferred.pop(tool.name, None)
+        return tools + tuple(deferred.values())
+
+    def _move_paths(self, step: Step) -> Optional[Dict[str, Tuple[str, ...]]]:
+        """Get the paths to the steps a MOVE may reach, or None if it only follows routes."""
+        if self.config.max_move_hops <= 1:
+            return None
+        return self.compiled.reachable(step.step_id, self.config.max_move_hops)
+
+    def _reasoning_options(self, step: Step) -> Dict[str, Any]:
+        """Get the reasoning budget of a step's decisions."""
+        return {
+            "reasoning": step.reasoning or self.config.reasoning,
+            "max_reasoning_steps": self.config.max_reasoning_steps,
+        }
+
+    def _decision_model(
+        self,
+        step: Step,
+        tools: Tuple[Tool, ...],
+        constraints: Optional[DecisionConstraints] = None,
+    ) -> Type[BaseModel]:
+        """Get the decision model of a step from the agent's schema registry."""
+        move_paths = self._move_paths(step)
+        return self.schemas.get(
+            step,
+            tools,
+            constraints=constraints,
+            move_targets=tuple(move_paths) if move_paths is not None else None,
+            **self._reasoning_options(step),
+        )
 
-            tools.append(_tool)
+    def _prefetch_decision(self) -> None:
+        """
+        Precompute the inputs of the next decision that do not depend on a tool result.
 
-        self.current_step.reduce_tools(deferred_tool_names)
-        return tuple(tools)
+        Used in speculative mode while a tool runs: fetches the step's deferred
+        tools and builds its decision schema.
+        """
+        step = self.current_step
+        try:
+            deferred_tools = self._get_deferred_tools_for_step(step)
+            self._decision_model(step, self._step_tools(step, deferred_tools))
+        except Exception as exc:
+            log_error(f"Speculative prefetch failed: {exc}")
+            return
+        if not _is_abandoned():
+            self._prefetched = (step.step_id, deferred_tools)
+
+    async def _aprefetch_decision(self) -> None:
+        """Asynchronously precompute the next decision's inputs (see ``_prefetch_decision``)."""
+        step = self.current_step
+        try:
+            deferred_tools = await self._aget_deferred_tools_for_step(step)
+            self._decision_model(step, self._step_tools(step, deferred_tools))
+        except Exception as exc:
+            log_error(f"Speculative prefetch failed: {exc}")
+            return
+        self._prefetched = (step.step_id, deferred_tools)
+
+    def _take_prefetched_tools(self) -> Optional[List[Tool]]:
+        """Consume the prefetched deferred tools if they were fetched for the current step."""
+        prefetched, self._prefetched = self._prefetched, None
+        if prefetched and prefetched[0] == self.current_step.step_id:
+            log_debug(f"Using prefetched deferred tools for step: {prefetched[0]}")
+            return prefetched[1]
+        return None
+
+    def _with_prefetch(self, fn: Callable[..., Any], *args: Any) -> Any:  # noqa: ANN401
+        """Call ``fn``; in speculative mode, prefetch the next decision's inputs meanwhile."""
+        if not self.config.speculative:
+            return fn(*args)
+        prefetch = self.executor.submit(contextvars.copy_context().run, self._prefetch_decision)
+        try:
+            return fn(*args)
+        finally:
+            # A prefetch still queued behind other sessions' work would only add latency
+            if not prefetch.cancel():
+                prefetch.result()
+
+    async def _awith_prefetch(self, awaitable: Awaitable[Any]) -> Any:  # noqa: ANN401
+        """Await ``awaitable``, prefetching the next decision's inputs in speculative mode."""
+        if not self.config.speculative:
+            return await awaitable
+        prefetch = asyncio.create_task(self._aprefetch_decision())
+        try:
+            return await awaitable
+        finally:
+            await prefetch
 
     @property
     def llm(self) -> LLMBase:
@@ -257,35 +775,88 @@ class Session:
         self, event_type: str, content: str, decision: Optional[Decision] = None
     ) -> None:
         """Add an event to the session history."""
-        event_obj = Event(type=event_type, content=content, decision=decision)
-
-        # If we're in a flow, only update flow memory
-        if self.state_machine.current_flow and self.state_machine.flow_context:
-            flow_memory = self.state_machine.current_flow.get_memory()
-            if flow_memory and isinstance(flow_memory, FlowMemoryComponent):
-                flow_memory.add_to_context(event_obj)
-            # Don't update session memory while in flow
+        self._remember(Event(type=event_type, content=content, decision=decision))
+
+    def _add_step_identifier(self, step_identifier: StepIdentifier) -> None:
+        """
+        Add a step identifier to the appropriate memory.
+
+        :param step_identifier: The step identifier to add.
+        """
+        self._remember(step_identifier)
+
+    def _in_flow(self) -> bool:
+        """Whether a flow is currently active."""
+        return bool(self.state_machine.current_flow and self.state_machine.flow_context)
+
+    def _get_flow_memory(self) -> Optional[FlowMemoryComponent]:
+        """Get the memory component of the active flow, if any."""
+        if not self._in_flow():
+            return None
+        flow_memory = self.state_machine.current_flow.get_memory()  # type: ignore
+        if flow_memory and isinstance(flow_memory, FlowMemoryComponent):
+            return flow_memory
+        return None
+
+    def _remember(self, item: Union[Event, StepIdentifier]) -> None:
+        """
+        Add an event or step identifier to the appropriate memory.
+
+        While a flow is active only the flow memory is updated.
+
+        :param item: The item to add.
+        """
+        if self._in_flow():
+            flow_memory = self._get_flow_memory()
+            if flow_memory:
+                flow_memory.add_to_context(item)
         else:
-            # Only update session memory when not in a flow
-            self.memory.add(event_obj)
+            self.memory.add(item)
+        self._emit(item)
 
+    async def _aremember(self, item: Union[Event, StepIdentifier]) -> None:
+        """
+        Asynchronously add an event or step identifier to the appropriate memory.
+
+        :param item: The item to add.
+        """
+        if self._in_flow():
+            flow_memory = self._get_flow_memory()
+            if flow_memory:
+                await flow_memory.aadd_to_context(item)
+        else:
+            await self.memory.aadd(item)
+        self._emit(item)
+
+    def _emit(self, item: Union[Event, StepIdentifier]) -> None:
+        """Emit an analytics event for a history item if an emitter is attached."""
         if self.event_emitter:
             try:
                 from .events import SessionEvent
 
-                sess_event = SessionEvent(
-                    session_id=self.session_id,
-                    event_type=event_type,
-                    data={"content": content},
-                    decision=decision,
-                )
+                if isinstance(item, Event):
+                    sess_event = SessionEvent(
+                        session_id=self.session_id,
+                        event_type=item.type,
+                        data={"content": item.content},
+                        decision=item.decision,
+                    )
+                else:
+                    sess_event = SessionEvent(
+                        session_id=self.session_id,
+                        event_type="step",
+                        data={"step_id": item.step_id},
+                    )
                 # Use create_task but don't await to avoid blocking
-                # Add error handling for the task
                 task = asyncio.create_task(self.event_emitter.emit(sess_event))
                 task.add_done_callback(self._handle_event_emission_error)
             except Exception as exc:  # noqa: BLE001
                 log_error(f"Failed to emit event: {exc}")
-        log_debug(f"{event_type.title()} added: {content}")
+
+        if isinstance(item, Event):
+            log_debug(f"{item.type.title()} added: {item.content}")
+        else:
+            log_debug(f"Step identifier added: {item.step_id}")
 
     def _handle_event_emission_error(self, task: asyncio.Task) -> None:
         """Handle errors from event emission tasks."""
@@ -294,6 +865,43 @@ class Session:
         except Exception as exc:
             log_error(f"Event emission failed: {exc}")
 
+    def _get_decision_history(self) -> list:
+        """Get the decision context - flow memory if available, otherwise session memory."""
+        flow_memory = self._get_flow_memory()
+        if flow_memory and flow_memory.memory.context:
+            return flow_memory.memory.context
+        return self.memory.get_history()
+
+    def _decision_request(
+        self,
+        current_step_tools: Tuple[Tool, ...],
+        decision_constraints: Optional[DecisionConstraints] = None,
+    ) -> Dict[str, Any]:
+        """
+        Build the arguments for a decision request to the LLM.
+
+        :param current_step_tools: Tools available in the current step.
+        :param decision_constraints: Optional constraints for the decision model.
+        :return: Keyword arguments for ``LLMBase._get_output`` and its variants.
+        """
+        with timed("schema"):
+            response_format = self._decision_model(
+                self.current_step, current_step_tools, decision_constraints
+            )
+        return {
+            "steps": self.steps,
+            "current_step": self.current_step,
+            "tools": self.tools,
+            "history": self._get_decision_history(),
+            "response_format": response_format,
+            "system_message": self.system_message,
+            "persona": self.persona,
+            "max_examples": self.config.max_examples,
+            "embedding_model": self.embedding_model,
+            "move_paths": self._move_paths(self.current_step),
+            "system_prompt": self.compiled[self.current_step.step_id].prompt,
+        }
+
     def _get_next_decision(
         self, decision_constraints: Optional[DecisionConstraints] = None
     ) -> Decision:
@@ -302,39 +910,569 @@ class Session:
 
         :return: The decision made by the LLM.
         """
-        _decision_model = self.llm._create_decision_model(
-            current_step=self.current_step,
-            current_step_tools=self._get_current_step_tools(),
-            constraints=decision_constraints,
+        request = self._decision_request(self._get_current_step_tools(), decision_constraints)
+        if not self._caches_decisions():
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
+            _decision = self.llm._get_output(**request)
+            return self._parse_decision(_decision)
+
+        response_format = request.pop("response_format")
+        messages = self.llm._prompt_messages(**request)
+        key = self.response_cache.key(self.llm, messages, response_format)
+        _decision = self.response_cache.lookup(key, response_format)
+        if _decision is None:
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
+            with timed("llm"):
+                _decision = self.llm.get_output(messages=messages, response_format=response_format)
+            self.response_cache.store(key, _decision, self.current_step.cache_ttl)
+        return self._parse_decision(_decision)
+
+    def _caches_answers(self) -> bool:
+        """
+        Check whether user inputs of the current step are looked up in the answer cache.
+
+        Caches are bypassed while recording or replaying a tape, so every LLM call is on it.
+        """
+        return (
+            self.answer_cache is not None and self.current_step.answer_cache and self._tape is None
         )
 
-        # Get memory context - use flow memory if available, otherwise use session memory
-        memory_context = self.memory.get_history()
-        flow_memory_context = None
+    def _search_answer(self, embedding: List[float]) -> Optional[Decision]:
+        """Search the answer cache of the current step for a similar question."""
+        return self.answer_cache.search(self.current_step.step_id, embedding)
 
-        if self.state_machine.current_flow and self.state_machine.flow_context:
-            flow_memory = self.state_machine.current_flow.get_memory()
-            if flow_memory and isinstance(flow_memory, FlowMemoryComponent):
-                flow_memory_context = flow_memory.memory.context
+    async def _asearch_answer(self, embedding: List[float]) -> Optional[Decision]:
+        """Search the answer cache of the current step without blocking the event loop."""
+        return await self.answer_cache.asearch(self.current_step.step_id, embedding)
 
-        _decision = self.llm._get_output(
-            steps=self.steps,
-            current_step=self.current_step,
-            tools=self.tools,
-            history=flow_memory_context if flow_memory_context else memory_context,
-            response_format=_decision_model,
-            system_message=self.system_message,
-            persona=self.persona,
-            max_examples=self.config.max_examples,
-            embedding_model=self.embedding_model,
+    def _caches_decisions(self) -> bool:
+        """Check whether decisions of the current step are served from the response cache."""
+        return self.response_cache is not None and self.current_step.cache and self._tape is None
+
+    def _cached_stream_decision(
+        self, messages: List[Message], response_format: Type[BaseModel]
+    ) -> Tuple[Optional[str], Optional[Decision]]:
+        """
+        Look up a streamed decision request in the response cache.
+
+        :return: The key to cache the streamed decision under, or None if the
+            step does not cache decisions, and the cached decision if any.
+        """
+        if not self._caches_decisions():
+            return None, None
+        key = self.response_cache.key(self.llm, messages, response_format)
+        cached = self.response_cache.lookup(key, response_format)
+        return key, self._parse_decision(cached) if cached is not None else None
+
+    async def _acached_stream_decision(
+        self, messages: List[Message], response_format: Type[BaseModel]
+    ) -> Tuple[Optional[str], Optional[Decision]]:
+        """Asynchronously look up a streamed decision request (see ``_cached_stream_decision``)."""
+        if not self._caches_decisions():
+            return None, None
+        key = self.response_cache.key(self.llm, messages, response_format)
+        cached = await self.response_cache.alookup(key, response_format)
+        return key, self._parse_decision(cached) if cached is not None else None
+
+    def _parse_decision(self, output: Any) -> Decision:  # noqa: ANN401
+        """Convert the LLM output to a Decision model."""
+        with timed("parse"):
+            decision = self.llm._create_decision_from_output(output=output)
+        log_debug(f"Model decision: {decision}")
+        return decision
+
+    async def _aget_next_decision(
+        self, decision_constraints: Optional[DecisionConstraints] = None
+    ) -> Decision:
+        """
+        Asynchronously get the next decision from the LLM.
+
+        :return: The decision made by the LLM.
+        """
+        request = self._decision_request(
+            await self._aget_current_step_tools(), decision_constraints
+        )
+        if not self._caches_decisions():
+            if self.rate_limiter:
+                await self.rate_limiter.aacquire()
+            _decision = await self.llm._aget_output(**request)
+            return self._parse_decision(_decision)
+
+        response_format = request.pop("response_format")
+        messages = await self.llm._aprompt_messages(**request)
+        key = self.response_cache.key(self.llm, messages, response_format)
+        _decision = await self.response_cache.alookup(key, response_format)
+        if _decision is None:
+            if self.rate_limiter:
+                await self.rate_limiter.aacquire()
+            with timed("llm"):
+                _decision = await self.llm.aget_output(
+                    messages=messages, response_format=response_format
+                )
+            await self.response_cache.astore(key, _decision, self.current_step.cache_ttl)
+        return self._parse_decision(_decision)
+
+    def _stream_next_decision(
+        self, decision_constraints: Optional[DecisionConstraints] = None
+    ) -> Generator[str, None, Decision]:
+        """
+        Get the next decision from the LLM, yielding RESPOND text as it is generated.
+
+        :return: The decision made by the LLM.
+        """
+        with collect(self._metrics):
+            request = self._decision_request(self._get_current_step_tools(), decision_constraints)
+            response_format = request.pop("response_format")
+            messages = self.llm._prompt_messages(**request)
+            key, cached = self._cached_stream_decision(messages, response_format)
+        if cached is not None:
+            if cached.action == Action.RESPOND and isinstance(cached.response, str):
+                yield cached.response
+            return cached
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
+        parser = ResponseStreamParser()
+        _decision = None
+        chunks = self.llm.stream_output(messages=messages, response_format=response_format)
+        for chunk in timed_iter(self._metrics, "llm", chunks):
+            if self._past_deadline():
+                raise self._deadline_exceeded()
+            if isinstance(chunk, str):
+                delta = parser.feed(chunk)
+                if delta:
+                    yield delta
+            else:
+                _decision = chunk
+
+        with collect(self._metrics):
+            if key is not None:
+                self.response_cache.store(key, _decision, self.current_step.cache_ttl)
+            return self._parse_decision(_decision)
+
+    async def _astream_next_decision(
+        self, decision_constraints: Optional[DecisionConstraints] = None
+    ) -> AsyncIterator[Union[str, Decision]]:
+        """
+        Asynchronously get the next decision from the LLM, streaming RESPOND text.
+
+        Yields RESPOND text as it is generated, followed by the decision.
+        """
+        with collect(self._metrics):
+            request = self._decision_request(
+                await self._aget_current_step_tools(), decision_constraints
+            )
+            response_format = request.pop("response_format")
+            messages = await self.llm._aprompt_messages(**request)
+            key, cached = await self._acached_stream_decision(messages, response_format)
+        if cached is not None:
+            if cached.action == Action.RESPOND and isinstance(cached.response, str):
+                yield cached.response
+            yield cached
+            return
+        if self.rate_limiter:
+            await self.rate_limiter.aacquire()
+        parser = ResponseStreamParser()
+        _decision = None
+        chunks = self.llm.astream_output(messages=messages, response_format=response_format)
+        async for chunk in atimed_iter(self._metrics, "llm", chunks):
+            if isinstance(chunk, str):
+                delta = parser.feed(chunk)
+                if delta:
+                    yield delta
+            else:
+                _decision = chunk
+
+        with collect(self._metrics):
+            if key is not None:
+                await self.response_cache.astore(key, _decision, self.current_step.cache_ttl)
+            decision = self._parse_decision(_decision)
+        yield decision
+
+    def next(
+        self,
+        user_input: Optional[str] = None,
+        no_errors: int = 0,
+        next_count: int = 0,
+        return_tool: bool = False,
+        return_step: bool = False,
+        verbose: bool = False,
+        decision_constraints: Optional[DecisionConstraints] = None,
+        budget: Optional[TurnBudget] = None,
+    ) -> Response:
+        """
+        Advance the session to the next step based on user input and LLM decision.
+
+        :param user_input: Optional user input string.
+        :param no_errors: Number of consecutive errors encountered.
+        :param next_count: Number of decision iterations already used.
+        :param return_tool: Whether to return tool results.
+        :param return_step: Whether to return step Transitions.
+        :param verbose: Whether to print verbose output.
+        :param decision_constraints: Optional constraints for the decision model on retry.
+        :param budget: Optional limits for this turn. Defaults to the config's turn budget.
+        :return: The response for this turn.
+        """
+        return self._drive(
+            self._turn(
+                user_input=user_input,
+                no_errors=no_errors,
+                next_count=next_count,
+                return_tool=return_tool,
+                return_step=return_step,
+                verbose=verbose,
+                decision_constraints=decision_constraints,
+                budget=budget,
+            )
         )
 
-        # Convert to a Decision model
-        decision = self.llm._create_decision_from_output(output=_decision)
-        log_debug(f"Model decision: {decision}")
-        return decision
+    async def anext(
+        self,
+        user_input: Optional[str] = None,
+        no_errors: int = 0,
+        next_count: int = 0,
+        return_tool: bool = False,
+        return_step: bool = False,
+        verbose: bool = False,
+        decision_constraints: Optional[DecisionConstraints] = None,
+        budget: Optional[TurnBudget] = None,
+    ) -> Response:
+        """
+        Asynchronously advance the session to the next step.
+
+        Same semantics as :meth:`next`, but LLM calls, tool calls and memory
+        updates are awaited instead of blocking the event loop.
+
+        :param user_input: Optional user input string.
+        :param no_errors: Number of consecutive errors encountered.
+        :param next_count: Number of decision iterations already used.
+        :param return_tool: Whether to return tool results.
+        :param return_step: Whether to return step Transitions.
+        :param verbose: Whether to print verbose output.
+        :param decision_constraints: Optional constraints for the decision model on retry.
+        :param budget: Optional limits for this turn. Defaults to the config's turn budget.
+        :return: The response for this turn.
+        """
+        return await self._adrive(
+            self._turn(
+                user_input=user_input,
+                no_errors=no_errors,
+                next_count=next_count,
+                return_tool=return_tool,
+                return_step=return_step,
+                verbose=verbose,
+                decision_constraints=decision_constraints,
+                budget=budget,
+            )
+        )
+
+    def stream(
+        self,
+        user_input: Optional[str] = None,
+        return_tool: bool = False,
+        return_step: bool = False,
+        verbose: bool = False,
+        decision_constraints: Optional[DecisionConstraints] = None,
+        budget: Optional[TurnBudget] = None,
+    ) -> Iterator[Union[str, Response]]:
+        """
+        Advance the session like :meth:`next`, streaming the response as it is generated.
+
+        Chunks of the RESPOND text are yielded as soon as the decision's action
+        is known, followed by the final :class:`Response` as the last item.
+
+        :param user_input: Optional user input string.
+        :param return_tool: Whether to return tool results.
+        :param return_step: Whether to return step Transitions.
+        :param verbose: Whether to print verbose output.
+        :param decision_constraints: Optional constraints for the decision model on retry.
+        :param budget: Optional limits for this turn. Defaults to the config's turn budget.
+        :return: Iterator of response text chunks, ending with the Response.
+        """
+        turn = self._turn(
+            user_input=user_input,
+            return_tool=return_tool,
+            return_step=return_step,
+            verbose=verbose,
+            decision_constraints=decision_constraints,
+            budget=budget,
+        )
+        result: Any = None
+        error: Optional[Exception] = None
+        while True:
+            try:
+                effect = turn.throw(error) if error else turn.send(result)
+            except StopIteration as stop:
+                yield stop.value
+                return
+            result, error = None, None
+            try:
+                if isinstance(effect, _Decide):
+                    result = yield from self._stream_next_decision(effect.constraints)
+                else:
+                    result = self._perform_before_deadline(effect)
+                    text = self._cached_answer_text(effect, result)
+                    if text:
+                        yield text
+            except Exception as exc:
+                error = exc
+
+    async def astream(
+        self,
+        user_input: Optional[str] = None,
+        return_tool: bool = False,
+        return_step: bool = False,
+        verbose: bool = False,
+        decision_constraints: Optional[DecisionConstraints] = None,
+        budget: Optional[TurnBudget] = None,
+    ) -> AsyncIterator[Union[str, Response]]:
+        """
+        Asynchronously advance the session, streaming the response as it is generated.
+
+        Same semantics as :meth:`stream`.
+
+        :return: Async iterator of response text chunks, ending with the Response.
+        """
+        turn = self._turn(
+            user_input=user_input,
+            return_tool=return_tool,
+            return_step=return_step,
+            verbose=verbose,
+            decision_constraints=decision_constraints,
+            budget=budget,
+        )
+        result: Any = None
+        error: Optional[Exception] = None
+        while True:
+            try:
+                effect = turn.throw(error) if error else turn.send(result)
+            except StopIteration as stop:
+                yield stop.value
+                return
+            result, error = None, None
+            try:
+                if isinstance(effect, _Decide):
+                    async for chunk in self._abefore_deadline_iter(
+                        self._astream_next_decision(effect.constraints)
+                    ):
+                        if isinstance(chunk, str):
+                            yield chunk
+                        else:
+                            result = chunk
+                else:
+                    result = await self._aperform_before_deadline(effect)
+                    text = self._cached_answer_text(effect, result)
+                    if text:
+                        yield text
+            except Exception as exc:
+                error = exc
+
+    @staticmethod
+    def _cached_answer_text(effect: TurnEffect, result: Any) -> Optional[str]:  # noqa: ANN401
+        """Get the response text of an answer found in the answer cache, to stream it."""
+        if not isinstance(effect, _LookupAnswer) or result[0] is None:
+            return None
+        decision = result[0]
+        return decision.response if isinstance(decision.response, str) else None
+
+    def _drive(self, turn: Turn) -> Response:
+        """
+        Run a turn to completion, performing its effects synchronously.
+
+        :param turn: The turn generator.
+        :return: The response returned by the turn.
+        """
+        result: Any = None
+        error: Optional[Exception] = None
+        while True:
+            try:
+                effect = turn.throw(error) if error else turn.send(result)
+            except StopIteration as stop:
+                return stop.value
+            result, error = None, None
+            try:
+                result = self._perform_before_deadline(effect)
+            except Exception as exc:
+                error = exc
+
+    async def _adrive(self, turn: Turn) -> Response:
+        """
+        Run a turn to completion, awaiting its effects.
+
+        :param turn: The turn generator.
+        :return: The response returned by the turn.
+        """
+        result: Any = None
+        error: Optional[Exception] = None
+        while True:
+            try:
+                effect = turn.throw(error) if error else turn.send(result)
+            except StopIteration as stop:
+                return stop.value
+            result, error = None, None
+            try:
+                result = await self._aperform_before_deadline(effect)
+            except Exception as exc:
+                error = exc
+
+    def _remaining_time(self) -> Optional[float]:
+        """Get the seconds left before the running turn's deadline, or None without one."""
+        if self._deadline is None:
+            return None
+        return self._deadline - time.monotonic()
+
+    def _past_deadline(self) -> bool:
+        """Check whether the running turn's deadline has passed."""
+        return self._deadline is not None and time.monotonic() >= self._deadline
+
+    def _deadline_exceeded(self) -> TurnTimeoutError:
+        """Clear the turn's deadline and build the error raised into the turn."""
+        self._deadline = None
+        return TurnTimeoutError("Turn deadline exceeded")
+
+    def _perform_before_deadline(self, effect: TurnEffect) -> Any:  # noqa: ANN401
+        """
+        Perform a turn effect synchronously, giving up once the turn's deadline passes.
+
+        Blocking calls cannot be interrupted, so with a deadline LLM and tool
+        effects run in a daemon thread that is abandoned if it does not finish
+        in time. An abandoned effect no longer updates the session and its
+        result is discarded. Bookkeeping effects run inline.
+        """
+        remaining = self._remaining_time()
+        if remaining is None or (remaining > 0 and not isinstance(effect, _DEADLINE_EFFECTS)):
+            return self._perform(effect)
+        if remaining > 0:
+            future: Future = Future()
+            abandoned = threading.Event()
+            context = contextvars.copy_context()
+            context.run(_abandoned.set, abandoned)
+
+            def run() -> None:
+                try:
+                    future.set_result(context.run(self._perform, effect))
+                except BaseException as exc:
+                    future.set_exception(exc)
+
+            threading.Thread(target=run, daemon=True).start()
+            try:
+                return future.result(timeout=remaining)
+            except FutureTimeoutError:
+                abandoned.set()
+                self._abandoned_effect = True
+        raise self._deadline_exceeded()
+
+    async def _aperform_before_deadline(self, effect: TurnEffect) -> Any:  # noqa: ANN401
+        """
+        Perform a turn effect asynchronously, cancelling it once the turn's deadline passes.
 
-    def next(
+        Only LLM and tool effects are cancelled; bookkeeping effects are awaited
+        so memory and flow state are never left half updated.
+        """
+        remaining = self._remaining_time()
+        if remaining is None or (remaining > 0 and not isinstance(effect, _DEADLINE_EFFECTS)):
+            return await self._aperform(effect)
+        if remaining > 0:
+            try:
+                return await asyncio.wait_for(self._aperform(effect), remaining)
+            except asyncio.TimeoutError:
+                # Timeouts raised by the effect itself are not the turn's deadline
+                if not self._past_deadline():
+                    raise
+                # Blocking calls it awaited in worker threads keep running
+                self._abandoned_effect = True
+        raise self._deadline_exceeded()
+
+    async def _abefore_deadline_iter(
+        self, chunks: AsyncIterator[Union[str, Decision]]
+    ) -> AsyncIterator[Union[str, Decision]]:
+        """Iterate a streamed decision, cancelling it once the turn's deadline passes."""
+        iterator = chunks.__aiter__()
+        while True:
+            if self._past_deadline():
+                raise self._deadline_exceeded()
+            try:
+                chunk = await asyncio.wait_for(iterator.__anext__(), self._remaining_time())
+            except StopAsyncIteration:
+                return
+            except asyncio.TimeoutError:
+                if self._past_deadline():
+                    raise self._deadline_exceeded()
+                raise
+            yield chunk
+
+    def _perform(self, effect: TurnEffect) -> Any:  # noqa: ANN401
+        """Perform a turn effect synchronously, recording its timings in the turn's metrics."""
+        with collect(self._metrics):
+            if isinstance(effect, _Decide):
+                return self._get_next_decision(decision_constraints=effect.constraints)
+            if isinstance(effect, _LookupAnswer):
+                with timed("cache"):
+                    embedding = self.embedding_model.embed_text(effect.question)
+                    return self._search_answer(embedding), embedding
+            if isinstance(effect, _StoreAnswer):
+                with timed("cache"):
+                    return self.answer_cache.add(
+                        self.current_step.step_id,
+                        effect.question,
+                        effect.embedding,
+                        effect.decision,
+                    )
+            if isinstance(effect, _CallTool):
+                with timed("tool"):
+                    return self._with_prefetch(self._run_tool, effect.tool_name, effect.kwargs)
+            if isinstance(effect, _CallTools):
+                with timed("tool"):
+                    return self._with_prefetch(self._run_tools, effect.calls)
+            if isinstance(effect, _Remember):
+                with timed("memory"):
+                    return self._remember(effect.item)
+            if isinstance(effect, _FlowTransitions):
+                return self.state_machine.handle_flow_transitions(
+                    effect.step_id, self.session_id, verbose=effect.verbose
+                )
+            if isinstance(effect, _ExitFlow):
+                return self.state_machine._exit_flow(effect.step_id)
+        raise TypeError(f"Unknown turn effect: {effect!r}")
+
+    async def _aperform(self, effect: TurnEffect) -> Any:  # noqa: ANN401
+        """Perform a turn effect asynchronously, recording its timings in the turn's metrics."""
+        with collect(self._metrics):
+            if isinstance(effect, _Decide):
+                return await self._aget_next_decision(decision_constraints=effect.constraints)
+            if isinstance(effect, _LookupAnswer):
+                with timed("cache"):
+                    embedding = await self.embedding_model.aembed_text(effect.question)
+                    return await self._asearch_answer(embedding), embedding
+            if isinstance(effect, _StoreAnswer):
+                with timed("cache"):
+                    return await self.answer_cache.aadd(
+                        self.current_step.step_id,
+                        effect.question,
+                        effect.embedding,
+                        effect.decision,
+                    )
+            if isinstance(effect, _CallTool):
+                with timed("tool"):
+                    return await self._awith_prefetch(
+                        self._arun_tool(effect.tool_name, effect.kwargs)
+                    )
+            if isinstance(effect, _CallTools):
+                with timed("tool"):
+                    return await self._awith_prefetch(self._arun_tools(effect.calls))
+            if isinstance(effect, _Remember):
+                with timed("memory"):
+                    return await self._aremember(effect.item)
+            if isinstance(effect, _FlowTransitions):
+                return await self.state_machine.ahandle_flow_transitions(
+                    effect.step_id, self.session_id, verbose=effect.verbose
+                )
+            if isinstance(effect, _ExitFlow):
+                return await self.state_machine.aexit_flow(effect.step_id)
+        raise TypeError(f"Unknown turn effect: {effect!r}")
+
+    def _turn(
         self,
         user_input: Optional[str] = None,
         no_errors: int = 0,
@@ -343,257 +1481,572 @@ class Session:
         return_step: bool = False,
         verbose: bool = False,
         decision_constraints: Optional[DecisionConstraints] = None,
-    ) -> Response:
+        budget: Optional[TurnBudget] = None,
+    ) -> Turn:
         """
-        Advance the session to the next step based on user input and LLM decision.
+        Decision loop for a single turn.
 
-        :param user_input: Optional user input string.
-        :param no_errors: Number of consecutive errors encountered.
-        :param next_count: Number of times the next function has been called.
-        :param return_tool: Whether to return tool results.
-        :param return_step: Whether to return step Transitions.
-        :param verbose: Whether to print verbose output.
-        :param decision_constraints: Optional constraints for the decision model on retry.
-        :return: A tuple containing the decision and any tool results.
+        The turn yields effects (LLM decisions, tool calls, memory updates and
+        flow transitions) instead of performing them, so the same loop is run
+        by both the synchronous and the asynchronous driver.
+
+        :return: The response for this turn, with its stats attached.
         """
-        if no_errors >= self.max_errors:
-            raise ValueError(f"Maximum errors reached ({self.max_errors}). Stopping session.")
-        if next_count >= self.max_iter:
-            if not self.current_step.auto_flow:
-                self._add_event(
-                    "fallback",
-                    (
-                        "Maximum iterations reached. Inform the user and based on the "
-                        "available context, produce a fallback response."
-                    ),
-                )
-                return self.next(
+        stats = TurnStats()
+        metrics = self._metrics = TurnMetrics()
+        started = time.monotonic()
+        budget = budget or self.config.turn_budget
+        self._prefetched = None
+        self._deadline = started + budget.timeout if budget.timeout is not None else None
+        try:
+            try:
+                res = yield from self._loop(
+                    stats=stats,
+                    started=started,
+                    budget=budget,
+                    user_input=user_input,
+                    no_errors=no_errors,
+                    next_count=next_count,
+                    return_tool=return_tool,
+                    return_step=return_step,
                     verbose=verbose,
-                    decision_constraints=DecisionConstraints(
-                        actions=["RESPOND"], fields=["response"]
-                    ),
-                )
-            else:
-                raise RecursionError(
-                    f"Maximum iterations reached ({self.max_iter}). Stopping session."
+                    decision_constraints=decision_constraints,
                 )
+            except TurnTimeoutError:
+                res = yield from self._timeout_response(stats, budget)
+        finally:
+            self._deadline = None
+            self._metrics = None
+            stats.duration = time.monotonic() - started
+            for name, value in stats:
+                setattr(metrics, name, value)
+            log_debug(f"Turn stats: {stats}")
+        res.stats = stats
+        res.metrics = metrics
+        return res
 
-        self.reset_deferred_tools()
-        log_debug(f"User input received: {user_input}")
-        self._add_event("user", user_input) if user_input else None
-        log_debug(f"Current step: {self.current_step.step_id}")
-
-        # Check for flow transitions
-        self.state_machine.handle_flow_transitions(
-            self.current_step.step_id, self.session_id, verbose=verbose
+    def _timeout_response(self, stats: TurnStats, budget: TurnBudget) -> Turn:
+        """Produce the fallback response of a turn that hit its deadline, without the LLM."""
+        log_error(f"Turn timed out after {budget.timeout}s in step {self.current_step.step_id}")
+        stats.exhausted = "Turn timed out"
+        yield _Remember(Event(type="fallback", content=f"Turn timed out after {budget.timeout}s."))
+        decision = Decision(
+            reasoning=["Turn timed out"],
+            action=Action.RESPOND,
+            response=budget.timeout_response,
         )
+        yield _Remember(Event(type=self.name, content=budget.timeout_response, decision=decision))
+        return Response(decision=decision)
 
-        decision = self._get_next_decision(decision_constraints=decision_constraints)
-        log_debug(str(decision))
-        log_debug(f"Action decided: {decision.action}")
+    def _check_budget(
+        self, next_count: int, stats: TurnStats, budget: TurnBudget, started: float
+    ) -> Optional[Tuple[str, Union[int, float]]]:
+        """
+        Check the turn against its limits.
 
-        # Validate decision
-        if decision.action == Action.RESPOND and decision.response is None:
-            self._add_event(
-                "error",
-                "RESPOND action requires a response, but none was provided.",
-                decision,
-            )
-            return self.next(
-                no_errors=no_errors + 1,
-                next_count=next_count + 1,
-                decision_constraints=DecisionConstraints(actions=["RESPOND"], fields=["response"]),
-                verbose=verbose,
-            )
-        if decision.action == Action.MOVE and decision.step_id is None:
-            self._add_event(
-                "error",
-                "MOVE action requires a step_id, but none was provided.",
-                decision,
-            )
-            return self.next(
-                no_errors=no_errors + 1,
-                next_count=next_count + 1,
-                decision_constraints=DecisionConstraints(actions=["MOVE"], fields=["step_id"]),
-                verbose=verbose,
-            )
-        if decision.action == Action.TOOL_CALL and decision.tool_call is None:
-            self._add_event(
-                "error",
-                "TOOL_CALL action requires a tool_call, but none was provided.",
-                decision,
-            )
-            return self.next(
-                no_errors=no_errors + 1,
-                next_count=next_count + 1,
-                decision_constraints=DecisionConstraints(
-                    actions=["TOOL_CALL"], fields=["tool_call"]
-                ),
-                verbose=verbose,
+        :return: The exhausted limit's description and value, or None.
+        """
+        if next_count >= self.max_iter:
+            return "Maximum iterations reached", self.max_iter
+        if budget.max_llm_calls is not None and stats.llm_calls >= budget.max_llm_calls:
+            return "Maximum LLM calls reached", budget.max_llm_calls
+        if budget.max_tool_calls is not None and stats.tool_calls >= budget.max_tool_calls:
+            return "Maximum tool calls reached", budget.max_tool_calls
+        if budget.max_time is not None and time.monotonic() - started >= budget.max_time:
+            return "Maximum turn time reached", budget.max_time
+        return None
+
+    def _loop(
+        self,
+        stats: TurnStats,
+        started: float,
+        budget: TurnBudget,
+        user_input: Optional[str],
+        no_errors: int,
+        next_count: int,
+        return_tool: bool,
+        return_step: bool,
+        verbose: bool,
+        decision_constraints: Optional[DecisionConstraints],
+    ) -> Turn:
+        """Run decision iterations until the turn produces a response."""
+        fallback = False
+        observed_input: Optional[str] = None
+        observed_tools: Dict[str, Tuple[Any, bool]] = {}
+        # User input and its embedding, to cache the answer decided for it
+        question: Optional[Tuple[str, List[float]]] = None
+        while True:
+            if no_errors >= self.max_errors:
+                raise ValueError(f"Maximum errors reached ({self.max_errors}). Stopping session.")
+            exhausted = None if fallback else self._check_budget(next_count, stats, budget, started)
+            if exhausted:
+                reason, limit = exhausted
+                stats.exhausted = reason
+                if self.current_step.auto_flow:
+                    raise RecursionError(f"{reason} ({limit}). Stopping session.")
+                yield _Remember(
+                    Event(
+                        type="fallback",
+                        content=(
+                            f"{reason}. Inform the user and based on the "
+                            "available context, produce a fallback response."
+                        ),
+                    )
+                )
+                # One final, constrained decision to produce the fallback response
+                fallback = True
+                no_errors = 0
+                decision_constraints = DecisionConstraints(actions=["RESPOND"], fields=["response"])
+
+            self.reset_deferred_tools()
+            log_debug(f"User input received: {user_input}")
+            if user_input:
+                yield _Remember(Event(type="user", content=user_input))
+                observed_input, user_input = user_input, None
+            log_debug(f"Current step: {self.current_step.step_id}")
+
+            # Check for flow transitions
+            yield _FlowTransitions(self.current_step.step_id, verbose=verbose)
+
+            stats.iterations += 1
+            decision: Optional[Decision] = (
+                self._match_route_rule(observed_input, observed_tools)
+                or self._bound_decision(observed_tools)
+                if decision_constraints is None
+                else None
             )
-
-        self._add_step_identifier(self.current_step.get_step_identifier())
-        if decision.action == Action.RESPOND:
-            self._add_event(self.name, str(decision.response), decision)
-            res = Response(decision=decision)
-            if verbose:
-                pp_response(res)
-            return res
-        elif decision.action == Action.TOOL_CALL and decision.tool_call:
+            if (
+                decision is None
+                and decision_constraints is None
+                and observed_input
+                and self._caches_answers()
+            ):
+                decision, embedding = yield _LookupAnswer(observed_input)
+                question = (observed_input, embedding) if decision is None else None
+            if decision is None:
+                stats.llm_calls += 1
+                decision = yield _Decide(decision_constraints)
+            log_debug(str(decision))
+            log_debug(f"Action decided: {decision.action}")
+
+            # Route rules only react to what happened since the last decision
+            observed_input, observed_tools = None, {}
+            next_count += 1
             _error: Optional[Exception] = None
-            tool_results = None
-            try:
-                tool_name = decision.tool_call.tool_name  # type: ignore
-                tool_kwargs: dict = decision.tool_call.tool_kwargs.model_dump()
-                log_debug(f"Running tool: {tool_name} with args: {tool_kwargs}")
+            decision_constraints = None
+
+            # Validate decision, fixing it locally if possible
+            decision = self._repair(decision, stats)
+            invalid = self._validate_decision(decision)
+            if invalid:
+                message, decision_constraints = invalid
+                yield _Remember(Event(type="error", content=message, decision=decision))
+                no_errors += 1
+                stats.retries += 1
+                continue
+
+            yield _Remember(self.current_step.get_step_identifier())
+            if question is not None and decision.action == Action.RESPOND and not fallback:
+                yield _StoreAnswer(*question, decision)
+            question = None
+            if decision.action == Action.RESPOND:
+                yield _Remember(
+                    Event(type=self.name, content=str(decision.response), decision=decision)
+                )
+                res = Response(decision=decision)
+                if verbose:
+                    pp_response(res)
+                return res
+            elif (
+                decision.action == Action.TOOL_CALL
+                and decision.tool_calls
+                and len(decision.tool_calls) > 1
+            ):
+                calls = [
+                    (call.tool_name, call.tool_kwargs.model_dump()) for call in decision.tool_calls
+                ]
+                log_debug(f"Running {len(calls)} tools in parallel: {calls}")
+                stats.tool_calls += len(calls)
+                outcomes = yield _CallTools(calls)
+                for (tool_name, tool_kwargs), outcome in zip(calls, outcomes):
+                    observed_tools[tool_name] = (outcome, not isinstance(outcome, Exception))
+                    if isinstance(outcome, Exception):
+                        _error = outcome
+                        yield _Remember(
+                            Event(
+                                type="tool",
+                                content=f"Running tool {tool_name} with args {tool_kwargs}",
+                                decision=decision,
+                            )
+                        )
+                        yield _Remember(
+                            Event(
+                                type="fallback" if isinstance(outcome, FallbackError) else "error",
+                                content=str(outcome),
+                                decision=decision,
+                            )
+                        )
+                    else:
+                        yield _Remember(
+                            Event(
+                                type="tool",
+                                content=f"Tool {tool_name} executed successfully with args {tool_kwargs}.\nResults: {outcome}",
+                                decision=decision,
+                            )
+                        )
+                res = Response(
+                    decision=decision,
+                    tool_output=[
+                        None if isinstance(outcome, Exception) else outcome for outcome in outcomes
+                    ],
+                )
+                if verbose:
+                    pp_response(res)
+                if return_tool and _error is None:
+                    return res
+            elif decision.action == Action.TOOL_CALL and decision.tool_call:
+                tool_results = None
                 try:
-                    tool_results = self._run_tool(tool_name, tool_kwargs)
-                    self._add_event(
-                        "tool",
-                        f"Tool {tool_name} executed successfully with args {tool_kwargs}.\nResults: {tool_results}",
-                        decision,
-                    )
+                    tool_name = decision.tool_call.tool_name  # type: ignore
+                    tool_kwargs: dict = decision.tool_call.tool_kwargs.model_dump()
+                    log_debug(f"Running tool: {tool_name} with args: {tool_kwargs}")
+                    try:
+                        stats.tool_calls += 1
+                        tool_results = yield _CallTool(tool_name, tool_kwargs)
+                        yield _Remember(
+                            Event(
+                                type="tool",
+                                content=f"Tool {tool_name} executed successfully with args {tool_kwargs}.\nResults: {tool_results}",
+                                decision=decision,
+                            )
+                        )
+                    except Exception as e:
+                        yield _Remember(
+                            Event(
+                                type="tool",
+                                content=f"Running tool {tool_name} with args {tool_kwargs}",
+                                decision=decision,
+                            )
+                        )
+                        raise e
+                    log_debug(f"Tool Results: {tool_results}")
+                except TurnTimeoutError:
+                    raise
+                except FallbackError as e:
+                    _error = e
+                    yield _Remember(Event(type="fallback", content=str(e), decision=decision))
+                except InvalidArgumentsError as e:
+                    _error = e
+                    yield _Remember(Event(type="error", content=str(e), decision=decision))
                 except Exception as e:
-                    self._add_event(
-                        "tool",
-                        f"Running tool {tool_name} with args {tool_kwargs}",
-                        decision,
-                    )
-                    raise e
-                log_debug(f"Tool Results: {tool_results}")
-            except FallbackError as e:
-                _error = e
-                self._add_event("fallback", str(e), decision)
-            except InvalidArgumentsError as e:
-                _error = e
-                self._add_event("error", str(e), decision)
-            except Exception as e:
-                _error = e
-                self._add_event("error", str(e), decision)
-
-            res = Response(decision=decision, tool_output=tool_results)
-            if verbose:
-                pp_response(res)
-            if return_tool and _error is None:
-                return res
-            return self.next(
-                no_errors=no_errors + 1 if _error else 0,
-                next_count=next_count + 1,
-                decision_constraints=(
-                    DecisionConstraints(
+                    _error = e
+                    yield _Remember(Event(type="error", content=str(e), decision=decision))
+
+                observed_tools[tool_name] = (_error or tool_results, _error is None)
+                res = Response(decision=decision, tool_output=tool_results)
+                if verbose:
+                    pp_response(res)
+                if return_tool and _error is None:
+                    return res
+                if isinstance(_error, InvalidArgumentsError):
+                    decision_constraints = DecisionConstraints(
                         actions=["TOOL_CALL"],
                         fields=["tool_call"],
                         tool_name=decision.tool_call.tool_name,
                     )
-                    if (_error and isinstance(_error, InvalidArgumentsError) and decision.tool_call)
-                    else None
-                ),
-                verbose=verbose,
-            )
-        elif decision.action == Action.MOVE and decision.step_id:
-            _error = None
-            if self.state_machine.can_transition(
-                self.state_machine.current_step_id, decision.step_id
-            ):
-                # Check if we need to exit current flow before moving
+            elif decision.action == Action.MOVE and decision.step_id:
+                path = self.state_machine.path_to(decision.step_id, self.config.max_move_hops)
+                if path is not None:
+                    for i, hop in enumerate(path):
+                        # Check if we need to exit current flow before moving
+                        if self.state_machine.current_flow and self.state_machine.flow_context:
+                            _, exits = self.state_machine.get_flow_transitions(
+                                self.state_machine.current_step_id
+                            )
+                            if self.state_machine.current_flow.flow_id in exits:
+                                yield _ExitFlow(self.state_machine.current_step_id)
+
+                        self.state_machine.move(hop)
+                        log_debug(f"Moving to next step: {self.state_machine.current_step_id}")
+                        yield _Remember(self.current_step.get_step_identifier())
+                        # Steps passed through enter their flows like any other step
+                        if i < len(path) - 1:
+                            yield _FlowTransitions(hop, verbose=verbose)
+
+                else:
+                    allowed = list(
+                        self.state_machine.transitions.get(self.state_machine.current_step_id, ())
+                    )
+                    yield _Remember(
+                        Event(
+                            type="error",
+                            content=f"Invalid route: {decision.step_id} not in {allowed}",
+                            decision=decision,
+                        )
+                    )
+                    _error = ValueError(f"Invalid route: {decision.step_id} not in {allowed}")
+                    decision_constraints = DecisionConstraints(actions=["MOVE"], fields=["step_id"])
+                res = Response(decision=decision)
+                if verbose:
+                    pp_response(res)
+                if return_step:
+                    yield _FlowTransitions(self.state_machine.current_step_id, verbose=verbose)
+                    return res
+            elif decision.action == Action.END:
+                # Clean up any active flows before ending
                 if self.state_machine.current_flow and self.state_machine.flow_context:
-                    _, exits = self.state_machine.get_flow_transitions(
-                        self.state_machine.current_step_id
+                    try:
+                        self.state_machine.current_flow.cleanup(self.state_machine.flow_context)
+                        log_debug(
+                            f"Cleaned up flow '{self.state_machine.current_flow.flow_id}' on session end"
+                        )
+                    except Exception as e:
+                        log_error(f"Error cleaning up flow on session end: {e}")
+                    finally:
+                        self.state_machine.current_flow = None
+                        self.state_machine.flow_context = None
+
+                yield _Remember(Event(type="end", content="Session ended.", decision=decision))
+                res = Response(decision=decision)
+                if verbose:
+                    pp_response(res)
+                return res
+            else:
+                yield _Remember(
+                    Event(
+                        type="error",
+                        content=f"Unknown action: {decision.action}. Please check the action type.",
+                        decision=decision,
                     )
-                    if self.state_machine.current_flow.flow_id in exits:
-                        self.state_machine._exit_flow(self.state_machine.current_step_id)
-
-                self.state_machine.move(decision.step_id)
-                log_debug(f"Moving to next step: {self.state_machine.current_step_id}")
-                self._add_step_identifier(self.current_step.get_step_identifier())
+                )
+                _error = ValueError(f"Unknown action: {decision.action}")
 
+            if _error:
+                no_errors += 1
+                stats.retries += 1
             else:
-                allowed = self.state_machine.transitions.get(self.state_machine.current_step_id, [])
-                self._add_event(
-                    "error",
-                    f"Invalid route: {decision.step_id} not in {allowed}",
-                    decision,
+                no_errors = 0
+
+    def _tool_args_error(self, decision: Decision) -> Optional[str]:
+        """Check the arguments of a decision's tool calls against their tools."""
+        if decision.action != Action.TOOL_CALL or decision.tool_call is None:
+            return None
+        for call in decision.tool_calls or [decision.tool_call]:
+            tool = self.tools.get(call.tool_name) or self.deferred_tools.get(call.tool_name)
+            if tool is None or isinstance(call.tool_kwargs, tool.get_args_model()):
+                continue
+            try:
+                tool._validate_args(call.tool_kwargs.model_dump())
+            except InvalidArgumentsError as e:
+                return str(e)
+        return None
+
+    def _repair(self, decision: Decision, stats: TurnStats) -> Decision:
+        """
+        Fix an invalid decision locally, saving an LLM retry.
+
+        :param decision: The decision to check.
+        :param stats: Accounting of the running turn.
+        :return: The repaired decision, or the decision unchanged if it is valid or cannot be fixed.
+        """
+        if not self.repairers:
+            return decision
+        invalid = self._validate_decision(decision)
+        error = invalid[0] if invalid else self._tool_args_error(decision)
+        if error is None:
+            return decision
+        stats.repair_attempts += 1
+        step = self.current_step
+        tools = {tool.name: tool for tool in self.compiled[step.step_id].tools}
+        tools.update(
+            (name, tool) for name, tool in self.deferred_tools.items() if name not in tools
+        )
+        context = RepairContext(
+            step=step,
+            routes=list(self._move_paths(step) or step.get_available_routes()),
+            tools=tools,
+            error=error,
+            tool_defs=self.config.tools.tool_defs or {},
+        )
+        try:
+            with collect(self._metrics), timed("repair"):
+                repaired = repair_decision(decision, context, self.repairers)
+        except Exception as e:
+            log_error(f"Decision repair failed: {e}")
+            return decision
+        if repaired is None or self._validate_decision(repaired) or self._tool_args_error(repaired):
+            return decision
+        stats.repairs += 1
+        log_debug(f"Repaired invalid decision ({error}): {repaired}")
+        return repaired
+
+    def _match_route_rule(
+        self, user_input: Optional[str], tool_results: Dict[str, Tuple[Any, bool]]
+    ) -> Optional[Decision]:
+        """
+        Check the current step's route rules, deciding a MOVE locally if one matches.
+
+        :param user_input: User input received since the last decision, if any.
+        :param tool_results: Tool name to (output, succeeded) of the tool calls since the
+            last decision.
+        :return: The MOVE decision of the first matching route, or None to ask the LLM.
+        """
+        routes = self.compiled[self.current_step.step_id].rule_routes
+        if not routes:
+            return None
+        state = self._flow_state_values()
+        for route in routes:
+            if route.rule.matches(user_input, tool_results, state):  # type: ignore[union-attr]
+                log_debug(f"Route rule matched, moving to {route.target} without the LLM")
+                return Decision(
+                    reasoning=[f"Route rule matched: {route.condition}"],
+                    action=Action.MOVE,
+                    step_id=route.target,
                 )
-                _error = ValueError(f"Invalid route: {decision.step_id} not in {allowed}")
-            res = Response(decision=decision)
-            if verbose:
-                pp_response(res)
-            if return_step:
-                self.state_machine.handle_flow_transitions(
-                    self.state_machine.current_step_id, self.session_id, verbose=verbose
+        return None
+
+    def _flow_state_values(self) -> Dict[str, Any]:
+        """Get the flow state values seen by route rules and tool bindings."""
+        flow_context = self.state_machine.flow_context
+        return {
+            **(flow_context.metadata if flow_context else {}),
+            "flow_id": flow_context.flow_id if flow_context else None,
+        }
+
+    def _bound_decision(self, tool_results: Dict[str, Tuple[Any, bool]]) -> Optional[Decision]:
+        """
+        Decide locally in a step with tool bindings.
+
+        The step's tool is called with its bound arguments, then its single
+        route is followed once the call succeeded. Anything else (unresolved
+        bindings, a failed call, several routes) is left to the LLM.
+
+        :param tool_results: Tool name to (output, succeeded) of the tool calls since the
+            last decision.
+        :return: The TOOL_CALL or MOVE decision, or None to ask the LLM.
+        """
+        step = self.current_step
+        if step.tool_bindings is None:
+            return None
+        tool_name = step.available_tools[0]
+        if tool_name in tool_results:
+            if tool_results[tool_name][1] and len(step.routes) == 1:
+                return Decision(
+                    reasoning=[f"Tool {tool_name} succeeded, following the only route"],
+                    action=Action.MOVE,
+                    step_id=step.routes[0].target,
                 )
-                return res
-            return self.next(
-                no_errors=no_errors + 1 if _error else 0,
-                next_count=next_count + 1,
-                decision_constraints=(
-                    DecisionConstraints(actions=["MOVE"], fields=["step_id"]) if _error else None
-                ),
-                verbose=verbose,
+            return None
+        try:
+            history = self._get_decision_history()
+            state = self._flow_state_values()
+            kwargs = {
+                arg: resolve_binding(expression, history, state)
+                for arg, expression in step.tool_bindings.items()
+            }
+            tool_kwargs = self._get_tool(tool_name).get_args_model()(**kwargs)
+        except (UnresolvedBinding, ValueError) as e:
+            log_debug(f"Tool bindings of step {step.step_id} not resolved, asking the LLM: {e}")
+            return None
+        return Decision(
+            reasoning=[f"Calling {tool_name} with bound arguments"],
+            action=Action.TOOL_CALL,
+            tool_call=ToolCall(tool_name=tool_name, tool_kwargs=tool_kwargs),
+        )
+
+    @staticmethod
+    def _validate_decision(decision: Decision) -> Optional[Tuple[str, DecisionConstraints]]:
+        """
+        Check that a decision carries the field its action requires.
+
+        :return: The error message and the constraints for the retry, or None if valid.
+        """
+        if decision.action == Action.RESPOND and decision.response is None:
+            return (
+                "RESPOND action requires a response, but none was provided.",
+                DecisionConstraints(actions=["RESPOND"], fields=["response"]),
             )
-        elif decision.action == Action.END:
-            # Clean up any active flows before ending
-            if self.state_machine.current_flow and self.state_machine.flow_context:
-                try:
-                    self.state_machine.current_flow.cleanup(self.state_machine.flow_context)
-                    log_debug(
-                        f"Cleaned up flow '{self.state_machine.current_flow.flow_id}' on session end"
-                    )
-                except Exception as e:
-                    log_error(f"Error cleaning up flow on session end: {e}")
-                finally:
-                    self.state_machine.current_flow = None
-                    self.state_machine.flow_context = None
-
-            self._add_event("end", "Session ended.", decision)
-            res = Response(decision=decision)
-            if verbose:
-                pp_response(res)
-            return res
-        else:
-            self._add_event(
-                "error",
-                f"Unknown action: {decision.action}. Please check the action type.",
-                decision,
+        if decision.action == Action.MOVE and decision.step_id is None:
+            return (
+                "MOVE action requires a step_id, but none was provided.",
+                DecisionConstraints(actions=["MOVE"], fields=["step_id"]),
             )
-            return self.next(
-                no_errors=no_errors + 1,
-                next_count=next_count + 1,
-                verbose=verbose,
+        if decision.action == Action.TOOL_CALL and decision.tool_call is None:
+            return (
+                "TOOL_CALL action requires a tool_call, but none was provided.",
+                DecisionConstraints(actions=["TOOL_CALL"], fields=["tool_call"]),
             )
+        return None
 
-    def _add_step_identifier(self, step_identifier: StepIdentifier) -> None:
-        """
-        Add a step identifier to the appropriate memory.
 
-        :param step_identifier: The step identifier to add.
+class AgentTool:
+    """
+    Delegates to another agent running in the same process.
+
+    Each calling session talks to its own session of the delegate agent, kept
+    alive between calls, so the delegate's state is passed by reference instead
+    of being serialized. The delegate keeps using its own LLM clients, compiled
+    tables and caches; agents built with the same LLM instances share them.
+    """
+
+    def __init__(
+        self,
+        agent: "Agent",
+        budget: Optional[TurnBudget] = None,
+        max_sessions: Optional[int] = None,
+    ) -> None:
         """
-        # If we're in a flow, only update flow memory
-        if self.state_machine.current_flow and self.state_machine.flow_context:
-            flow_memory = self.state_machine.current_flow.get_memory()
-            if flow_memory and isinstance(flow_memory, FlowMemoryComponent):
-                flow_memory.add_to_context(step_identifier)
-            # Don't update session memory while in flow
-        else:
-            # Only update session memory when not in a flow
-            self.memory.add(step_identifier)
+        Initialize an AgentTool.
 
-        if self.event_emitter:
-            try:
-                from .events import SessionEvent
+        :param agent: The agent to delegate to.
+        :param budget: Optional limits for each delegated turn. Defaults to the agent's turn budget.
+        :param max_sessions: Maximum number of delegate sessions kept alive, least recently
+            used first out. Defaults to the agent's session pool size.
+        """
+        self.agent = agent
+        self.budget = budget
+        self.max_sessions = max_sessions or agent.session_pool_size
+        self.sessions: "OrderedDict[str, Session]" = OrderedDict()
+        self._lock = threading.Lock()
 
-                sess_event = SessionEvent(
-                    session_id=self.session_id,
-                    event_type="step",
-                    data={"step_id": step_identifier.step_id},
-                )
-                # Use create_task but add error handling
-                task = asyncio.create_task(self.event_emitter.emit(sess_event))
-                task.add_done_callback(self._handle_event_emission_error)
-            except Exception as exc:  # noqa: BLE001
-                log_error(f"Failed to emit step event: {exc}")
+    def session(self, caller_id: Optional[str] = None) -> Session:
+        """
+        Get the delegate session of a calling session, creating it if needed.
 
-        log_debug(f"Step identifier added: {step_identifier.step_id}")
+        :param caller_id: Session ID of the caller. Without one, a new session is used.
+        :return: The delegate session.
+        """
+        with self._lock:
+            session = self.sessions.get(caller_id) if caller_id else None
+            if session is not None:
+                self.sessions.move_to_end(caller_id)
+                return session
+            session = self.agent.create_session()
+            if caller_id:
+                self.sessions[caller_id] = session
+                while len(self.sessions) > self.max_sessions:
+                    self.sessions.popitem(last=False)
+            return session
+
+    def _caller_session(self) -> Session:
+        """Get the delegate session of the session running this tool call."""
+        caller = _calling_session.get()
+        return self.session(caller.session_id if caller else None)
+
+    @staticmethod
+    def _output(res: Response) -> str:
+        """Get the result of a delegated turn."""
+        if res.decision.response is not None:
+            return str(res.decision.response)
+        return str(res.tool_output)
+
+    def run(self, query: str) -> str:
+        """Run a turn of the delegate agent."""
+        return self._output(self._caller_session().next(query, budget=self.budget))
+
+    async def arun(self, query: str) -> str:
+        """Asynchronously run a turn of the delegate agent."""
+        return self._output(await self._caller_session().anext(query, budget=self.budget))
 
 
 class Agent:
@@ -607,13 +2060,14 @@ class Agent:
         start_step_id: str,
         persona: Optional[str] = None,
         system_message: Optional[str] = None,
-        tools: Optional[List[Union[Callable, ToolWrapper]]] = None,
+        tools: Optional[List[Union[Callable, ToolWrapper, Tool]]] = None,
         flows: Optional[List[Flow]] = None,
         show_steps_desc: bool = False,
         max_errors: int = 3,
         max_iter: int = 5,
         config: Optional[AgentConfig] = None,
         embedding_model: Optional[LLMBase] = None,
+        repairers: Optional[List[DecisionRepairer]] = None,
     ) -> None:
         """
         Initialize an Agent.
@@ -624,13 +2078,16 @@ class Agent:
         :param start_step_id: ID of the starting step.
         :param persona: Optional persona string.
         :param system_message: Optional system message.
-        :param tools: List of tool callables or ToolWrapper instances.
+        :param tools: List of tool callables, ToolWrapper or Tool instances.
         :param flows: Optional list of Flow objects.
         :param show_steps_desc: Whether to show step descriptions.
         :param max_errors: Maximum consecutive errors before stopping or fallback. (Defaults to 3)
         :param max_iter: Maximum number of decision loops for single action. (Defaults to 5)
         :param config: Optional AgentConfig.
         :param embedding_model: Optional LLMBase instance for embeddings.
+        :param repairers: Optional repairers tried on invalid decisions before asking the LLM
+            again. Defaults to the built-in repairers if ``repair_decisions`` is enabled in the
+            config, and to none otherwise.
         """
         self.llm = llm
         self.name = name
@@ -642,12 +2099,15 @@ class Agent:
         self.max_errors = max_errors
         self.max_iter = max_iter
         self.config = config
+        self.repairers = repairers
         self.embedding_model = (
             embedding_model
             or (config.get_embedding_model() if config else None)
             or (llm if isinstance(llm, LLMBase) else llm.get("global", None))
         )
         assert self.embedding_model, "Embedding model must be provided or configured."
+        if config and config.embedding_cache:
+            self.embedding_model = config.embedding_cache.wrap(self.embedding_model)
         self._setup_logging()
         self.flows = flows or (
             list(create_flows_from_config(config).flows.values())
@@ -660,7 +2120,9 @@ class Agent:
         _tools = []
         for tool in tools or []:
             tool_id = (
-                tool.name if isinstance(tool, ToolWrapper) else getattr(tool, "__name__", None)
+                tool.name
+                if isinstance(tool, (ToolWrapper, Tool))
+                else getattr(tool, "__name__", None)
             )
             tool_id = tool_id or id(tool)  # Fallback to id if no name
             if tool_id not in seen:
@@ -701,12 +2163,52 @@ class Agent:
                 log_debug(f"Step {step.step_id} has examples, performing batch embedding")
                 step.batch_embed_examples(embedding_model=self.embedding_model)
 
+        # Compile the read-only step, tool and prompt tables shared by all sessions
+        self.compiled = CompiledAgent.compile(
+            self.steps,
+            self.tools,
+            llms=llm if isinstance(llm, dict) else {"global": llm},
+            system_message=system_message,
+            persona=persona,
+            max_move_hops=config.max_move_hops if config else 1,
+        )
+
+        # Shared components and idle session shells for stateless requests
+        self._flow_manager: Optional[FlowManager] = None
+        if self.flows:
+            self._flow_manager = FlowManager()
+            for flow in self.flows:
+                self._flow_manager.register_flow(flow)
+        # Decision models of every step and retry constraint, built up front
+        self.schemas = SchemaRegistry(config.schema_cache_size if config else 1024)
+        self.schemas.warm(
+            self.compiled,
+            max_move_hops=config.max_move_hops if config else 1,
+            reasoning=config.reasoning if config else "full",
+            max_reasoning_steps=config.max_reasoning_steps if config else 3,
+        )
+        self._memory_template: Optional[Memory] = None
+        self._session_shells: Deque[Session] = deque()
+        self.session_pool_size = config.session_pool_size if config else 16
+        self.rate_limiter = (
+            RateLimiter(config.llm_requests_per_minute)
+            if config and config.llm_requests_per_minute
+            else None
+        )
+        self.response_cache = (
+            config.response_cache.get_cache() if config and config.response_cache else None
+        )
+        self.answer_cache = (
+            config.answer_cache.get_cache() if config and config.answer_cache else None
+        )
+        self.executor = SharedExecutor(name="nomos-prefetch")
+
     @classmethod
     def from_config(
         cls,
         config: AgentConfig,
         llm: Optional[Union[LLMBase, Dict[str, LLMBase]]] = None,
-        tools: Optional[List[Union[Callable, ToolWrapper]]] = None,
+        tools: Optional[List[Union[Callable, ToolWrapper, Tool]]] = None,
     ) -> "Agent":
         """
         Create an Agent from an AgentConfig object.
@@ -753,9 +2255,7 @@ class Agent:
         """
         log_debug("Creating new session")
         if not memory:
-            memory = (
-                self.config.memory.get_memory() if self.config and self.config.memory else Memory()
-            )
+            memory = self._new_memory()
         assert self.embedding_model, "Embedding model must be provided or configured."
         return Session(
             name=self.name,
@@ -772,8 +2272,24 @@ class Agent:
             max_iter=self.max_iter,
             config=self.config,
             embedding_model=self.embedding_model,
+            compiled=self.compiled,
+            flow_manager=self._flow_manager,
+            rate_limiter=self.rate_limiter,
+            repairers=self.repairers,
+            schemas=self.schemas,
+            response_cache=self.response_cache,
+            answer_cache=self.answer_cache,
+            executor=self.executor,
         )
 
+    def _new_memory(self) -> Memory:
+        """Create an empty memory, sharing the configured memory's clients across sessions."""
+        if self._memory_template is None:
+            self._memory_template = (
+                self.config.memory.get_memory() if self.config and self.config.memory else Memory()
+            )
+        return self._memory_template.spawn()
+
     def load_session(self, session_id: str) -> Session:
         """
         Load a Session by session_id.
@@ -793,7 +2309,7 @@ class Agent:
         """
         log_debug(f"Creating session from state: {state}")
 
-        memory = self.config.memory.get_memory() if self.config and self.config.memory else Memory()
+        memory = self._new_memory()
 
         assert self.embedding_model, "Embedding model must be provided or configured."
         session = Session(
@@ -812,6 +2328,14 @@ class Agent:
             max_errors=self.max_errors,
             max_iter=self.max_iter,
             state=state,
+            compiled=self.compiled,
+            flow_manager=self._flow_manager,
+            rate_limiter=self.rate_limiter,
+            repairers=self.repairers,
+            schemas=self.schemas,
+            response_cache=self.response_cache,
+            answer_cache=self.answer_cache,
+            executor=self.executor,
         )
 
         return session
@@ -825,6 +2349,7 @@ class Agent:
         verbose: bool = False,
         decision_constraints: Optional[DecisionConstraints] = None,
         keep_event_decision: bool = False,
+        budget: Optional[TurnBudget] = None,
     ) -> Response:
         """
         Advance the session to the next step based on user input and LLM decision.
@@ -836,23 +2361,251 @@ class Agent:
         :param verbose: Whether to return verbose output.
         :param decision_constraints: Optional constraints for the decision model on retry.
         :param keep_event_decision: Whether to retain decision data in returned events.
+        :param budget: Optional limits for this turn. Defaults to the config's turn budget.
         :return: A tuple containing the decision and tool output, along with the updated session state.
         :raises ValueError: If session_data is provided but not a valid State object.
         """
+        session = self._get_session(session_data)
+        try:
+            res = session.next(
+                user_input=user_input,
+                return_tool=return_tool,
+                return_step=return_step,
+                decision_constraints=decision_constraints,
+                verbose=verbose,
+                budget=budget,
+            )
+            return self._attach_state(res, session, keep_event_decision)
+        finally:
+            self._release_session(session)
+
+    async def anext(
+        self,
+        user_input: Optional[str] = None,
+        session_data: Optional[Union[dict, State]] = None,
+        return_tool: bool = False,
+        return_step: bool = False,
+        verbose: bool = False,
+        decision_constraints: Optional[DecisionConstraints] = None,
+        keep_event_decision: bool = False,
+        budget: Optional[TurnBudget] = None,
+    ) -> Response:
+        """
+        Asynchronously advance the session to the next step.
+
+        Same semantics as :meth:`next`, using :meth:`Session.anext`.
+
+        :param user_input: Optional user input string.
+        :param session_data: Optional session data as a dictionary or State object.
+        :param return_tool: Whether to return tool results.
+        :param return_step: Whether to return step Transitions.
+        :param verbose: Whether to return verbose output.
+        :param decision_constraints: Optional constraints for the decision model on retry.
+        :param keep_event_decision: Whether to retain decision data in returned events.
+        :param budget: Optional limits for this turn. Defaults to the config's turn budget.
+        :return: The response, along with the updated session state.
+        """
+        session = self._get_session(session_data)
+        try:
+            res = await session.anext(
+                user_input=user_input,
+                return_tool=return_tool,
+                return_step=return_step,
+                decision_constraints=decision_constraints,
+                verbose=verbose,
+                budget=budget,
+            )
+            return self._attach_state(res, session, keep_event_decision)
+        finally:
+            self._release_session(session)
+
+    def stream(
+        self,
+        user_input: Optional[str] = None,
+        session_data: Optional[Union[dict, State]] = None,
+        return_tool: bool = False,
+        return_step: bool = False,
+        verbose: bool = False,
+        decision_constraints: Optional[DecisionConstraints] = None,
+        keep_event_decision: bool = False,
+        budget: Optional[TurnBudget] = None,
+    ) -> Iterator[Union[str, Response]]:
+        """
+        Advance the session like :meth:`next`, streaming the response as it is generated.
+
+        :param user_input: Optional user input string.
+        :param session_data: Optional session data as a dictionary or State object.
+        :param return_tool: Whether to return tool results.
+        :param return_step: Whether to return step Transitions.
+        :param verbose: Whether to return verbose output.
+        :param decision_constraints: Optional constraints for the decision model on retry.
+        :param keep_event_decision: Whether to retain decision data in returned events.
+        :param budget: Optional limits for this turn. Defaults to the config's turn budget.
+        :return: Iterator of response text chunks, ending with the Response and updated state.
+        """
+        session = self._get_session(session_data)
+        try:
+            for item in session.stream(
+                user_input=user_input,
+                return_tool=return_tool,
+                return_step=return_step,
+                decision_constraints=decision_constraints,
+                verbose=verbose,
+                budget=budget,
+            ):
+                if isinstance(item, Response):
+                    item = self._attach_state(item, session, keep_event_decision)
+                yield item
+        finally:
+            self._release_session(session)
+
+    async def astream(
+        self,
+        user_input: Optional[str] = None,
+        session_data: Optional[Union[dict, State]] = None,
+        return_tool: bool = False,
+        return_step: bool = False,
+        verbose: bool = False,
+        decision_constraints: Optional[DecisionConstraints] = None,
+        keep_event_decision: bool = False,
+        budget: Optional[TurnBudget] = None,
+    ) -> AsyncIterator[Union[str, Response]]:
+        """
+        Asynchronously advance the session, streaming the response as it is generated.
+
+        Same semantics as :meth:`stream`, using :meth:`Session.astream`.
+        """
+        session = self._get_session(session_data)
+        try:
+            async for item in session.astream(
+                user_input=user_input,
+                return_tool=return_tool,
+                return_step=return_step,
+                decision_constraints=decision_constraints,
+                verbose=verbose,
+                budget=budget,
+            ):
+                if isinstance(item, Response):
+                    item = self._attach_state(item, session, keep_event_decision)
+                yield item
+        finally:
+            self._release_session(session)
+
+    def next_many(
+        self,
+        inputs: Iterable[Tuple[Optional[str], Optional[Union[dict, State]]]],
+        concurrency: int = 8,
+        return_exceptions: bool = False,
+        **kwargs: Any,
+    ) -> List[Union[Response, Exception]]:
+        """
+        Run many independent turns concurrently, returning their responses in input order.
+
+        Turns run on an event loop via :meth:`anext`, so this cannot be called
+        from a running event loop; use :meth:`anext_many` there instead.
+
+        :param inputs: ``(user_input, session_data)`` pairs, one per turn.
+        :param concurrency: Maximum number of turns running at once.
+        :param return_exceptions: Return a failed turn's exception in its place instead of
+            raising it.
+        :param kwargs: Additional arguments passed to :meth:`anext` for every turn.
+        :return: The responses, in the order of ``inputs``.
+        """
+
+        async def collect() -> List[Union[Response, Exception]]:
+            return [
+                res
+                async for res in self.anext_many(
+                    inputs, concurrency=concurrency, return_exceptions=return_exceptions, **kwargs
+                )
+            ]
+
+        return asyncio.run(collect())
+
+    async def anext_many(
+        self,
+        inputs: Iterable[Tuple[Optional[str], Optional[Union[dict, State]]]],
+        concurrency: int = 8,
+        return_exceptions: bool = False,
+        **kwargs: Any,
+    ) -> AsyncIterator[Union[Response, Exception]]:
+        """
+        Run many independent turns concurrently, yielding their responses in input order.
+
+        Each response is yielded as soon as it and all responses before it are
+        done. Inputs are consumed lazily, so at most ``2 * concurrency`` turns
+        are started ahead of the next response to yield. LLM requests are
+        spaced out by the agent's rate limiter when ``llm_requests_per_minute``
+        is configured.
+
+        :param inputs: ``(user_input, session_data)`` pairs, one per turn.
+        :param concurrency: Maximum number of turns running at once.
+        :param return_exceptions: Yield a failed turn's exception in its place instead of
+            raising it.
+        :param kwargs: Additional arguments passed to :meth:`anext` for every turn.
+        :return: Async iterator of responses, in the order of ``inputs``.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(user_input: Optional[str], session_data: Any) -> Response:  # noqa: ANN401
+            async with semaphore:
+                return await self.anext(user_input, session_data=session_data, **kwargs)
+
+        pending: Deque[asyncio.Task] = deque()
+        iterator = iter(inputs)
+        try:
+            while True:
+                while len(pending) < 2 * concurrency:
+                    item = next(iterator, None)
+                    if item is None:
+                        break
+                    pending.append(asyncio.ensure_future(run(*item)))
+                if not pending:
+                    return
+                task = pending.popleft()
+                try:
+                    yield await task
+                except Exception as exc:
+                    if not return_exceptions:
+                        raise
+                    yield exc
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _get_session(self, session_data: Optional[Union[dict, State]] = None) -> Session:
+        """
+        Get a session for a single request, hydrated from optional session data.
+
+        Idle session shells are reused when available, so only the request's
+        state is attached instead of building a new session.
+        """
         if isinstance(session_data, dict):
             session_data = State.model_validate(session_data)
-        session = (
-            self.get_session_from_state(session_data)
-            if session_data is not None and isinstance(session_data, State)
-            else self.create_session()
-        )
-        res = session.next(
-            user_input=user_input,
-            return_tool=return_tool,
-            return_step=return_step,
-            decision_constraints=decision_constraints,
-            verbose=verbose,
-        )
+        state = session_data if isinstance(session_data, State) else None
+        try:
+            session = self._session_shells.pop()
+        except IndexError:
+            session = self.create_session()
+        return session.hydrate(state)
+
+    def _release_session(self, session: Session) -> None:
+        """
+        Return a session used for a single request to the pool of idle shells.
+
+        A session with an abandoned LLM or tool call is dropped instead, since
+        the call may still update it after another conversation is attached.
+        """
+        if session._abandoned_effect:
+            return
+        if len(self._session_shells) < self.session_pool_size:
+            self._session_shells.append(session)
+
+    @staticmethod
+    def _attach_state(res: Response, session: Session, keep_event_decision: bool) -> Response:
+        """Attach the session state to a response, stripping event decisions unless kept."""
         state = session.get_state()
         if not keep_event_decision:
             for item in state.history:
@@ -865,6 +2618,49 @@ class Agent:
         res.state = state
         return res
 
+    def inspect_prompt(self, step_id: str) -> PromptInfo:
+        """
+        Get the compiled static system prompt of a step and its size.
+
+        :param step_id: ID of the step.
+        :return: The prompt with its length in characters and tokens.
+        """
+        if step_id not in self.steps:
+            raise ValueError(f"Step ID {step_id} not found in steps")
+        llms = self.llm if isinstance(self.llm, dict) else {"global": self.llm}
+        llm = llms.get(self.steps[step_id].llm or "global", llms["global"])
+        prompt = self.compiled[step_id].prompt
+        if prompt is None:
+            raise ValueError(f"No compiled prompt for step {step_id}: its LLM is not an LLMBase")
+        return PromptInfo(
+            step_id=step_id, prompt=prompt, chars=len(prompt), tokens=llm.token_counter(prompt)
+        )
+
+    def as_tool(
+        self,
+        name: Optional[str] = None,
+        description: Optional[str] = None,
+        budget: Optional[TurnBudget] = None,
+        max_sessions: Optional[int] = None,
+    ) -> Tool:
+        """
+        Wrap this agent as a tool other agents in the same process can delegate to.
+
+        :param name: Name of the tool. Defaults to the agent's name.
+        :param description: Description of the tool. Defaults to the agent's persona.
+        :param budget: Optional limits for each delegated turn. Defaults to the agent's turn budget.
+        :param max_sessions: Maximum number of delegate sessions kept alive.
+        :return: Tool taking the message to send to this agent and returning its response.
+        """
+        delegate = AgentTool(self, budget=budget, max_sessions=max_sessions)
+        return Tool(
+            name=name or self.name,
+            description=description or self.persona or f"Delegate to the {self.name} agent.",
+            function=delegate.run,
+            async_function=delegate.arun,
+            parameters={"query": {"type": str, "description": "Message to send to the agent."}},
+        )
+
     def display(self, save_path: Optional[str] = None, is_notebook: bool = True) -> None:
         """
         Visualize the agent's steps and flows.
@@ -887,4 +2683,4 @@ class Agent:
         )
 
 
-__all__ = ["Session", "Agent"]
+__all__ = ["Session", "Agent", "AgentTool"]
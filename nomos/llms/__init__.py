@@ -6,7 +6,16 @@ from pydantic import BaseModel
 
 from .anthropic import Anthropic
 from .base import LLMBase
+from .cache import (
+    LRUResponseCache,
+    RedisResponseCache,
+    ResponseCache,
+    ResponseCacheBackend,
+    ResponseCacheConfig,
+    SQLiteResponseCache,
+)
 from .cohere import Cohere
+from .embeddings import CachedEmbeddings, EmbeddingCache, EmbeddingCacheConfig
 from .google import Gemini
 from .groq import Groq
 from .huggingface import HuggingFace
@@ -53,6 +62,15 @@ class LLMConfig(BaseModel):
 __all__ = [
     "LLMConfig",
     "LLMBase",
+    "ResponseCache",
+    "ResponseCacheBackend",
+    "ResponseCacheConfig",
+    "LRUResponseCache",
+    "SQLiteResponseCache",
+    "RedisResponseCache",
+    "EmbeddingCache",
+    "EmbeddingCacheConfig",
+    "CachedEmbeddings",
     "OpenAI",
     "Cohere",
     "Gemini",
@@ -1,10 +1,11 @@
 """Anthropic LLMs integration for Nomos."""
 
-from typing import List
+from typing import AsyncIterator, Iterator, List, Optional, Tuple, Union
 
 from pydantic import BaseModel
 
 from ..models.agent import Message
+from ..utils.metrics import record_usage
 from .base import LLMBase
 
 
@@ -13,40 +14,36 @@ class Anthropic(LLMBase):
 
     __provider__: str = "anthropic"
 
-    def __init__(self, model: str = "claude-sonnet-4-20250514", **kwargs) -> None:
+    def __init__(
+        self, model: str = "claude-sonnet-4-20250514", cache_prompts: bool = True, **kwargs
+    ) -> None:
         """
         Initialize the Anthropic LLM.
 
         :param model: Model name to use (default: claude-3-5-sonnet-20241022).
+        :param cache_prompts: Mark the tools and system prompt as a cacheable prefix.
         :param kwargs: Additional parameters for Anthropic API.
         """
         try:
             from anthropic import Anthropic as AnthropicClient
+            from anthropic import AsyncAnthropic
         except ImportError:
             raise ImportError(
                 "Anthropic package is not installed. Please install it using 'pip install nomos[anthropic]'."
             )
 
         self.model = model
+        self.cache_prompts = cache_prompts
         self.client = AnthropicClient(**kwargs)
+        self.async_client = AsyncAnthropic(**kwargs)
 
-    def get_output(
-        self,
-        messages: List[Message],
-        response_format: BaseModel,
-        **kwargs: dict,
-    ) -> BaseModel:
+    def _split_messages(self, messages: List[Message]) -> Tuple[Union[str, List[dict]], List[dict]]:
         """
-        Get a structured response from the Anthropic LLM.
+        Split messages into the system prompt and Anthropic formatted messages.
 
-        :param messages: List of Message objects.
-        :param response_format: Pydantic model for the expected response.
-        :param kwargs: Additional parameters for Anthropic API.
-        :return: Parsed response as a BaseModel.
+        With prompt caching, the system prompt ends with a cache breakpoint, so
+        requests sharing the tools and system prompt read them from the cache.
         """
-        from anthropic.types import Message as AnthropicMessage
-
-        # Convert messages to Anthropic format
         _messages = []
         system_message = None
 
@@ -55,27 +52,168 @@ class Anthropic(LLMBase):
                 system_message = msg.content
             else:
                 _messages.append({"role": msg.role, "content": msg.content})
+        if not system_message or not self.cache_prompts:
+            return system_message or "", _messages
+        system = [{"type": "text", "text": system_message, "cache_control": {"type": "ephemeral"}}]
+        return system, _messages
 
-        # Create a tool for structured output
-        _output_tool = {
+    @staticmethod
+    def _output_tool(response_format: BaseModel, kwargs: dict) -> dict:
+        """Create a tool for structured output."""
+        return {
             "name": kwargs.get("output_tool_name", "get_next_decision"),
             "description": kwargs.get(
                 "output_tool_description", "Get the next decision based on the input."
             ),
-            "input_schema": response_format.model_json_schema(),
+            "input_schema": LLMBase.get_json_schema(response_format),
         }
 
+    @staticmethod
+    def _record_usage(response) -> None:
+        """Report the token usage of an Anthropic response to the running turn."""
+        usage = getattr(response, "usage", None)
+        if usage:
+            # Input tokens exclude the ones written to and read from the cache
+            cache_read = getattr(usage, "cache_read_input_tokens", None) or 0
+            cache_write = getattr(usage, "cache_creation_input_tokens", None) or 0
+            record_usage(
+                usage.input_tokens + cache_read + cache_write,
+                usage.output_tokens,
+                cached_tokens=cache_read,
+            )
+
+    @classmethod
+    def _parse_output(cls, response, output_tool: dict, response_format: BaseModel) -> BaseModel:
+        """Parse the structured output tool call from an Anthropic response."""
+        cls._record_usage(response)
+        tool_use = next(block for block in response.content if block.type == "tool_use")
+        assert tool_use.name == output_tool["name"], "Unexpected tool use name in response"
+        assert tool_use.input, "Tool use input is empty"
+        return response_format.model_validate(tool_use.input)
+
+    @classmethod
+    def _parse_text(cls, response) -> str:
+        """Extract the text content from an Anthropic response."""
+        cls._record_usage(response)
+        text = next(
+            (block.text for block in response.content if block.type == "text"),
+            None,
+        )
+        if text is None:
+            raise ValueError("No text content found in the response.")
+        return text
+
+    def get_output(
+        self,
+        messages: List[Message],
+        response_format: BaseModel,
+        **kwargs: dict,
+    ) -> BaseModel:
+        """
+        Get a structured response from the Anthropic LLM.
+
+        :param messages: List of Message objects.
+        :param response_format: Pydantic model for the expected response.
+        :param kwargs: Additional parameters for Anthropic API.
+        :return: Parsed response as a BaseModel.
+        """
+        from anthropic.types import Message as AnthropicMessage
+
+        system_message, _messages = self._split_messages(messages)
+        _output_tool = self._output_tool(response_format, kwargs)
+
         response: AnthropicMessage = self.client.messages.create(
             model=self.model,
             tools=[_output_tool],
-            system=system_message or "",
+            system=system_message,
             messages=_messages,
             **kwargs,
         )
-        tool_use = next(block for block in response.content if block.type == "tool_use")
-        assert tool_use.name == _output_tool["name"], "Unexpected tool use name in response"
-        assert tool_use.input, "Tool use input is empty"
-        return response_format.model_validate(tool_use.input)
+        return self._parse_output(response, _output_tool, response_format)
+
+    async def aget_output(
+        self,
+        messages: List[Message],
+        response_format: BaseModel,
+        **kwargs: dict,
+    ) -> BaseModel:
+        """Asynchronously get a structured response from the Anthropic LLM."""
+        system_message, _messages = self._split_messages(messages)
+        _output_tool = self._output_tool(response_format, kwargs)
+
+        response = await self.async_client.messages.create(
+            model=self.model,
+            tools=[_output_tool],
+            system=system_message,
+            messages=_messages,
+            **kwargs,
+        )
+        return self._parse_output(response, _output_tool, response_format)
+
+    def stream_output(
+        self,
+        messages: List[Message],
+        response_format: BaseModel,
+        **kwargs: dict,
+    ) -> Iterator[Union[str, BaseModel]]:
+        """
+        Stream a structured response from the Anthropic LLM.
+
+        The partial JSON input of the structured output tool is yielded as it
+        is generated.
+
+        :param messages: List of Message objects.
+        :param response_format: Pydantic model for the expected response.
+        :param kwargs: Additional parameters for Anthropic API.
+        :return: Iterator of JSON text chunks, ending with the parsed response.
+        """
+        system_message, _messages = self._split_messages(messages)
+        _output_tool = self._output_tool(response_format, kwargs)
+
+        with self.client.messages.stream(
+            model=self.model,
+            tools=[_output_tool],
+            system=system_message,
+            messages=_messages,
+            **kwargs,
+        ) as stream:
+            for event in stream:
+                chunk = self._partial_json(event)
+                if chunk:
+                    yield chunk
+            response = stream.get_final_message()
+        yield self._parse_output(response, _output_tool, response_format)
+
+    async def astream_output(
+        self,
+        messages: List[Message],
+        response_format: BaseModel,
+        **kwargs: dict,
+    ) -> AsyncIterator[Union[str, BaseModel]]:
+        """Asynchronously stream a structured response from the Anthropic LLM."""
+        system_message, _messages = self._split_messages(messages)
+        _output_tool = self._output_tool(response_format, kwargs)
+
+        async with self.async_client.messages.stream(
+            model=self.model,
+            tools=[_output_tool],
+            system=system_message,
+            messages=_messages,
+            **kwargs,
+        ) as stream:
+            async for event in stream:
+                chunk = self._partial_json(event)
+                if chunk:
+                    yield chunk
+            response = await stream.get_final_message()
+        yield self._parse_output(response, _output_tool, response_format)
+
+    @staticmethod
+    def _partial_json(event) -> Optional[str]:
+        """Extract the tool input JSON chunk from a stream event, if any."""
+        if event.type == "content_block_delta" and event.delta.type == "input_json_delta":
+            return event.delta.partial_json
+        return None
 
     def generate(
         self,
@@ -91,28 +229,25 @@ class Anthropic(LLMBase):
         """
         from anthropic.types import Message as AnthropicMessage
 
-        # Convert messages to Anthropic format
-        _messages = []
-        system_message = None
-
-        for msg in messages:
-            if msg.role == "system":
-                system_message = msg.content
-            else:
-                _messages.append({"role": msg.role, "content": msg.content})
+        system_message, _messages = self._split_messages(messages)
 
         # Make the API call
         response: AnthropicMessage = self.client.messages.create(
-            model=self.model, system=system_message or "", messages=_messages, **kwargs
+            model=self.model, system=system_message, messages=_messages, **kwargs
         )
+        return self._parse_text(response)
 
-        text = next(
-            (block.content for block in response.content if block.type == "text"),
-            None,
+    async def agenerate(
+        self,
+        messages: List[Message],
+        **kwargs: dict,
+    ) -> str:
+        """Asynchronously generate a plain text response from the Anthropic LLM."""
+        system_message, _messages = self._split_messages(messages)
+        response = await self.async_client.messages.create(
+            model=self.model, system=system_message, messages=_messages, **kwargs
         )
-        if text is None:
-            raise ValueError("No text content found in the response.")
-        return text
+        return self._parse_text(response)
 
     def token_counter(self, text: str) -> int:
         """Count the number of tokens in the given text."""
@@ -1,9 +1,22 @@
 """LLMBase class for Nomos agent framework."""
 
-from functools import cache
-from typing import Dict, List, Literal, Optional, Type, Union
+import asyncio
+from typing import (
+    Annotated,
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
+from weakref import WeakKeyDictionary
 
-from pydantic import BaseModel
+from pydantic import BaseModel, BeforeValidator, Field
 
 from ..constants import (
     DEFAULT_PERSONA,
@@ -15,6 +28,7 @@ from ..models.agent import (
     DecisionConstraints,
     Event,
     Message,
+    ReasoningMode,
     Step,
     StepIdentifier,
     Summary,
@@ -23,8 +37,12 @@ from ..models.agent import (
 )
 from ..models.tool import Tool
 from ..utils.logging import log_error
+from ..utils.metrics import timed
 from ..utils.utils import create_base_model
 
+# Serialized JSON schemas of response models, dropped along with the models
+_json_schemas: "WeakKeyDictionary[Type[BaseModel], Dict[str, Any]]" = WeakKeyDictionary()
+
 
 class LLMBase:
     """Abstract base class for LLM integrations in Nomos."""
@@ -46,6 +64,20 @@ class LLMBase:
         routes_desc = [str(route) for route in current_step.routes]
         return "\n".join(routes_desc)
 
+    @staticmethod
+    def get_move_paths_desc(move_paths: Dict[str, List[Step]]) -> str:
+        """
+        Get a string description of steps reachable in several hops.
+
+        :param move_paths: Mapping of target step id to the steps on the way, ending with the target.
+        :return: String description of the targets and their paths.
+        """
+        return "\n".join(
+            f"- {target}: {path[-1].description.strip()} "
+            f"(via {' -> '.join(step.step_id for step in path[:-1])})"
+            for target, path in move_paths.items()
+        )
+
     @staticmethod
     def get_tools_desc(tools: Dict[str, Tool], available_tools: List[str]) -> str:
         """
@@ -115,18 +147,84 @@ class LLMBase:
         persona: str,
         max_examples: int = 5,
         embedding_model: Optional["LLMBase"] = None,
+        context_embedding: Optional[List[float]] = None,
+        move_paths: Optional[Dict[str, List[Step]]] = None,
+        system_prompt: Optional[str] = None,
     ) -> List[Message]:
         """
         Construct the list of messages to send to the LLM.
 
+        The system message only holds the static prompt of the step, so it is an
+        identical prefix across turns and sessions that providers can cache.
+        Retrieved examples and the history follow in the user message.
+
         :param current_step: Current step.
         :param tools: Dictionary of tools.
         :param history: Conversation history.
         :param system_message: System prompt.
         :param persona: Agent persona.
+        :param embedding_model: Optional model embedding the history and examples. Defaults to this LLM.
+        :param context_embedding: Optional precomputed embedding of the formatted history.
+        :param move_paths: Optional steps reachable in several hops (target -> steps on the way).
+        :param system_prompt: Optional precompiled static part of the system prompt
+            (see ``get_system_prompt``). Built from the other arguments if omitted.
         :return: List of Message objects.
         """
         messages = []
+        if system_prompt is None:
+            system_prompt = self.get_system_prompt(
+                current_step=current_step,
+                tools=tools,
+                system_message=system_message,
+                persona=persona,
+                move_paths=move_paths,
+            )
+        with timed("history"):
+            history_str = self.format_history(history)
+        user_prompt = f"History:\n{history_str}"
+        if current_step.examples:
+            example_str = ["Examples:"]
+            embedding_model = embedding_model or self
+            with timed("examples"):
+                examples = current_step.get_examples(
+                    embedding_model=embedding_model,
+                    similarity_fn=self.text_similarity,
+                    context_emb=(
+                        context_embedding
+                        if context_embedding is not None
+                        else embedding_model.embed_text(history_str)
+                    ),
+                    max_examples=max_examples,
+                )
+            for i, example in enumerate(examples):
+                example_str.append(f"{i + 1}. {str(example)}")
+            user_prompt = "\n".join(example_str) + "\n\n" + user_prompt
+
+        messages.append(Message(role="system", content=system_prompt))
+        messages.append(Message(role="user", content=user_prompt))
+        return messages
+
+    def get_system_prompt(
+        self,
+        current_step: Step,
+        tools: Dict[str, Tool],
+        system_message: str,
+        persona: str,
+        move_paths: Optional[Dict[str, List[Step]]] = None,
+    ) -> str:
+        """
+        Build the static part of a step's system prompt: instructions, routes and tools.
+
+        Only examples and the history change between turns, so agents compile
+        this once per step (see ``CompiledAgent.compile``).
+
+        :param current_step: Current step.
+        :param tools: Dictionary of tools.
+        :param system_message: System prompt.
+        :param persona: Agent persona.
+        :param move_paths: Optional steps reachable in several hops (target -> steps on the way).
+        :return: The system prompt without examples.
+        """
         system_prompt = system_message + "\n"
         system_prompt += f"{persona}\n\n"
         system_prompt += f"Instructions: {current_step.description.strip()}\n"
@@ -135,29 +233,59 @@ class LLMBase:
             if current_step.routes
             else ""
         )
+        system_prompt += (
+            f"Further Steps (MOVE directly, passing through the listed steps):\n"
+            f"{self.get_move_paths_desc(move_paths)}\n"
+            if move_paths
+            else ""
+        )
         system_prompt += (
             f"\nAvailable Tools:\n{self.get_tools_desc(tools, current_step.tool_ids)}\n"
             if current_step.tool_ids
             else ""
         )
-        if current_step.examples:
-            example_str = ["\nExamples:"]
-            for i, example in enumerate(
-                current_step.get_examples(
-                    embedding_model=embedding_model or self,
-                    similarity_fn=self.text_similarity,
-                    context_emb=self.embed_text(self.format_history(history)),
-                    max_examples=max_examples,
-                )
-            ):
-                example_str.append(f"{i + 1}. {str(example)}")
-            system_prompt += "\n".join(example_str) + "\n"
+        return system_prompt
+
+    def compile_system_prompt(
+        self,
+        steps: Dict[str, Step],
+        current_step: Step,
+        tools: Dict[str, Tool],
+        system_message: Optional[str] = None,
+        persona: Optional[str] = None,
+        move_paths: Optional[Dict[str, Tuple[str, ...]]] = None,
+    ) -> str:
+        """
+        Build the static part of a step's system prompt, applying the default system message and persona.
 
-        user_prompt = f"History:\n{self.format_history(history)}"
+        :param steps: Dictionary of all steps. (step_id -> Step)
+        :param current_step: Current step.
+        :param tools: Dictionary of tools.
+        :param system_message: Optional system prompt.
+        :param persona: Optional agent persona.
+        :param move_paths: Optional paths to the steps a MOVE may reach (target -> step ids).
+        :return: The system prompt without examples.
+        """
+        return self.get_system_prompt(
+            current_step=current_step,
+            tools=tools,
+            system_message=(system_message if system_message else DEFAULT_SYSTEM_MESSAGE.strip()),
+            persona=current_step.persona or persona or DEFAULT_PERSONA.strip(),
+            move_paths=self._move_path_steps(steps, move_paths),
+        )
 
-        messages.append(Message(role="system", content=system_prompt))
-        messages.append(Message(role="user", content=user_prompt))
-        return messages
+    @staticmethod
+    def _move_path_steps(
+        steps: Dict[str, Step], move_paths: Optional[Dict[str, Tuple[str, ...]]]
+    ) -> Optional[Dict[str, List[Step]]]:
+        """Resolve the step ids of multi-hop move paths, dropping direct routes."""
+        if not move_paths:
+            return None
+        return {
+            target: [steps[step_id] for step_id in path]
+            for target, path in move_paths.items()
+            if len(path) > 1
+        }
 
     def get_output(
         self,
@@ -175,6 +303,63 @@ class LLMBase:
         """
         raise NotImplementedError("Subclasses should implement this method.")
 
+    async def aget_output(
+        self,
+        messages: List[Message],
+        response_format: BaseModel,
+        **kwargs: dict,
+    ) -> BaseModel:
+        """
+        Asynchronously get a structured response from the LLM.
+
+        Providers with a native async client override this. The default runs
+        ``get_output`` in a worker thread so the event loop is never blocked.
+
+        :param messages: List of Message objects.
+        :param response_format: Pydantic model for the expected response.
+        :param kwargs: Additional parameters for the LLM.
+        :return: Parsed response as a BaseModel.
+        """
+        return await asyncio.to_thread(
+            self.get_output, messages=messages, response_format=response_format, **kwargs
+        )
+
+    def stream_output(
+        self,
+        messages: List[Message],
+        response_format: BaseModel,
+        **kwargs: dict,
+    ) -> Iterator[Union[str, BaseModel]]:
+        """
+        Stream a structured response from the LLM.
+
+        Yields the raw JSON text of the response in chunks as the provider
+        produces it, followed by the parsed response as the last item.
+        Providers without streaming support only yield the parsed response.
+
+        :param messages: List of Message objects.
+        :param response_format: Pydantic model for the expected response.
+        :param kwargs: Additional parameters for the LLM.
+        :return: Iterator of JSON text chunks, ending with the parsed response.
+        """
+        yield self.get_output(messages=messages, response_format=response_format, **kwargs)
+
+    async def astream_output(
+        self,
+        messages: List[Message],
+        response_format: BaseModel,
+        **kwargs: dict,
+    ) -> AsyncIterator[Union[str, BaseModel]]:
+        """
+        Asynchronously stream a structured response from the LLM.
+
+        :param messages: List of Message objects.
+        :param response_format: Pydantic model for the expected response.
+        :param kwargs: Additional parameters for the LLM.
+        :return: Async iterator of JSON text chunks, ending with the parsed response.
+        """
+        yield await self.aget_output(messages=messages, response_format=response_format, **kwargs)
+
     def _get_output(
         self,
         steps: Dict[str, Step],
@@ -186,6 +371,8 @@ class LLMBase:
         persona: Optional[str] = None,
         max_examples: int = 5,
         embedding_model: Optional["LLMBase"] = None,
+        move_paths: Optional[Dict[str, Tuple[str, ...]]] = None,
+        system_prompt: Optional[str] = None,
     ) -> BaseModel:
         """
         Get a structured response from the LLM using the agent's context.
@@ -198,22 +385,214 @@ class LLMBase:
         :param system_message: Optional system prompt.
         :param persona: Optional agent persona.
         :param max_examples: Maximum number of examples to include.
+        :param move_paths: Optional paths to the steps a MOVE may reach (target -> step ids).
+        :param system_prompt: Optional precompiled static part of the system prompt.
         :return: Parsed response as a BaseModel.
         """
-        history = [
-            steps[item.step_id] if isinstance(item, StepIdentifier) else item for item in history
-        ]
-        _persona = current_step.persona or persona or DEFAULT_PERSONA.strip()
-        messages = self.get_messages(
+        messages = self._prompt_messages(
+            steps=steps,
+            current_step=current_step,
+            tools=tools,
+            history=history,
+            system_message=system_message,
+            persona=persona,
+            max_examples=max_examples,
+            embedding_model=embedding_model,
+            move_paths=move_paths,
+            system_prompt=system_prompt,
+        )
+        with timed("llm"):
+            return self.get_output(messages=messages, response_format=response_format)
+
+    async def _aget_output(
+        self,
+        steps: Dict[str, Step],
+        current_step: Step,
+        tools: Dict[str, Tool],
+        history: List[Union[Event, StepIdentifier, Summary]],
+        response_format: BaseModel,
+        system_message: Optional[str] = None,
+        persona: Optional[str] = None,
+        max_examples: int = 5,
+        embedding_model: Optional["LLMBase"] = None,
+        move_paths: Optional[Dict[str, Tuple[str, ...]]] = None,
+        system_prompt: Optional[str] = None,
+    ) -> BaseModel:
+        """
+        Asynchronously get a structured response from the LLM using the agent's context.
+
+        Mirrors ``_get_output``.
+
+        :return: Parsed response as a BaseModel.
+        """
+        messages = await self._aprompt_messages(
+            steps=steps,
+            current_step=current_step,
+            tools=tools,
+            history=history,
+            system_message=system_message,
+            persona=persona,
+            max_examples=max_examples,
+            embedding_model=embedding_model,
+            move_paths=move_paths,
+            system_prompt=system_prompt,
+        )
+        with timed("llm"):
+            return await self.aget_output(messages=messages, response_format=response_format)
+
+    def _stream_output(
+        self,
+        steps: Dict[str, Step],
+        current_step: Step,
+        tools: Dict[str, Tool],
+        history: List[Union[Event, StepIdentifier, Summary]],
+        response_format: BaseModel,
+        system_message: Optional[str] = None,
+        persona: Optional[str] = None,
+        max_examples: int = 5,
+        embedding_model: Optional["LLMBase"] = None,
+        move_paths: Optional[Dict[str, Tuple[str, ...]]] = None,
+        system_prompt: Optional[str] = None,
+    ) -> Iterator[Union[str, BaseModel]]:
+        """
+        Stream a structured response from the LLM using the agent's context.
+
+        Mirrors ``_get_output``; see ``stream_output`` for the yielded items.
+        """
+        messages = self._prompt_messages(
+            steps=steps,
+            current_step=current_step,
+            tools=tools,
+            history=history,
+            system_message=system_message,
+            persona=persona,
+            max_examples=max_examples,
+            embedding_model=embedding_model,
+            move_paths=move_paths,
+            system_prompt=system_prompt,
+        )
+        return self.stream_output(messages=messages, response_format=response_format)
+
+    async def _astream_output(
+        self,
+        steps: Dict[str, Step],
+        current_step: Step,
+        tools: Dict[str, Tool],
+        history: List[Union[Event, StepIdentifier, Summary]],
+        response_format: BaseModel,
+        system_message: Optional[str] = None,
+        persona: Optional[str] = None,
+        max_examples: int = 5,
+        embedding_model: Optional["LLMBase"] = None,
+        move_paths: Optional[Dict[str, Tuple[str, ...]]] = None,
+        system_prompt: Optional[str] = None,
+    ) -> AsyncIterator[Union[str, BaseModel]]:
+        """
+        Asynchronously stream a structured response from the LLM using the agent's context.
+
+        Mirrors ``_get_output``; see ``stream_output`` for the yielded items.
+        """
+        messages = await self._aprompt_messages(
+            steps=steps,
             current_step=current_step,
             tools=tools,
             history=history,
+            system_message=system_message,
+            persona=persona,
+            max_examples=max_examples,
+            embedding_model=embedding_model,
+            move_paths=move_paths,
+            system_prompt=system_prompt,
+        )
+        async for chunk in self.astream_output(messages=messages, response_format=response_format):
+            yield chunk
+
+    def _prompt_messages(
+        self,
+        steps: Dict[str, Step],
+        current_step: Step,
+        tools: Dict[str, Tool],
+        history: List[Union[Event, StepIdentifier, Summary]],
+        system_message: Optional[str] = None,
+        persona: Optional[str] = None,
+        max_examples: int = 5,
+        embedding_model: Optional["LLMBase"] = None,
+        context_embedding: Optional[List[float]] = None,
+        move_paths: Optional[Dict[str, Tuple[str, ...]]] = None,
+        system_prompt: Optional[str] = None,
+    ) -> List[Message]:
+        """Build the decision prompt, applying the default system message and persona."""
+        with timed("history"):
+            resolved = self._resolve_history(steps, history)
+        if system_prompt is None:
+            system_prompt = self.compile_system_prompt(
+                steps=steps,
+                current_step=current_step,
+                tools=tools,
+                system_message=system_message,
+                persona=persona,
+                move_paths=move_paths,
+            )
+        return self.get_messages(
+            current_step=current_step,
+            tools=tools,
+            history=resolved,
             system_message=(system_message if system_message else DEFAULT_SYSTEM_MESSAGE.strip()),
-            persona=_persona,
+            persona=current_step.persona or persona or DEFAULT_PERSONA.strip(),
             max_examples=max_examples,
             embedding_model=embedding_model,
+            context_embedding=context_embedding,
+            move_paths=self._move_path_steps(steps, move_paths),
+            system_prompt=system_prompt,
         )
-        return self.get_output(messages=messages, response_format=response_format)
+
+    async def _aprompt_messages(
+        self,
+        steps: Dict[str, Step],
+        current_step: Step,
+        tools: Dict[str, Tool],
+        history: List[Union[Event, StepIdentifier, Summary]],
+        system_message: Optional[str] = None,
+        persona: Optional[str] = None,
+        max_examples: int = 5,
+        embedding_model: Optional["LLMBase"] = None,
+        move_paths: Optional[Dict[str, Tuple[str, ...]]] = None,
+        system_prompt: Optional[str] = None,
+    ) -> List[Message]:
+        """
+        Asynchronously build the decision prompt.
+
+        The history embedding used for example retrieval is computed with
+        ``aembed_text`` before the prompt is built.
+        """
+        context_embedding = None
+        if current_step.examples:
+            with timed("history"):
+                history_str = self.format_history(self._resolve_history(steps, history))
+            with timed("examples"):
+                context_embedding = await (embedding_model or self).aembed_text(history_str)
+        return self._prompt_messages(
+            steps=steps,
+            current_step=current_step,
+            tools=tools,
+            history=history,
+            system_message=system_message,
+            persona=persona,
+            max_examples=max_examples,
+            embedding_model=embedding_model,
+            context_embedding=context_embedding,
+            move_paths=move_paths,
+            system_prompt=system_prompt,
+        )
+
+    @staticmethod
+    def _resolve_history(
+        steps: Dict[str, Step], history: List[Union[Event, StepIdentifier, Summary]]
+    ) -> List[Union[Event, Step, Summary]]:
+        """Replace step identifiers in the history with their Step objects."""
+        return [
+            steps[item.step_id] if isinstance(item, StepIdentifier) else item for item in history
+        ]
 
     def generate(
         self,
@@ -229,26 +608,64 @@ class LLMBase:
         """
         raise NotImplementedError("Subclasses should implement this method.")
 
+    async def agenerate(
+        self,
+        messages: List[Message],
+        **kwargs: dict,
+    ) -> str:
+        """
+        Asynchronously generate a response from the LLM.
+
+        :param messages: List of Message objects.
+        :param kwargs: Additional parameters for the LLM.
+        :return: Generated response as a string.
+        """
+        return await asyncio.to_thread(self.generate, messages=messages, **kwargs)
+
     def token_counter(self, text: str) -> int:
         """Count the number of tokens in a string."""
         return len(text.split())
 
     @staticmethod
-    @cache
+    def get_json_schema(response_format: Type[BaseModel]) -> Dict[str, Any]:
+        """
+        Get the JSON schema of a response model, serializing it only once.
+
+        :param response_format: Pydantic model for the expected response.
+        :return: The JSON schema. Shared between calls, so it must not be modified.
+        """
+        schema = _json_schemas.get(response_format)
+        if schema is None:
+            schema = _json_schemas[response_format] = response_format.model_json_schema()
+        return schema
+
+    @staticmethod
     def _create_decision_model(
         current_step: Step,
         current_step_tools: tuple[Tool, ...],
         constraints: Optional["DecisionConstraints"] = None,
+        move_targets: Optional[Tuple[str, ...]] = None,
+        reasoning: ReasoningMode = "full",
+        max_reasoning_steps: int = 3,
     ) -> Type[BaseModel]:
         """
         Dynamically create a Pydantic model for route/tool decision output.
 
+        Models are not cached here; sessions get them from their agent's
+        ``SchemaRegistry``.
+
         :param available_step_ids: List of available step IDs for routing.
         :param tool_ids: List of available tool names.
         :param tool_models: List of Pydantic models for tool arguments.
+        :param move_targets: Optional step IDs a MOVE may target, instead of the direct routes.
+        :param reasoning: ``full`` step by step reasoning, ``brief`` bullets or ``none``.
+            Constrained retries never ask for reasoning.
+        :param max_reasoning_steps: Maximum number of bullets in ``brief`` mode.
         :return: A dynamically created Pydantic BaseModel for the decision.
         """
-        available_step_ids = current_step.get_available_routes()
+        available_step_ids = (
+            list(move_targets) if move_targets is not None else current_step.get_available_routes()
+        )
         if constraints and constraints.tool_name:
             current_step_tools = tuple(
                 tool for tool in current_step_tools if tool.name == constraints.tool_name
@@ -268,13 +685,27 @@ class LLMBase:
             )
         ActionEnum = create_action_enum(action_ids)  # noqa
 
-        params = {
-            "reasoning": {
+        params = {}
+        if constraints:
+            reasoning = "none"
+        if reasoning == "full":
+            params["reasoning"] = {
                 "type": List[str],
                 "description": "Step by Step Reasoning to Decide",
-            },
-            "action": {"type": ActionEnum, "description": "Next Action"},
-        }
+            }
+        elif reasoning == "brief":
+            # maxItems only guides the LLM; extra bullets are dropped rather than failing the decision
+            params["reasoning"] = {
+                "type": Annotated[
+                    List[str],
+                    BeforeValidator(
+                        lambda v: v[:max_reasoning_steps] if isinstance(v, list) else v
+                    ),
+                    Field(max_length=max_reasoning_steps),
+                ],
+                "description": f"At most {max_reasoning_steps} short bullets of reasoning",
+            }
+        params["action"] = {"type": ActionEnum, "description": "Next Action"}
 
         if not current_step.auto_flow and (
             not constraints or not constraints.fields or "response" in constraints.fields
@@ -334,14 +765,25 @@ class LLMBase:
                     },
                 },
             )
-            params["tool_call"] = {
-                "type": tool_call_model,
-                "description": "Tool Call (ToolCall) if TOOL_CALL.",
-                "optional": bool(not constraints),
-                "default": None,
-            }
+            if current_step.parallel_tool_calls:
+                params["tool_calls"] = {
+                    "type": List[tool_call_model],
+                    "description": (
+                        "Tool Calls (List of ToolCall) if TOOL_CALL. "
+                        "Independent calls are run in parallel."
+                    ),
+                    "optional": bool(not constraints),
+                    "default": None,
+                }
+            else:
+                params["tool_call"] = {
+                    "type": tool_call_model,
+                    "description": "Tool Call (ToolCall) if TOOL_CALL.",
+                    "optional": bool(not constraints),
+                    "default": None,
+                }
 
-        assert len(params) > 2, (
+        assert len(params) > 1 + ("reasoning" in params), (
             f"Something went wrong, Please check the step configuration for {current_step.step_id}. Params {params}"
         )
 
@@ -361,8 +803,16 @@ class LLMBase:
         :param output: LLM output as a BaseModel.
         :return: Decision object.
         """
+        tool_calls = (
+            [
+                ToolCall(tool_name=call.tool_name, tool_kwargs=call.tool_kwargs)
+                for call in output.tool_calls
+            ]
+            if getattr(output, "tool_calls", None)
+            else None
+        )
         return Decision(
-            reasoning=output.reasoning,
+            reasoning=getattr(output, "reasoning", None) or [],
             action=output.action.value,
             response=output.response if hasattr(output, "response") else None,
             suggestions=output.suggestions if hasattr(output, "suggestions") else None,
@@ -373,8 +823,9 @@ class LLMBase:
                     tool_kwargs=output.tool_call.tool_kwargs,
                 )
                 if hasattr(output, "tool_call") and output.tool_call
-                else None
+                else (tool_calls[0] if tool_calls else None)
             ),
+            tool_calls=tool_calls,
         )
 
     def embed_text(self, text: str) -> List[float]:
@@ -399,6 +850,24 @@ class LLMBase:
             "This LLM does not support batch text embedding. Please Specify an embedding model."
         )
 
+    async def aembed_text(self, text: str) -> List[float]:
+        """
+        Asynchronously generate an embedding for the given text.
+
+        :param text: Text to embed.
+        :return: List of floats representing the embedding.
+        """
+        return await asyncio.to_thread(self.embed_text, text)
+
+    async def aembed_batch(self, texts: List[str]) -> List[List[float]]:
+        """
+        Asynchronously generate embeddings for a batch of texts.
+
+        :param texts: List of texts to embed.
+        :return: List of embeddings, each embedding is a list of floats.
+        """
+        return await asyncio.to_thread(self.embed_batch, texts)
+
     def text_similarity(self, emb1: List[float], emb2: List[float]) -> float:
         """
         Calculate the similarity between two text embeddings (cosine similarity).
@@ -423,19 +892,33 @@ class LLMBase:
         :param history: List of Event or StepIdentifier objects.
         :return: Summary object containing the summarized content.
         """
-        items_str = "\n".join(str(item) for item in history)
-        summary = self.get_output(
-            messages=[
-                Message(role="system", content=PERIODICAL_SUMMARIZATION_SYSTEM_MESSAGE),
-                Message(
-                    role="user",
-                    content=f"Summarize the following Context:\n\n{items_str}",
-                ),
-            ],
-            response_format=Summary,
+        summary = self.get_output(messages=self._summary_messages(history), response_format=Summary)
+        assert isinstance(summary, Summary), "Summary generation failed."
+        return summary
+
+    async def agenerate_summary(
+        self, history: List[Union[Event, StepIdentifier, Summary]]
+    ) -> Summary:
+        """
+        Asynchronously generate a summary of the conversation history.
+
+        :param history: List of Event or StepIdentifier objects.
+        :return: Summary object containing the summarized content.
+        """
+        summary = await self.aget_output(
+            messages=self._summary_messages(history), response_format=Summary
         )
         assert isinstance(summary, Summary), "Summary generation failed."
         return summary
 
+    @staticmethod
+    def _summary_messages(history: List[Union[Event, StepIdentifier, Summary]]) -> List[Message]:
+        """Build the messages used to summarize a list of history items."""
+        items_str = "\n".join(str(item) for item in history)
+        return [
+            Message(role="system", content=PERIODICAL_SUMMARIZATION_SYSTEM_MESSAGE),
+            Message(role="user", content=f"Summarize the following Context:\n\n{items_str}"),
+        ]
+
 
 __all__ = ["LLMBase"]
@@ -0,0 +1,493 @@
+"""Exact-match cache of LLM responses."""
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, List, Literal, Optional, Tuple, Type
+from weakref import WeakKeyDictionary
+
+from pydantic import BaseModel, ValidationError
+
+from ..models.agent import Message
+from ..utils.logging import log_debug
+from ..utils.metrics import record_cache_hit, timed
+from .base import LLMBase
+
+# Digests of the JSON schemas of response models, dropped along with the models
+_schema_digests: "WeakKeyDictionary[Type[BaseModel], str]" = WeakKeyDictionary()
+
+
+def _llm_settings(llm: LLMBase) -> Dict[str, Any]:
+    """
+    Get the settings an LLM holds that change its responses.
+
+    These are its public plain-valued attributes (model, sampling settings
+    such as temperature or max tokens, ...); clients and other objects are left out.
+    """
+    return {
+        name: value
+        for name, value in vars(llm).items()
+        if not name.startswith("_") and isinstance(value, (str, int, float, bool, type(None)))
+    }
+
+
+def _schema_digest(response_format: Type[BaseModel]) -> str:
+    """Get a stable digest of a response model's JSON schema."""
+    digest = _schema_digests.get(response_format)
+    if digest is None:
+        schema = json.dumps(LLMBase.get_json_schema(response_format), sort_keys=True)
+        digest = _schema_digests[response_format] = hashlib.sha256(schema.encode()).hexdigest()
+    return digest
+
+
+class ResponseCacheBackend(ABC):
+    """Storage of cached responses, as JSON text by key."""
+
+    # Whether calls wait on I/O, so the async API runs them in a worker thread
+    blocking: bool = True
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        """Get the value stored under a key, or None if it is missing or expired."""
+
+    @abstractmethod
+    def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        """
+        Store a value under a key.
+
+        :param key: The cache key.
+        :param value: The value to store.
+        :param ttl: Seconds until the value expires, or None to keep it until evicted.
+        """
+
+    @abstractmethod
+    def delete(self, key: str) -> bool:
+        """Delete a key, returning whether it was stored."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Delete all stored values."""
+
+
+class LRUResponseCache(ResponseCacheBackend):
+    """In-process cache dropping the least recently used values once full."""
+
+    blocking = False
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        """
+        Initialize the cache.
+
+        :param maxsize: Maximum number of values kept.
+        """
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Tuple[str, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Get the number of stored values, including expired ones not yet dropped."""
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[str]:
+        """Get the value stored under a key, or None if it is missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires is not None and expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        """Store a value under a key, evicting the least recently used ones if full."""
+        expires = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._entries[key] = (value, expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> bool:
+        """Delete a key, returning whether it was stored."""
+        with self._lock:
+            return self._entries.pop(key, None) is not None
+
+    def clear(self) -> None:
+        """Delete all stored values."""
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteResponseCache(ResponseCacheBackend):
+    """
+    Cache stored in a local SQLite file, kept across restarts.
+
+    Each process opens its own connection, so the cache can be shared by the
+    workers of an :class:`~nomos.pool.AgentPool`.
+    """
+
+    def __init__(self, path: str = ".nomos_cache.db", maxsize: int = 100_000) -> None:
+        """
+        Initialize the cache, creating the database file if needed.
+
+        :param path: Path of the SQLite database file.
+        :param maxsize: Maximum number of values kept; the least recently used are dropped.
+        """
+        self.path = path
+        self.maxsize = maxsize
+        # Eviction scans the table, so it runs once every 1% of maxsize writes
+        self._evict_every = max(1, maxsize // 100)
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        with self._lock:
+            self._connection()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get the connection of the current process, opening it if needed."""
+        if self._conn is None or self._pid != os.getpid():
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL, used REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS responses_used ON responses (used)")
+            self._pid = os.getpid()
+        return self._conn
+
+    def get(self, key: str) -> Optional[str]:
+        """Get the value stored under a key, or None if it is missing or expired."""
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT value, expires FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, expires = row
+            if expires is not None and expires < now:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            conn.execute("UPDATE responses SET used = ? WHERE key = ?", (now, key))
+            return value
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        """Store a value under a key, evicting the least recently used ones if full."""
+        now = time.time()
+        expires = now + ttl if ttl is not None else None
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, expires, used) VALUES (?, ?, ?, ?)",
+                (key, value, expires, now),
+            )
+            self._writes += 1
+            if self._writes < self._evict_every:
+                return
+            self._writes = 0
+            conn.execute(
+                "DELETE FROM responses WHERE key IN (SELECT key FROM responses "
+                "ORDER BY used DESC LIMIT -1 OFFSET ?)",
+                (self.maxsize,),
+            )
+
+    def delete(self, key: str) -> bool:
+        """Delete a key, returning whether it was stored."""
+        with self._lock:
+            cursor = self._connection().execute("DELETE FROM responses WHERE key = ?", (key,))
+            return cursor.rowcount > 0
+
+    def clear(self) -> None:
+        """Delete all stored values."""
+        with self._lock:
+            self._connection().execute("DELETE FROM responses")
+
+
+class RedisResponseCache(ResponseCacheBackend):
+    """Cache stored in Redis, shared by every process and host using it."""
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        client: Optional[Any] = None,  # noqa: ANN401
+        prefix: str = "nomos:response:",
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Size is bounded by the Redis server's ``maxmemory`` and eviction policy.
+
+        :param url: Redis URL (e.g. ``redis://localhost:6379/0``).
+        :param client: Optional synchronous Redis client to use instead of connecting to ``url``.
+        :param prefix: Prefix of the keys written by the cache.
+        """
+        if client is None:
+            try:
+                import redis
+            except ImportError:
+                raise ImportError(
+                    "Redis package is not installed. Please install it using 'pip install nomos[serve]'."
+                )
+            assert url, "Redis URL must be provided for the response cache"
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[str]:
+        """Get the value stored under a key, or None if it is missing or expired."""
+        value = self.client.get(self.prefix + key)
+        return value.decode() if isinstance(value, bytes) else value
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        """Store a value under a key, expiring it after ``ttl`` seconds."""
+        self.client.set(self.prefix + key, value, px=int(ttl * 1000) if ttl is not None else None)
+
+    def delete(self, key: str) -> bool:
+        """Delete a key, returning whether it was stored."""
+        return bool(self.client.delete(self.prefix + key))
+
+    def clear(self) -> None:
+        """Delete all values written by the cache."""
+        for key in self.client.scan_iter(match=self.prefix + "*"):
+            self.client.delete(key)
+
+
+class ResponseCache:
+    """
+    Exact-match cache of LLM responses.
+
+    Responses are keyed by a hash of the provider, the LLM's settings (model,
+    sampling settings), messages, response schema and request options, so only
+    identical requests are served from the cache. Use it for deterministic
+    (temperature 0) requests only.
+    """
+
+    def __init__(
+        self, backend: Optional[ResponseCacheBackend] = None, ttl: Optional[float] = None
+    ) -> None:
+        """
+        Initialize the cache.
+
+        :param backend: Storage of the responses. Defaults to an in-process LRU cache.
+        :param ttl: Default seconds until a cached response expires, or None to never expire.
+        """
+        self.backend = backend or LRUResponseCache()
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(
+        llm: LLMBase,
+        messages: List[Message],
+        response_format: Optional[Type[BaseModel]] = None,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> str:
+        """
+        Get the cache key of a request.
+
+        :param llm: The LLM the request is sent to.
+        :param messages: Messages of the request.
+        :param response_format: Pydantic model of a structured response, or None for text.
+        :param kwargs: Additional parameters of the request.
+        :return: Hex digest identifying the request.
+        """
+        request = {
+            "llm": [type(llm).__name__, llm.__provider__, _llm_settings(llm)],
+            "messages": [[message.role, message.content] for message in messages],
+            "schema": _schema_digest(response_format) if response_format else None,
+            "kwargs": kwargs,
+        }
+        payload = json.dumps(request, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def lookup(self, key: str, response_format: Optional[Type[BaseModel]] = None) -> Any:  # noqa: ANN401
+        """
+        Get a cached response.
+
+        :param key: Key of the request.
+        :param response_format: Pydantic model to parse a structured response into.
+        :return: The cached response, or None on a miss.
+        """
+        with timed("cache"):
+            value = self.backend.get(key)
+            if value is not None and response_format is not None:
+                try:
+                    value = response_format.model_validate_json(value)
+                except ValidationError:
+                    log_debug(f"Dropping cached response {key} not matching its schema")
+                    self.backend.delete(key)
+                    value = None
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        record_cache_hit()
+        return value
+
+    def store(self, key: str, response: Any, ttl: Optional[float] = None) -> None:  # noqa: ANN401
+        """
+        Cache a response.
+
+        :param key: Key of the request.
+        :param response: A structured response or text.
+        :param ttl: Seconds until the response expires. Defaults to the cache's TTL.
+        """
+        value = response.model_dump_json() if isinstance(response, BaseModel) else response
+        with timed("cache"):
+            self.backend.set(key, value, ttl if ttl is not None else self.ttl)
+
+    async def alookup(self, key: str, response_format: Optional[Type[BaseModel]] = None) -> Any:  # noqa: ANN401
+        """Get a cached response without blocking the event loop (see :meth:`lookup`)."""
+        if self.backend.blocking:
+            return await asyncio.to_thread(self.lookup, key, response_format)
+        return self.lookup(key, response_format)
+
+    async def astore(
+        self,
+        key: str,
+        response: Any,  # noqa: ANN401
+        ttl: Optional[float] = None,
+    ) -> None:
+        """Cache a response without blocking the event loop (see :meth:`store`)."""
+        if self.backend.blocking:
+            await asyncio.to_thread(self.store, key, response, ttl)
+        else:
+            self.store(key, response, ttl)
+
+    def get_output(
+        self,
+        llm: LLMBase,
+        messages: List[Message],
+        response_format: Type[BaseModel],
+        ttl: Optional[float] = None,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> BaseModel:
+        """
+        Get a structured response, from the cache if the same request was made before.
+
+        :param llm: The LLM to ask on a miss.
+        :param messages: List of Message objects.
+        :param response_format: Pydantic model for the expected response.
+        :param ttl: Seconds until the response expires. Defaults to the cache's TTL.
+        :param kwargs: Additional parameters for the LLM.
+        :return: Parsed response as a BaseModel.
+        """
+        key = self.key(llm, messages, response_format, **kwargs)
+        response = self.lookup(key, response_format)
+        if response is None:
+            response = llm.get_output(messages=messages, response_format=response_format, **kwargs)
+            self.store(key, response, ttl)
+        return response
+
+    async def aget_output(
+        self,
+        llm: LLMBase,
+        messages: List[Message],
+        response_format: Type[BaseModel],
+        ttl: Optional[float] = None,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> BaseModel:
+        """Asynchronously get a structured response (see :meth:`get_output`)."""
+        key = self.key(llm, messages, response_format, **kwargs)
+        response = await self.alookup(key, response_format)
+        if response is None:
+            response = await llm.aget_output(
+                messages=messages, response_format=response_format, **kwargs
+            )
+            await self.astore(key, response, ttl)
+        return response
+
+    def generate(
+        self,
+        llm: LLMBase,
+        messages: List[Message],
+        ttl: Optional[float] = None,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> str:
+        """
+        Generate a text response, from the cache if the same request was made before.
+
+        :param llm: The LLM to ask on a miss.
+        :param messages: List of Message objects.
+        :param ttl: Seconds until the response expires. Defaults to the cache's TTL.
+        :param kwargs: Additional parameters for the LLM.
+        :return: Generated response as a string.
+        """
+        key = self.key(llm, messages, **kwargs)
+        response = self.lookup(key)
+        if response is None:
+            response = llm.generate(messages=messages, **kwargs)
+            self.store(key, response, ttl)
+        return response
+
+    async def agenerate(
+        self,
+        llm: LLMBase,
+        messages: List[Message],
+        ttl: Optional[float] = None,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> str:
+        """Asynchronously generate a text response (see :meth:`generate`)."""
+        key = self.key(llm, messages, **kwargs)
+        response = await self.alookup(key)
+        if response is None:
+            response = await llm.agenerate(messages=messages, **kwargs)
+            await self.astore(key, response, ttl)
+        return response
+
+
+class ResponseCacheConfig(BaseModel):
+    """
+    Configuration of the LLM response cache.
+
+    Attributes:
+        backend (str): Where responses are stored: ``memory`` (in-process LRU),
+            ``sqlite`` (local file) or ``redis``.
+        maxsize (int): Maximum number of responses kept by the ``memory`` and ``sqlite`` backends.
+        ttl (Optional[int]): Seconds until a cached response expires. None keeps it until evicted.
+        path (str): Database file of the ``sqlite`` backend.
+        url (Optional[str]): URL of the ``redis`` backend.
+    """
+
+    backend: Literal["memory", "sqlite", "redis"] = "memory"
+    maxsize: int = 1024
+    ttl: Optional[int] = 3600
+    path: str = ".nomos_cache.db"
+    url: Optional[str] = None
+
+    def get_cache(self) -> ResponseCache:
+        """
+        Create the configured response cache.
+
+        :return: A ResponseCache instance.
+        """
+        if self.backend == "sqlite":
+            backend: ResponseCacheBackend = SQLiteResponseCache(self.path, self.maxsize)
+        elif self.backend == "redis":
+            backend = RedisResponseCache(url=self.url)
+        else:
+            backend = LRUResponseCache(self.maxsize)
+        return ResponseCache(backend, ttl=self.ttl)
+
+
+__all__ = [
+    "ResponseCache",
+    "ResponseCacheBackend",
+    "ResponseCacheConfig",
+    "LRUResponseCache",
+    "SQLiteResponseCache",
+    "RedisResponseCache",
+]
@@ -28,7 +28,7 @@ class Cohere(LLMBase):
         :param kwargs: Additional parameters for OpenAI API.
         """
         try:
-            from cohere import ClientV2
+            from cohere import AsyncClientV2, ClientV2
         except ImportError:
             raise ImportError(
                 "OpenAI package is not installed. Please install it using 'pip install nomos[openai]."
@@ -37,6 +37,7 @@ class Cohere(LLMBase):
         self.model = model
         self.embedding_model = embedding_model or "embed-v4.0"
         self.client = ClientV2(**kwargs)
+        self.async_client = AsyncClientV2(**kwargs)
 
     def get_output(
         self,
@@ -56,7 +57,29 @@ class Cohere(LLMBase):
         comp = self.client.chat(
             model=self.model,
             messages=_messages,
-            response_format={"type": "json_object", "schema": response_format.model_json_schema()},
+            response_format={
+                "type": "json_object",
+                "schema": self.get_json_schema(response_format),
+            },
+            **kwargs,
+        )
+        return response_format.model_validate(json.loads(comp.message.content[0].text))
+
+    async def aget_output(
+        self,
+        messages: List[Message],
+        response_format: BaseModel,
+        **kwargs: dict,
+    ) -> BaseModel:
+        """Asynchronously get a structured response from the Cohere LLM."""
+        _messages = [msg.model_dump() for msg in messages]
+        comp = await self.async_client.chat(
+            model=self.model,
+            messages=_messages,
+            response_format={
+                "type": "json_object",
+                "schema": self.get_json_schema(response_format),
+            },
             **kwargs,
         )
         return response_format.model_validate(json.loads(comp.message.content[0].text))
@@ -81,6 +104,20 @@ class Cohere(LLMBase):
         )
         return comp.message.content[0].text
 
+    async def agenerate(
+        self,
+        messages: List[Message],
+        **kwargs: dict,
+    ) -> str:
+        """Asynchronously generate a response from the Cohere LLM."""
+        _messages = [msg.model_dump() for msg in messages]
+        comp = await self.async_client.chat(
+            model=self.model,
+            messages=_messages,
+            **kwargs,
+        )
+        return comp.message.content[0].text
+
     def token_counter(self, text: str) -> int:
         """Count tokens using tiktoken for the current model."""
         return len(
@@ -116,5 +153,23 @@ class Cohere(LLMBase):
         assert embs is not None
         return embs
 
+    async def aembed_text(self, text: str) -> List[float]:
+        """Asynchronously embed a single text using the Cohere embeddings API."""
+        embs = await self.aembed_batch([text])
+        return embs[0]
+
+    async def aembed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Asynchronously embed a batch of texts using the Cohere embeddings API."""
+        response = await self.async_client.embed(
+            model=self.embedding_model,
+            texts=texts,
+            input_type="search_document",
+            output_dimension=1024,
+            embedding_types=["float"],
+        )
+        embs = response.embeddings.float_
+        assert embs is not None
+        return embs
+
 
 __all__ = ["Cohere"]
@@ -0,0 +1,283 @@
+"""Content-addressed cache of text embeddings."""
+
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from pydantic import BaseModel
+
+from .base import LLMBase
+
+# SQLite limits the number of parameters of a single query
+_SQLITE_BATCH = 500
+
+
+class EmbeddingCache:
+    """
+    Cache of embeddings keyed by provider, embedding model and text hash.
+
+    Embeddings are kept in an in-process LRU and, if a path is given, in a
+    SQLite file, so restarted agents and other processes using the same file
+    never embed a text twice. Embeddings read from the file are float32.
+    """
+
+    def __init__(self, maxsize: int = 10_000, path: Optional[str] = None) -> None:
+        """
+        Initialize the cache.
+
+        :param maxsize: Maximum number of embeddings kept in memory.
+        :param path: Optional SQLite file persisting the embeddings.
+        """
+        self.maxsize = maxsize
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        if path:
+            with self._lock:
+                self._connection()
+
+    def __len__(self) -> int:
+        """Get the number of embeddings kept in memory."""
+        return len(self._entries)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Pickle the cache settings only; embeddings are reloaded from the file."""
+        return {"maxsize": self.maxsize, "path": self.path}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Restore an empty cache with the same settings."""
+        self.__init__(state["maxsize"], state["path"])
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get the connection of the current process, opening it if needed."""
+        assert self.path, "Embedding cache has no file"
+        if self._conn is None or self._pid != os.getpid():
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+            )
+            self._pid = os.getpid()
+        return self._conn
+
+    @staticmethod
+    def key(llm: LLMBase, text: str) -> str:
+        """
+        Get the cache key of a text embedded by a model.
+
+        :param llm: The embedding model.
+        :param text: The text.
+        :return: Hex digest identifying the embedding.
+        """
+        model = getattr(llm, "embedding_model", None) or getattr(llm, "model", None)
+        provider = llm.__provider__ if model else type(llm).__name__
+        return hashlib.sha256(f"{provider}\0{model}\0{text}".encode()).hexdigest()
+
+    def get_many(self, keys: List[str]) -> List[Optional[List[float]]]:
+        """
+        Get cached embeddings.
+
+        :param keys: Keys of the embeddings.
+        :return: The embeddings, with None for the missing ones.
+        """
+        with self._lock:
+            found: Dict[str, List[float]] = {}
+            for key in keys:
+                embedding = self._entries.get(key)
+                if embedding is not None:
+                    self._entries.move_to_end(key)
+                    found[key] = embedding
+            missing = [key for key in dict.fromkeys(keys) if key not in found]
+            if missing and self.path:
+                stored = self._load(missing)
+                found.update(stored)
+                self._remember(stored.items())
+        return [found.get(key) for key in keys]
+
+    def set_many(self, items: List[Tuple[str, List[float]]]) -> None:
+        """
+        Cache embeddings.
+
+        :param items: Keys and their embeddings.
+        """
+        with self._lock:
+            self._remember(items)
+            if self.path:
+                self._connection().executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                    [
+                        (key, np.asarray(embedding, dtype=np.float32).tobytes())
+                        for key, embedding in items
+                    ],
+                )
+
+    def _remember(self, items: Any) -> None:  # noqa: ANN401
+        """Add embeddings to the in-memory LRU, evicting the least recently used."""
+        for key, embedding in items:
+            self._entries[key] = embedding
+            self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def _load(self, keys: List[str]) -> Dict[str, List[float]]:
+        """Read embeddings from the file."""
+        conn = self._connection()
+        stored: Dict[str, List[float]] = {}
+        for i in range(0, len(keys), _SQLITE_BATCH):
+            batch = keys[i : i + _SQLITE_BATCH]
+            rows = conn.execute(
+                f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(batch))})",
+                batch,
+            )
+            for key, vector in rows:
+                stored[key] = np.frombuffer(vector, dtype=np.float32).tolist()
+        return stored
+
+    def _split(self, llm: LLMBase, texts: List[str]) -> Tuple[List[str], List[Any], List[str]]:
+        """Look up texts, returning their keys, cached embeddings and the texts left to embed."""
+        keys = [self.key(llm, text) for text in texts]
+        embeddings: List[Any] = self.get_many(keys)
+        missing = list(dict.fromkeys(t for t, e in zip(texts, embeddings) if e is None))
+        hits = len(texts) - sum(e is None for e in embeddings)
+        with self._lock:
+            self.hits += hits
+            self.misses += len(texts) - hits
+        return keys, embeddings, missing
+
+    def _merge(
+        self,
+        llm: LLMBase,
+        texts: List[str],
+        keys: List[str],
+        embeddings: List[Any],
+        missing: List[str],
+        computed: List[List[float]],
+    ) -> List[List[float]]:
+        """Cache newly computed embeddings and fill them in."""
+        new = {self.key(llm, text): embedding for text, embedding in zip(missing, computed)}
+        self.set_many(list(new.items()))
+        return [e if e is not None else new[key] for key, e in zip(keys, embeddings)]
+
+    def embed(self, llm: LLMBase, texts: List[str]) -> List[List[float]]:
+        """
+        Embed texts, only sending those not seen before to the model.
+
+        :param llm: The embedding model.
+        :param texts: Texts to embed.
+        :return: The embeddings, in the order of the texts.
+        """
+        keys, embeddings, missing = self._split(llm, texts)
+        if not missing:
+            return embeddings
+        computed = llm.embed_batch(missing) if len(missing) > 1 else [llm.embed_text(missing[0])]
+        return self._merge(llm, texts, keys, embeddings, missing, computed)
+
+    async def aembed(self, llm: LLMBase, texts: List[str]) -> List[List[float]]:
+        """Asynchronously embed texts (see :meth:`embed`)."""
+        keys, embeddings, missing = self._split(llm, texts)
+        if not missing:
+            return embeddings
+        computed = (
+            await llm.aembed_batch(missing)
+            if len(missing) > 1
+            else [await llm.aembed_text(missing[0])]
+        )
+        return self._merge(llm, texts, keys, embeddings, missing, computed)
+
+
+class CachedEmbeddings(LLMBase):
+    """
+    Embedding model serving texts it has seen before from an embedding cache.
+
+    Wraps the agent's embedding model; everything but embedding is delegated to it.
+    """
+
+    def __init__(self, llm: LLMBase, cache: EmbeddingCache) -> None:
+        """
+        Initialize the cached embedding model.
+
+        :param llm: The embedding model to wrap.
+        :param cache: The embedding cache.
+        """
+        self.llm = llm
+        self.cache = cache
+        self.__provider__ = llm.__provider__
+
+    def __getattr__(self, name: str) -> Any:  # noqa: ANN401
+        """Delegate other attributes to the wrapped model."""
+        if name == "llm":
+            raise AttributeError(name)
+        return getattr(self.llm, name)
+
+    def embed_text(self, text: str) -> List[float]:
+        """Embed a text, from the cache if it was embedded before."""
+        return self.cache.embed(self.llm, [text])[0]
+
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts, only sending those not embedded before to the model."""
+        return self.cache.embed(self.llm, texts)
+
+    async def aembed_text(self, text: str) -> List[float]:
+        """Asynchronously embed a text, from the cache if it was embedded before."""
+        return (await self.cache.aembed(self.llm, [text]))[0]
+
+    async def aembed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Asynchronously embed texts, only sending those not embedded before to the model."""
+        return await self.cache.aembed(self.llm, texts)
+
+    def text_similarity(self, emb1: List[float], emb2: List[float]) -> float:
+        """Calculate the similarity of two embeddings with the wrapped model."""
+        return self.llm.text_similarity(emb1, emb2)
+
+
+# Caches created from configuration, shared by every component using the same settings
+_shared_caches: Dict[Tuple[int, Optional[str]], EmbeddingCache] = {}
+_shared_lock = threading.Lock()
+
+
+class EmbeddingCacheConfig(BaseModel):
+    """
+    Configuration of the embedding cache.
+
+    Attributes:
+        maxsize (int): Maximum number of embeddings kept in memory.
+        path (Optional[str]): Optional SQLite file persisting embeddings across restarts.
+    """
+
+    maxsize: int = 10_000
+    path: Optional[str] = None
+
+    def get_cache(self) -> EmbeddingCache:
+        """
+        Get the embedding cache with these settings, shared within the process.
+
+        :return: An EmbeddingCache instance.
+        """
+        key = (self.maxsize, os.path.abspath(self.path) if self.path else None)
+        with _shared_lock:
+            cache = _shared_caches.get(key)
+            if cache is None:
+                cache = _shared_caches[key] = EmbeddingCache(self.maxsize, self.path)
+            return cache
+
+    def wrap(self, llm: LLMBase) -> LLMBase:
+        """
+        Serve the embeddings of a model from the configured cache.
+
+        :param llm: The embedding model.
+        :return: The model wrapped in :class:`CachedEmbeddings`.
+        """
+        if isinstance(llm, CachedEmbeddings):
+            return llm
+        return CachedEmbeddings(llm, self.get_cache())
+
+
+__all__ = ["EmbeddingCache", "CachedEmbeddings", "EmbeddingCacheConfig"]
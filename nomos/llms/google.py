@@ -5,11 +5,17 @@ from typing import List
 from pydantic import BaseModel
 
 from ..models.agent import Message
+from ..utils.metrics import record_usage
 from .base import LLMBase
 
 
 class Gemini(LLMBase):
-    """Gemini LLM integration for Nomos."""
+    """
+    Gemini LLM integration for Nomos.
+
+    Gemini 2.5 models cache shared prompt prefixes implicitly; cache hits are
+    reported in the turn metrics.
+    """
 
     __provider__: str = "google"
 
@@ -40,6 +46,39 @@ class Gemini(LLMBase):
         :param kwargs: Additional parameters for Gemini API.
         :return: Parsed response as a BaseModel.
         """
+        comp = self.client.models.generate_content(
+            model=self.model, **self._request(messages, response_format, kwargs)
+        )
+        self._record_usage(comp)
+        return comp.parsed
+
+    async def aget_output(
+        self,
+        messages: List[Message],
+        response_format: BaseModel,
+        **kwargs: dict,
+    ) -> BaseModel:
+        """Asynchronously get a structured response from the Gemini LLM."""
+        comp = await self.client.aio.models.generate_content(
+            model=self.model, **self._request(messages, response_format, kwargs)
+        )
+        self._record_usage(comp)
+        return comp.parsed
+
+    @staticmethod
+    def _record_usage(comp) -> None:
+        """Report the token usage of a response to the running turn."""
+        usage = getattr(comp, "usage_metadata", None)
+        if usage:
+            record_usage(
+                usage.prompt_token_count,
+                usage.candidates_token_count,
+                cached_tokens=usage.cached_content_token_count,
+            )
+
+    @staticmethod
+    def _request(messages: List[Message], response_format: BaseModel, kwargs: dict) -> dict:
+        """Build the contents and generation config for a structured request."""
         try:
             from google.genai import types
         except ImportError:
@@ -49,18 +88,15 @@ class Gemini(LLMBase):
 
         system_message = next(msg.content for msg in messages if msg.role == "system")
         user_message = next(msg.content for msg in messages if msg.role == "user")
-
-        comp = self.client.models.generate_content(
-            model=self.model,
-            contents=[user_message],
-            config=types.GenerateContentConfig(
+        return {
+            "contents": [user_message],
+            "config": types.GenerateContentConfig(
                 system_instruction=system_message,
                 response_mime_type="application/json",
                 response_schema=response_format,
                 **kwargs,
             ),
-        )
-        return comp.parsed
+        }
 
 
 __all__ = ["Gemini"]
@@ -20,7 +20,7 @@ class Groq(LLMBase):
         """
         try:
             import instructor
-            from groq import Groq
+            from groq import AsyncGroq, Groq
         except ImportError:
             raise ImportError(
                 "Groq package is not installed. Please install it using 'pip install nomos[groq]."
@@ -30,6 +30,7 @@ class Groq(LLMBase):
         kwargs.pop("embedding_model", None)
         client = Groq(**kwargs)
         self.client = instructor.from_groq(client, mode=instructor.Mode.JSON)
+        self.async_client = instructor.from_groq(AsyncGroq(**kwargs), mode=instructor.Mode.JSON)
 
     def get_output(
         self,
@@ -53,3 +54,18 @@ class Groq(LLMBase):
         )
 
         return completion
+
+    async def aget_output(
+        self,
+        messages: List[Message],
+        response_format: BaseModel,
+        **kwargs: dict,
+    ) -> BaseModel:
+        """Asynchronously get a structured response from the Groq LLM."""
+        _messages = [msg.model_dump() for msg in messages]
+        return await self.async_client.chat.completions.create(
+            messages=_messages,
+            model=self.model,
+            response_model=response_format,
+            **kwargs,
+        )
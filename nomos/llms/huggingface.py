@@ -16,7 +16,7 @@ class HuggingFace(LLMBase):
     def __init__(self, model: str, **kwargs) -> None:
         """Initialize the HuggingFace inference client."""
         try:
-            from huggingface_hub import InferenceClient
+            from huggingface_hub import AsyncInferenceClient, InferenceClient
         except ImportError as exc:  # pragma: no cover - dependency check
             raise ImportError(
                 "huggingface_hub package is not installed. Please install it using 'pip install nomos[huggingface]'."
@@ -24,6 +24,7 @@ class HuggingFace(LLMBase):
 
         self.model = model
         self.client = InferenceClient(**kwargs)
+        self.async_client = AsyncInferenceClient(**kwargs)
 
     def get_output(
         self,
@@ -41,11 +42,35 @@ class HuggingFace(LLMBase):
         )
         return comp.choices[0].message.parsed
 
+    async def aget_output(
+        self,
+        messages: List[Message],
+        response_format: BaseModel,
+        **kwargs: dict,
+    ) -> BaseModel:
+        """Asynchronously get a structured response from HuggingFace."""
+        _messages = [msg.model_dump() for msg in messages]
+        comp = await self.async_client.chat.completions.create(
+            model=self.model,
+            messages=_messages,
+            response_format=response_format,
+            **kwargs,
+        )
+        return comp.choices[0].message.parsed
+
     def generate(self, messages: List[Message], **kwargs: dict) -> str:
         """Generate a plain text response from HuggingFace."""
         _messages = [msg.model_dump() for msg in messages]
         comp = self.client.chat.completions.create(model=self.model, messages=_messages, **kwargs)
         return comp.choices[0].message.content if comp.choices else ""
 
+    async def agenerate(self, messages: List[Message], **kwargs: dict) -> str:
+        """Asynchronously generate a plain text response from HuggingFace."""
+        _messages = [msg.model_dump() for msg in messages]
+        comp = await self.async_client.chat.completions.create(
+            model=self.model, messages=_messages, **kwargs
+        )
+        return comp.choices[0].message.content if comp.choices else ""
+
 
 __all__ = ["HuggingFace"]
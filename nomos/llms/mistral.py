@@ -45,6 +45,12 @@ class Mistral(LLMBase):
             mode=Mode.MISTRAL_TOOLS,
             use_async=False,
         )
+        self.async_client = from_mistral(
+            client=self.mistral_client,
+            model=self.model,
+            mode=Mode.MISTRAL_TOOLS,
+            use_async=True,
+        )
 
     def get_output(
         self,
@@ -68,6 +74,20 @@ class Mistral(LLMBase):
         )
         return resp
 
+    async def aget_output(
+        self,
+        messages: List[Message],
+        response_format: BaseModel,
+        **kwargs: dict,
+    ) -> BaseModel:
+        """Asynchronously get a structured response from the Mistral LLM."""
+        _messages = [msg.model_dump() for msg in messages]
+        return await self.async_client.messages.create(
+            response_model=response_format,
+            messages=_messages,
+            **kwargs,
+        )
+
     def generate(
         self,
         messages: List[Message],
@@ -84,6 +104,18 @@ class Mistral(LLMBase):
         comp = self.mistral_client.chat.complete(model=self.model, messages=_messages, **kwargs)
         return comp.choices[0].message.content if comp.choices else ""  # type: ignore
 
+    async def agenerate(
+        self,
+        messages: List[Message],
+        **kwargs: dict,
+    ) -> str:
+        """Asynchronously generate a response from the Mistral LLM."""
+        _messages = [msg.model_dump() for msg in messages]
+        comp = await self.mistral_client.chat.complete_async(
+            model=self.model, messages=_messages, **kwargs
+        )
+        return comp.choices[0].message.content if comp.choices else ""  # type: ignore
+
     def embed_batch(self, texts: List[str]) -> List[List[float]]:
         """Embed a batch of texts using the Mistral embedding model."""
         from mistralai import EmbeddingResponse
@@ -99,5 +131,17 @@ class Mistral(LLMBase):
         embs = self.embed_batch([text])
         return embs[0]
 
+    async def aembed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Asynchronously embed a batch of texts using the Mistral embedding model."""
+        response = await self.mistral_client.embeddings.create_async(
+            model=self.embedding_model, input=texts, output_dtype="float"
+        )
+        return [item.embedding for item in response.data]
+
+    async def aembed_text(self, text: str) -> List[float]:
+        """Asynchronously embed a single text using the Mistral embedding model."""
+        embs = await self.aembed_batch([text])
+        return embs[0]
+
 
 __all__ = ["Mistral"]
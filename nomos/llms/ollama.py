@@ -16,7 +16,7 @@ class Ollama(LLMBase):
     def __init__(self, model: str = "llama3", **kwargs) -> None:
         """Initialize the Ollama LLM."""
         try:
-            from ollama import Client
+            from ollama import AsyncClient, Client
         except ImportError as exc:  # pragma: no cover - dependency check
             raise ImportError(
                 "Ollama package is not installed. Please install it using 'pip install nomos[ollama]'."
@@ -24,6 +24,7 @@ class Ollama(LLMBase):
 
         self.model = model
         self.client = Client(**kwargs)
+        self.async_client = AsyncClient(**kwargs)
 
     def get_output(
         self,
@@ -36,7 +37,24 @@ class Ollama(LLMBase):
         resp = self.client.chat(
             model=self.model,
             messages=_messages,
-            format=response_format.model_json_schema(),
+            format=self.get_json_schema(response_format),
+            **kwargs,
+        )
+        content = resp["message"]["content"]
+        return response_format.model_validate_json(content)
+
+    async def aget_output(
+        self,
+        messages: List[Message],
+        response_format: BaseModel,
+        **kwargs: dict,
+    ) -> BaseModel:
+        """Asynchronously get a structured response from Ollama."""
+        _messages = [msg.model_dump() for msg in messages]
+        resp = await self.async_client.chat(
+            model=self.model,
+            messages=_messages,
+            format=self.get_json_schema(response_format),
             **kwargs,
         )
         content = resp["message"]["content"]
@@ -48,5 +66,11 @@ class Ollama(LLMBase):
         resp = self.client.chat(model=self.model, messages=_messages, **kwargs)
         return resp["message"]["content"] if resp else ""
 
+    async def agenerate(self, messages: List[Message], **kwargs: dict) -> str:
+        """Asynchronously generate a plain text response from Ollama."""
+        _messages = [msg.model_dump() for msg in messages]
+        resp = await self.async_client.chat(model=self.model, messages=_messages, **kwargs)
+        return resp["message"]["content"] if resp else ""
+
 
 __all__ = ["Ollama"]
@@ -1,10 +1,11 @@
 """OpenAI LLM integration for Nomos."""
 
-from typing import List, Optional
+from typing import AsyncIterator, Iterator, List, Optional, Union
 
 from pydantic import BaseModel
 
 from ..models.agent import Message
+from ..utils.metrics import record_usage
 from .base import LLMBase
 
 
@@ -17,17 +18,22 @@ class OpenAI(LLMBase):
         self,
         model: str = "gpt-4o-mini",
         embedding_model: Optional[str] = None,
+        prompt_cache_key: Optional[str] = None,
         **kwargs,
     ) -> None:
         """
         Initialize the OpenAIChatLLM.
 
+        OpenAI caches prompt prefixes of 1024 tokens or more automatically.
+
         :param model: Model name to use (default: gpt-4o-mini).
         :param embedding_model: Model name for embeddings (default: text-embedding-3-small).
+        :param prompt_cache_key: Optional key sent with every request, so requests sharing
+            it (e.g. those of one agent) are routed to the same prompt cache.
         :param kwargs: Additional parameters for OpenAI API.
         """
         try:
-            from openai import OpenAI
+            from openai import AsyncOpenAI, OpenAI
         except ImportError:
             raise ImportError(
                 "OpenAI package is not installed. Please install it using 'pip install nomos[openai]."
@@ -35,7 +41,28 @@ class OpenAI(LLMBase):
 
         self.model = model
         self.embedding_model = embedding_model or "text-embedding-3-small"
+        self.prompt_cache_key = prompt_cache_key
         self.client = OpenAI(**kwargs)
+        self.async_client = AsyncOpenAI(**kwargs)
+
+    @staticmethod
+    def _record_usage(comp) -> None:
+        """Report the token usage of a completion to the running turn."""
+        usage = getattr(comp, "usage", None)
+        if usage:
+            details = getattr(usage, "prompt_tokens_details", None)
+            record_usage(
+                usage.prompt_tokens,
+                usage.completion_tokens,
+                cached_tokens=getattr(details, "cached_tokens", None),
+            )
+
+    def _request_kwargs(self, kwargs: dict) -> dict:
+        """Add the prompt cache key to the request parameters."""
+        if self.prompt_cache_key is None:
+            return kwargs
+        extra_body = {"prompt_cache_key": self.prompt_cache_key, **kwargs.get("extra_body", {})}
+        return {**kwargs, "extra_body": extra_body}
 
     def get_output(
         self,
@@ -56,10 +83,77 @@ class OpenAI(LLMBase):
             model=self.model,
             messages=_messages,
             response_format=response_format,
-            **kwargs,
+            **self._request_kwargs(kwargs),
+        )
+        self._record_usage(comp)
+        return comp.choices[0].message.parsed
+
+    async def aget_output(
+        self,
+        messages: List[Message],
+        response_format: BaseModel,
+        **kwargs: dict,
+    ) -> BaseModel:
+        """Asynchronously get a structured response from the OpenAI LLM."""
+        _messages = [msg.model_dump() for msg in messages]
+        comp = await self.async_client.beta.chat.completions.parse(
+            model=self.model,
+            messages=_messages,
+            response_format=response_format,
+            **self._request_kwargs(kwargs),
         )
+        self._record_usage(comp)
         return comp.choices[0].message.parsed
 
+    def stream_output(
+        self,
+        messages: List[Message],
+        response_format: BaseModel,
+        **kwargs: dict,
+    ) -> Iterator[Union[str, BaseModel]]:
+        """
+        Stream a structured response from the OpenAI LLM.
+
+        :param messages: List of Message objects.
+        :param response_format: Pydantic model for the expected response.
+        :param kwargs: Additional parameters for OpenAI API.
+        :return: Iterator of JSON text chunks, ending with the parsed response.
+        """
+        _messages = [msg.model_dump() for msg in messages]
+        with self.client.beta.chat.completions.stream(
+            model=self.model,
+            messages=_messages,
+            response_format=response_format,
+            **self._request_kwargs(kwargs),
+        ) as stream:
+            for event in stream:
+                if event.type == "content.delta":
+                    yield event.delta
+            comp = stream.get_final_completion()
+        self._record_usage(comp)
+        yield comp.choices[0].message.parsed
+
+    async def astream_output(
+        self,
+        messages: List[Message],
+        response_format: BaseModel,
+        **kwargs: dict,
+    ) -> AsyncIterator[Union[str, BaseModel]]:
+        """Asynchronously stream a structured response from the OpenAI LLM."""
+        _messages = [msg.model_dump() for msg in messages]
+        async with self.async_client.beta.chat.completions.stream(
+            model=self.model,
+            messages=_messages,
+            response_format=response_format,
+            **self._request_kwargs(kwargs),
+        ) as stream:
+            async for event in stream:
+                if event.type == "content.delta":
+                    yield event.delta
+            comp = await stream.get_final_completion()
+        self._record_usage(comp)
+        yield comp.choices[0].message.parsed
+
     def generate(
         self,
         messages: List[Message],
@@ -78,8 +172,24 @@ class OpenAI(LLMBase):
         comp: ChatCompletion = self.client.chat.completions.create(
             messages=_messages,
             model=self.model,
-            **kwargs,
+            **self._request_kwargs(kwargs),
         )
+        self._record_usage(comp)
+        return comp.choices[0].message.content if comp.choices else ""  # type: ignore
+
+    async def agenerate(
+        self,
+        messages: List[Message],
+        **kwargs: dict,
+    ) -> str:
+        """Asynchronously generate a response from the OpenAI LLM."""
+        _messages = [msg.model_dump() for msg in messages]
+        comp = await self.async_client.chat.completions.create(
+            messages=_messages,
+            model=self.model,
+            **self._request_kwargs(kwargs),
+        )
+        self._record_usage(comp)
         return comp.choices[0].message.content if comp.choices else ""  # type: ignore
 
     def token_counter(self, text: str) -> int:
@@ -109,5 +219,23 @@ class OpenAI(LLMBase):
         embs = [item.embedding for item in response.data]
         return embs
 
+    async def aembed_text(self, text: str) -> List[float]:
+        """Asynchronously embed a single text using the OpenAI embeddings API."""
+        response = await self.async_client.embeddings.create(
+            model=self.embedding_model,
+            input=text,
+            encoding_format="float",
+        )
+        return response.data[0].embedding
+
+    async def aembed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Asynchronously embed a batch of texts using the OpenAI embeddings API."""
+        response = await self.async_client.embeddings.create(
+            model=self.embedding_model,
+            input=texts,
+            encoding_format="float",
+        )
+        return [item.embedding for item in response.data]
+
 
 __all__ = ["OpenAI"]
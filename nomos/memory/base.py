@@ -1,8 +1,10 @@
 """Base class for memory modules."""
 
+import asyncio
+import copy
 import os
 import pickle
-from typing import List, Union
+from typing import List, Optional, Union
 
 from nomos.models.agent import Event, StepIdentifier, Summary
 
@@ -10,23 +12,69 @@ from nomos.models.agent import Event, StepIdentifier, Summary
 class Memory:
     """Base class for memory modules."""
 
+    # History list shared with forks of this memory, copied before it is changed
+    _forked_context: Optional[list] = None
+
     def __init__(self) -> None:
         """Initialize memory."""
         self.context: List[Union[Event, StepIdentifier, Summary]] = []
 
     def add(self, item: Union[Event, StepIdentifier]) -> None:
         """Add an item to memory."""
+        self._own_context()
         self.context.append(item)
         self.optimize()
 
+    async def aadd(self, item: Union[Event, StepIdentifier]) -> None:
+        """Add an item to memory without blocking the event loop."""
+        self._own_context()
+        self.context.append(item)
+        await self.aoptimize()
+
     def clear(self) -> None:
         """Clear all items from memory."""
         self.context = []
 
+    def spawn(self) -> "Memory":
+        """Create an empty memory sharing this memory's configuration and clients."""
+        memory = copy.copy(self)
+        memory.clear()
+        return memory
+
+    def fork(self) -> "Memory":
+        """
+        Branch this memory, sharing its configuration, clients and history.
+
+        The history is copy-on-write: it is only copied once this memory or
+        the branch adds to it.
+        """
+        branch = copy.copy(self)
+        self._forked_context = branch._forked_context = self.context
+        return branch
+
+    def _own_context(self) -> None:
+        """Copy the history before changing it if it is shared with a fork."""
+        if self._forked_context is None:
+            return
+        if self.context is self._forked_context:
+            self.context = list(self.context)
+        self._forked_context = None
+
     def optimize(self) -> None:
         """Optimize memory usage."""
         return
 
+    async def aoptimize(self) -> None:
+        """
+        Asynchronously optimize memory usage.
+
+        Subclasses doing I/O in ``optimize`` should override this natively,
+        the default offloads ``optimize`` to a worker thread.
+        """
+        if type(self).optimize is Memory.optimize:
+            return
+        await asyncio.to_thread(self.optimize)
+
     def get_history(self) -> List[Union[Event, Summary, StepIdentifier]]:
         """Get the history of messages."""
         return self.context
@@ -1,12 +1,14 @@
 """Flow-specific memory module that preserves complete information within an specified flow."""
 
+import asyncio
+import copy
 import heapq
 from typing import Any, Dict, List, Optional, Union
 
 from pydantic import BaseModel
 
 from ..constants import PERIODICAL_SUMMARIZATION_SYSTEM_MESSAGE
-from ..llms import LLMBase, LLMConfig
+from ..llms import EmbeddingCacheConfig, LLMBase, LLMConfig
 from ..models.agent import Event, Message, StepIdentifier, Summary
 from ..models.flow import FlowComponent, FlowContext
 from .base import Memory
@@ -27,10 +29,18 @@ class Retriver:
         """Update indexed items."""
         raise NotImplementedError("Subclasses should implement this method.")
 
+    async def aupdate(self, items: List[str], **kwargs) -> None:
+        """Asynchronously update indexed items (runs ``update`` in a worker thread)."""
+        await asyncio.to_thread(self.update, items, **kwargs)
+
     def retrieve(self, query: str, **kwargs) -> list:
         """Retrieve items from memory based on a query."""
         raise NotImplementedError("Subclasses should implement this method.")
 
+    def fork(self) -> "Retriver":
+        """Copy the retriever, so items added to the copy are not retrieved by this one."""
+        return copy.deepcopy(self)
+
 
 class BM25Retriever(Retriver):
     def __init__(self, **kwargs) -> None:
@@ -80,6 +90,19 @@ class EmbeddingRetriever(Retriver):
         self.context.extend(items)
         self.embeddings.extend(self.embedding_model.embed_batch(items))
 
+    async def aupdate(self, items: List[str], **kwargs) -> None:
+        """Asynchronously update indexed items with new items."""
+        embeddings = await self.embedding_model.aembed_batch(items)
+        self.context.extend(items)
+        self.embeddings.extend(embeddings)
+
+    def fork(self) -> "EmbeddingRetriever":
+        """Copy the indexed items, sharing the embedding model."""
+        branch = copy.copy(self)
+        branch.context = list(self.context)
+        branch.embeddings = list(self.embeddings)
+        return branch
+
     def retrieve(self, query: str, top_k: int = 5, **kwargs) -> list:
         """Retrieve items based on a query using embeddings."""
         if not self.context:
@@ -98,6 +121,7 @@ class RetrieverConfig(BaseModel):
 
     method: str
     kwargs: Dict[str, Any] = {}
+    cache: Optional[EmbeddingCacheConfig] = None  # Cache of the embedding retriever's embeddings
 
     def get_retriever(self, embedding_model: Optional["LLMBase"] = None) -> Retriver:
         """Get an instance of the retriever based on the configuration."""
@@ -106,6 +130,8 @@ class RetrieverConfig(BaseModel):
         if self.method == "embedding":
             if embedding_model is None:
                 raise ValueError("Embedding model required for embedding retriever")
+            if self.cache:
+                embedding_model = self.cache.wrap(embedding_model)
             return EmbeddingRetriever(embedding_model)
         raise ValueError(f"Unsupported retriever method: {self.method}")
 
@@ -164,6 +190,13 @@ class FlowMemory(Memory):
         self.context.append(event)
         self.retriever.update([str(event)])
 
+    def fork(self) -> "FlowMemory":
+        """Branch the flow memory, copying its context and retriever index."""
+        branch = copy.copy(self)
+        branch.context = list(self.context)
+        branch.retriever = self.retriever.fork()
+        return branch
+
     def get_context_summary(self) -> str:
         """Get a summary of the current context."""
         if not self.context:
@@ -199,6 +232,12 @@ class FlowMemoryComponent(FlowComponent):
         # Clear context or perform other cleanup
         self.memory.context.clear()
 
+    def fork(self) -> "FlowMemoryComponent":
+        """Branch the component with a copy of its memory."""
+        branch = copy.copy(self)
+        branch.memory = self.memory.fork()
+        return branch
+
     def search(self, query: str, **kwargs) -> list:
         """Search in flow memory."""
         return self.memory._search(query, **kwargs)
@@ -208,6 +247,11 @@ class FlowMemoryComponent(FlowComponent):
         self.memory.context.append(item)
         self.memory.retriever.update([str(item)])
 
+    async def aadd_to_context(self, item: Union[Event, Summary, StepIdentifier]) -> None:
+        """Asynchronously add item to flow memory context."""
+        self.memory.context.append(item)
+        await self.memory.retriever.aupdate([str(item)])
+
 
 __all__ = [
     "FlowMemory",
@@ -3,9 +3,8 @@
 import math
 from typing import List, Optional, Union
 
-from nomos.models.agent import Event, Message, Step, Summary
+from nomos.models.agent import Event, Step, Summary
 
-from ..constants import PERIODICAL_SUMMARIZATION_SYSTEM_MESSAGE
 from ..llms import LLMBase
 from ..utils.logging import log_debug
 from .base import Memory
@@ -64,23 +63,33 @@ class PeriodicalSummarizationMemory(Memory):
     def generate_summary(self, items: List[Union[Event, Summary]]) -> Summary:
         """Generate a summary from a list of events or summaries."""
         log_debug(f"Generating summary from {len(items)} items.")
-        items_str = "\n".join([str(item) for item in items])
-        summary = self.llm.get_output(
-            messages=[
-                Message(role="system", content=PERIODICAL_SUMMARIZATION_SYSTEM_MESSAGE),
-                Message(
-                    role="user",
-                    content=f"Summarize the following Context:\n\n{items_str}",
-                ),
-            ],
-            response_format=Summary,
-        )
-        assert isinstance(summary, Summary), "Summary generation failed."
+        summary = self.llm.generate_summary(items)
+        log_debug(f"Generated summary: {summary.content}")
+        return summary
+
+    async def agenerate_summary(self, items: List[Union[Event, Summary]]) -> Summary:
+        """Asynchronously generate a summary from a list of events or summaries."""
+        log_debug(f"Generating summary from {len(items)} items.")
+        summary = await self.llm.agenerate_summary(items)
         log_debug(f"Generated summary: {summary.content}")
         return summary
 
     def optimize(self) -> None:
         """Optimize memory usage by summarizing."""
+        summarize_items = self._items_to_summarize()
+        if summarize_items is None:
+            return
+        self._apply_summary(self.generate_summary(summarize_items))
+
+    async def aoptimize(self) -> None:
+        """Asynchronously optimize memory usage by summarizing."""
+        summarize_items = self._items_to_summarize()
+        if summarize_items is None:
+            return
+        self._apply_summary(await self.agenerate_summary(summarize_items))
+
+    def _items_to_summarize(self) -> Optional[List[Union[Event, Summary]]]:
+        """Select the items to summarize, or None if the limits are not exceeded."""
         summary_i = next(
             (
                 i
@@ -99,7 +108,7 @@ class PeriodicalSummarizationMemory(Memory):
         )
         log_debug(f"Token Fill Percentage: {T / self.T_max:.2%}, ")
         if N < self.N_max and T < self.T_max:
-            return
+            return None
 
         log_debug("Max token limit or item limit exceeded. Summarizing...")
         # Compute scores
@@ -125,11 +134,10 @@ class PeriodicalSummarizationMemory(Memory):
         recent_indices = {i for i in range(N - self.M + 1, N + 1)}
         raw_indices |= recent_indices
 
-        summarize_items = [context_cpy[i - 1] for i, s in scores if i not in raw_indices]
+        return [context_cpy[i - 1] for i, s in scores if i not in raw_indices]
 
-        # Generate summary
-        summary = self.generate_summary(summarize_items)
-        # Update context (Previous context (-recent items) + summary + recent items)
+    def _apply_summary(self, summary: Summary) -> None:
+        """Update context (Previous context (-recent items) + summary + recent items)."""
         self.context = self.context[: -self.M] if self.preserve_history else []
         self.context += [summary] + self.context[-self.M :]
         log_debug(f"Updated context length: {len(self.context)}")
@@ -1,6 +1,7 @@
 """Flow models for Nomos's decision-making process."""
 
 import heapq
+import re
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from enum import Enum
@@ -12,6 +13,7 @@ from typing import (
     List,
     Literal,
     Optional,
+    Tuple,
     Union,
 )
 from uuid import uuid4
@@ -42,6 +44,80 @@ class Action(Enum):
     END = "END"
 
 
+class RouteRule(BaseModel):
+    """
+    Machine-evaluable condition of a route.
+
+    Rules are checked locally before the LLM is asked for a decision. When all
+    of a rule's checks hold, the route is taken without an LLM call. Checks
+    only see what happened since the last decision: the new user input and the
+    results of the tool calls just made. A rule never matches when nothing new
+    was observed, so ``state`` checks only narrow down a user input or tool
+    check, and a rule without any check is rejected.
+
+    Attributes:
+        user_input (Optional[str]): Regex searched (case-insensitive) in the new user input.
+        tool (Optional[str]): Name of the tool the tool checks apply to (any tool if omitted).
+        tool_output (Optional[str]): Regex searched in the tool output.
+        tool_success (Optional[bool]): Whether the tool call must have succeeded (or failed).
+        state (Dict[str, Any]): Expected values of the flow state (``flow_id`` and flow context metadata).
+    """
+
+    user_input: Optional[str] = None
+    tool: Optional[str] = None
+    tool_output: Optional[str] = None
+    tool_success: Optional[bool] = None
+    state: Dict[str, Any] = Field(default_factory=dict)
+
+    def model_post_init(self, __context) -> None:
+        """Validate the regular expressions and that the rule checks something."""
+        if self.user_input is None and not self.checks_tool and not self.state:
+            raise ValueError("Route rule must check the user input, a tool call or the state")
+        for pattern in (self.user_input, self.tool_output):
+            if pattern is not None:
+                try:
+                    re.compile(pattern)
+                except re.error as e:
+                    raise ValueError(f"Invalid route rule pattern '{pattern}': {e}")
+
+    @property
+    def checks_tool(self) -> bool:
+        """Whether the rule checks a tool call."""
+        return (
+            self.tool is not None or self.tool_output is not None or self.tool_success is not None
+        )
+
+    def matches(
+        self,
+        user_input: Optional[str],
+        tool_results: Dict[str, Tuple[Any, bool]],
+        state: Dict[str, Any],
+    ) -> bool:
+        """
+        Check the rule against the latest observations.
+
+        :param user_input: User input received since the last decision, if any.
+        :param tool_results: Tool name to (output, succeeded) of the tool calls made since the last decision.
+        :param state: Current flow state values.
+        :return: True if every check of the rule holds.
+        """
+        # Without a new observation the rule would fire again on every iteration
+        if user_input is None and not tool_results:
+            return False
+        if self.user_input is not None and (
+            user_input is None or not re.search(self.user_input, user_input, re.IGNORECASE)
+        ):
+            return False
+        if self.checks_tool and not any(
+            (self.tool is None or name == self.tool)
+            and (self.tool_success is None or succeeded == self.tool_success)
+            and (self.tool_output is None or re.search(self.tool_output, str(output)))
+            for name, (output, succeeded) in tool_results.items()
+        ):
+            return False
+        return all(state.get(key) == value for key, value in self.state.items())
+
+
 class Route(BaseModel):
     """
     Represents a route (transition) from one step to another in the flow.
@@ -49,6 +125,7 @@ class Route(BaseModel):
     Attributes:
         target (str): The target step ID.
         condition (str): The condition for taking this route.
+        rule (Optional[RouteRule]): Optional machine-evaluable condition, taking the route without an LLM call.
     """
 
     target: str = Field(
@@ -63,6 +140,7 @@ class Route(BaseModel):
         validation_alias="when",
         serialization_alias="when",
     )
+    rule: Optional[RouteRule] = None
 
     model_config = {"populate_by_name": True}
 
@@ -102,6 +180,10 @@ class DecisionExample(BaseModel):
         return self._ctx_embedding
 
 
+# How much reasoning a decision asks for: step by step, a few short bullets, or none
+ReasoningMode = Literal["full", "brief", "none"]
+
+
 class StepOverrides(BaseModel):
     """
     Represents overrides for a step's configuration.
@@ -109,10 +191,18 @@ class StepOverrides(BaseModel):
     Attributes:
         persona (Optional[str]): Override for the persona.
         llm (Optional[LLMConfig]): Override for the LLM configuration.
+        reasoning (Optional[ReasoningMode]): Override for the decision reasoning mode.
+        cache (bool): Serve identical decision requests from the agent's response cache.
+        cache_ttl (Optional[int]): Override for the seconds until cached decisions expire.
+        answer_cache (bool): Answer user inputs similar to previously approved ones from the agent's answer cache.
     """
 
     persona: Optional[str] = None
     llm: str = "global"
+    reasoning: Optional[ReasoningMode] = None
+    cache: bool = False
+    cache_ttl: Optional[int] = None
+    answer_cache: bool = False
 
 
 class Step(BaseModel):
@@ -128,6 +218,11 @@ class Step(BaseModel):
         answer_model (Optional[Dict[str, Dict[str, Any]]]): Pydantic model for the agent's answer structure.
         auto_flow (bool): Flag indicating if the step should automatically flow without additonal inputs or answering.
         provide_suggestions (bool): Flag indicating if the step should provide suggestions to the user.
+        parallel_tool_calls (bool): Flag allowing a single decision to make several independent tool calls, which are run concurrently.
+        tool_bindings (Optional[Dict[str, Any]]): Arguments of the step's single tool, bound to ``$input``, ``$tools.<tool>[.<key>...]``,
+            ``$state.<key>`` or literal values. The tool is then run, and the step's single route followed, without asking the LLM.
+        pass_through (bool): Allow a multi-hop MOVE to cross this step without stopping. Only steps without tools, tool bindings,
+            rule routes or auto_flow may opt in, since nothing of the step runs when it is crossed.
     Methods:
         get_available_routes() -> List[str]: Get the list of available route targets.
     """
@@ -147,6 +242,9 @@ class Step(BaseModel):
     answer_model: Optional[Union[Dict[str, Dict[str, Any]], BaseModel]] = None
     auto_flow: bool = False
     quick_suggestions: bool = False
+    parallel_tool_calls: bool = False
+    tool_bindings: Optional[Dict[str, Any]] = None
+    pass_through: bool = False
     flow_id: Optional[str] = None  # Add this to associate steps with flows
     overrides: Optional[StepOverrides] = None
     examples: Optional[List[DecisionExample]] = Field(
@@ -184,6 +282,26 @@ class Step(BaseModel):
             raise ValueError(
                 f"Step '{self.step_id}': When auto_flow is True, quick_suggestions cannot be True"
             )
+        if self.tool_bindings is not None:
+            if not self.auto_flow or len(self.available_tools) != 1 or self.deferred_tool_ids:
+                raise ValueError(
+                    f"Step '{self.step_id}': tool_bindings require auto_flow and exactly one non-deferred tool"
+                )
+            for expression in self.tool_bindings.values():
+                if isinstance(expression, str) and expression.startswith("$"):
+                    if not re.fullmatch(r"\$(input|(tools|state)(\.[^.]+)+)", expression):
+                        raise ValueError(
+                            f"Step '{self.step_id}': invalid tool binding '{expression}'"
+                        )
+        if self.pass_through and (
+            self.available_tools
+            or self.tool_bindings is not None
+            or self.auto_flow
+            or any(route.rule for route in self.routes)
+        ):
+            raise ValueError(
+                f"Step '{self.step_id}': pass_through steps cannot have tools, tool bindings, rule routes or auto_flow"
+            )
 
     def get_answer_model(self) -> BaseModel:
         """
@@ -226,6 +344,42 @@ class Step(BaseModel):
         """
         return self.overrides.llm if self.overrides else "global"
 
+    @property
+    def reasoning(self) -> Optional[ReasoningMode]:
+        """
+        Get the reasoning mode override for this step.
+
+        :return: Reasoning mode if overridden, otherwise None.
+        """
+        return self.overrides.reasoning if self.overrides else None
+
+    @property
+    def cache(self) -> bool:
+        """
+        Check whether decisions of this step are served from the response cache.
+
+        :return: True if caching is enabled for the step.
+        """
+        return self.overrides.cache if self.overrides else False
+
+    @property
+    def cache_ttl(self) -> Optional[int]:
+        """
+        Get the cached decision TTL override for this step.
+
+        :return: Seconds until cached decisions expire if overridden, otherwise None.
+        """
+        return self.overrides.cache_ttl if self.overrides else None
+
+    @property
+    def answer_cache(self) -> bool:
+        """
+        Check whether user inputs of this step are looked up in the answer cache.
+
+        :return: True if the answer cache is enabled for the step.
+        """
+        return self.overrides.answer_cache if self.overrides else False
+
     @property
     def tool_ids(self) -> List[str]:
         """
@@ -419,6 +573,8 @@ class Decision(BaseModel):
         suggestions (Optional[List[str]]): Quick user input suggestions if RESPOND.
         step_id (Optional[str]): Step ID to transition to if MOVE.
         tool_call (Optional[Dict[str, Any]]): Tool call details if TOOL_CALL.
+        tool_calls (Optional[List[ToolCall]]): All tool calls if TOOL_CALL in a step with parallel tool calls.
+            ``tool_call`` is the first of them.
     """
 
     reasoning: List[str]
@@ -427,6 +583,7 @@ class Decision(BaseModel):
     suggestions: Optional[List[str]] = None
     step_id: Optional[str] = None
     tool_call: Optional[ToolCall] = None
+    tool_calls: Optional[List[ToolCall]] = None
 
     def __str__(self) -> str:
         """Return a string representation of the decision."""
@@ -434,6 +591,12 @@ class Decision(BaseModel):
             return f"action: {self.action.value}, response: {self.response}"
         elif self.action == Action.MOVE:
             return f"action: {self.action.value}, step_id: {self.step_id}"
+        elif self.action == Action.TOOL_CALL and self.tool_calls and len(self.tool_calls) > 1:
+            calls = ", ".join(
+                f"{call.tool_name} with args {call.tool_kwargs.model_dump_json()}"
+                for call in self.tool_calls
+            )
+            return f"action: {self.action.value}, tool_calls: {calls}"
         elif self.action == Action.TOOL_CALL and self.tool_call:
             return f"action: {self.action.value}, tool_call: {self.tool_call.tool_name} with args {self.tool_call.tool_kwargs.model_dump_json()}"
         elif self.action == Action.END:
@@ -479,6 +642,99 @@ def history_to_types(
     return history
 
 
+class TurnBudget(BaseModel):
+    """
+    Limits for a single turn of the decision loop.
+
+    When any limit is reached the turn stops deciding and produces a fallback
+    response (or raises for ``auto_flow`` steps). ``None`` disables a limit.
+
+    Attributes:
+        max_llm_calls (Optional[int]): Maximum number of LLM decisions per turn.
+        max_tool_calls (Optional[int]): Maximum number of tool calls per turn.
+        max_time (Optional[float]): Maximum wall time of a turn in seconds.
+            Checked between decisions; the fallback response is still generated by the LLM.
+        timeout (Optional[float]): Hard deadline of a turn in seconds. LLM calls, tool calls
+            and memory updates still running at the deadline are cancelled (or abandoned,
+            for blocking calls) and the turn returns ``timeout_response`` without
+            another LLM call.
+        timeout_response (str): Response returned when the turn hits its deadline.
+    """
+
+    max_llm_calls: Optional[int] = None
+    max_tool_calls: Optional[int] = None
+    max_time: Optional[float] = None
+    timeout: Optional[float] = None
+    timeout_response: str = "Sorry, this is taking longer than expected. Please try again."
+
+
+class TurnTimeoutError(TimeoutError):
+    """Raised into a turn when its deadline passes."""
+
+
+class TurnStats(BaseModel):
+    """
+    Accounting for a single turn of the decision loop.
+
+    Attributes:
+        iterations (int): Number of decision loop iterations.
+        retries (int): Number of iterations caused by an invalid decision or a failed action.
+        llm_calls (int): Number of LLM decisions made.
+        tool_calls (int): Number of tool calls made.
+        repair_attempts (int): Number of invalid decisions a local repair was tried on.
+        repairs (int): Number of invalid decisions repaired locally instead of retried.
+        duration (float): Wall time of the turn in seconds.
+        exhausted (Optional[str]): The limit that ended the turn early, if any.
+    """
+
+    iterations: int = 0
+    retries: int = 0
+    llm_calls: int = 0
+    tool_calls: int = 0
+    repair_attempts: int = 0
+    repairs: int = 0
+    duration: float = 0.0
+    exhausted: Optional[str] = None
+
+
+class TurnMetrics(TurnStats):
+    """
+    Where the time and tokens of a single turn went, along with its :class:`TurnStats`.
+
+    Attributes:
+        timings (Dict[str, float]): Wall time in seconds per stage: ``history`` (formatting),
+            ``examples`` (embedding and retrieval), ``schema`` (decision model build),
+            ``cache`` (cache lookups and writes), ``llm``, ``parse`` (decision parsing),
+            ``repair`` (local fixes of invalid decisions), ``tool``, ``memory`` (updates and
+            optimization) and ``persistence`` (session storage, when served by the API).
+        prompt_tokens (int): Input tokens reported by the provider, including cached ones.
+        completion_tokens (int): Output tokens reported by the provider.
+        cached_tokens (int): Input tokens read from the provider's prompt cache.
+        cache_hits (int): Number of decisions served from a cache instead of the LLM.
+    """
+
+    timings: Dict[str, float] = Field(default_factory=dict)
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    cache_hits: int = 0
+
+    @property
+    def total_tokens(self) -> int:
+        """Total tokens used by the turn."""
+        return self.prompt_tokens + self.completion_tokens
+
+    def server_timing(self) -> str:
+        """
+        Format the stage timings as a ``Server-Timing`` header value.
+
+        :return: Header value, e.g. ``llm;dur=812.4, tool;dur=35.0``.
+        """
+        return ", ".join(
+            f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in self.timings.items()
+        )
+
+
 class Response(BaseModel):
     """
     Represents a response from the agent's session.
@@ -487,11 +743,15 @@ class Response(BaseModel):
         decision (Decision): The decision made by the agent.
         tool_output (Optional[Any]): Output from the tool call, if any.
         state (State): The updated session state after the decision.
+        stats (Optional[TurnStats]): Iteration and retry accounting for the turn.
+        metrics (Optional[TurnMetrics]): Per-stage timings and token usage of the turn.
     """
 
     decision: Decision
     tool_output: Optional[Any] = None
     state: Optional[State] = None
+    stats: Optional[TurnStats] = None
+    metrics: Optional[TurnMetrics] = None
 
     def __str__(self) -> str:
         """Return a string representation of the response."""
@@ -501,11 +761,16 @@ class Response(BaseModel):
 __all__ = [
     "Action",
     "Route",
+    "RouteRule",
     "Step",
     "ToolCall",
     "Event",
     "Message",
     "Response",
+    "TurnBudget",
+    "TurnStats",
+    "TurnMetrics",
+    "TurnTimeoutError",
     "Summary",
     "State",
     "Decision",
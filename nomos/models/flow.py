@@ -1,5 +1,6 @@
 """Flow construct for encapsulating sets of steps with shared context and components."""
 
+import copy
 from abc import ABC, abstractmethod
 from typing import Any, Callable, Dict, List, Optional, Union
 
@@ -35,6 +36,10 @@ class FlowComponent(ABC):
         """Called for cleanup when flow terminates."""
         pass
 
+    def fork(self) -> "FlowComponent":
+        """Branch the component for a forked session. Stateless components are shared."""
+        return self
+
 
 class FlowConfig(BaseModel):
     """Configuration for a flow."""
@@ -174,6 +179,18 @@ class Flow:
         if context_key in self.active_contexts:
             del self.active_contexts[context_key]
 
+    def fork(self) -> "Flow":
+        """
+        Branch the flow for a forked session.
+
+        Components are forked, so the branch's flow memory no longer shares its
+        context with this flow; the configuration and steps are shared.
+        """
+        branch = copy.copy(self)
+        branch.components = {name: c.fork() for name, c in self.components.items()}
+        branch.active_contexts = dict(self.active_contexts)
+        return branch
+
     def get_component(self, name: str) -> Optional[FlowComponent]:
         """Get a flow component by name."""
         return self.components.get(name)
@@ -43,11 +43,14 @@ class Tool(BaseModel):
             Get the Pydantic model for the tool's arguments.
         run(**kwargs) -> str:
             Execute the tool with the provided arguments.
+        arun(**kwargs) -> str:
+            Asynchronously execute the tool with the provided arguments.
     """
 
     name: str
     description: str
     function: Callable
+    async_function: Optional[Callable] = None  # Native coroutine function used by `arun`
     parameters: Dict[str, Dict[str, Any]] = {}
     args_model: Optional[Type[BaseModel]] = None
 
@@ -217,7 +220,21 @@ class Tool(BaseModel):
         :param server: The MCP server instance.
         :return: A list of Tool instances.
         """
-        mcp_tools = server.get_tools()
+        return cls._from_mcp_tools(server, server.get_tools())
+
+    @classmethod
+    async def afrom_mcp_server(cls, server: "MCPServer") -> List["Tool"]:
+        """
+        Asynchronously create Tool instances from a MCP server.
+
+        :param server: The MCP server instance.
+        :return: A list of Tool instances.
+        """
+        return cls._from_mcp_tools(server, await server.list_tools_async())
+
+    @classmethod
+    def _from_mcp_tools(cls, server: "MCPServer", mcp_tools: list) -> List["Tool"]:
+        """Wrap the tools listed by a MCP server as Tool instances."""
         tools = []
         for mcp_tool in mcp_tools:
             tool_name = f"{server.name}/{mcp_tool.name}"
@@ -225,6 +242,9 @@ class Tool(BaseModel):
                 name=tool_name,
                 description=mcp_tool.description,
                 function=lambda name=mcp_tool.name, **kwargs: server.call_tool(name, kwargs),
+                async_function=lambda name=mcp_tool.name, **kwargs: server.call_tool_async(
+                    name, kwargs
+                ),
                 parameters=mcp_tool.parameters,
             )
             tools.append(tool)
@@ -249,6 +269,7 @@ class Tool(BaseModel):
             name=api_tool.name,
             description=description,
             function=api_tool.run,
+            async_function=api_tool.arun,
             parameters=params,
         )
 
@@ -278,12 +299,7 @@ class Tool(BaseModel):
         :param kwargs: The arguments to be passed to the tool's function.
         :return: The result of the tool's function.
         """
-        # Validate the arguments
-        args_model = self.get_args_model()
-        try:
-            args_model(**kwargs)
-        except ValidationError as e:
-            raise InvalidArgumentsError(e)
+        self._validate_args(kwargs)
 
         result = self.function(*args, **kwargs)
         if inspect.iscoroutine(result) or isinstance(result, asyncio.Future):
@@ -293,6 +309,38 @@ class Tool(BaseModel):
 
         return str(result)
 
+    async def arun(self, *args, **kwargs) -> str:
+        """
+        Asynchronously execute the tool with the provided arguments.
+
+        Coroutine functions are awaited on the running event loop, blocking
+        functions are offloaded to a worker thread.
+
+        :param kwargs: The arguments to be passed to the tool's function.
+        :return: The result of the tool's function.
+        """
+        self._validate_args(kwargs)
+
+        function = self.async_function or self.function
+        if inspect.iscoroutinefunction(function):
+            result = await function(*args, **kwargs)
+        else:
+            result = await asyncio.to_thread(function, *args, **kwargs)
+        if inspect.isawaitable(result):
+            result = await result
+        elif isinstance(result, Future):
+            result = await asyncio.wrap_future(result)
+
+        return str(result)
+
+    def _validate_args(self, kwargs: Dict[str, Any]) -> None:
+        """Validate the tool arguments against the args model."""
+        args_model = self.get_args_model()
+        try:
+            args_model(**kwargs)
+        except ValidationError as e:
+            raise InvalidArgumentsError(e)
+
     def __str__(self) -> str:
         """String representation of the Tool instance."""
         return f"Tool(name={self.name}, description={self.description})"
@@ -428,24 +476,26 @@ class ToolWrapper(BaseModel):
 
 
 def get_tools(
-    tools: Optional[list[Union[Callable, ToolWrapper]]],
+    tools: Optional[list[Union[Callable, ToolWrapper, Tool]]],
     tool_defs: Optional[Dict[str, ToolDef]] = None,
 ) -> dict[str, Union[Tool, MCPServer]]:
     """
     Get a list of Tool instances from a list of functions or tool identifiers.
 
-    :param tools: A list of functions or tool identifiers.
+    :param tools: A list of functions, tool identifiers or Tool instances.
     :param tool_defs: Optional dictionary of tool definitions for argument descriptions.
     :return: A dictionary mapping tool names to Tool instances.
     """
     _tools: dict[str, Union[Tool, MCPServer]] = {}
     for tool in tools or []:
         _tool: Optional[Union[Tool, List[Tool], MCPServer]] = None
-        if callable(tool):
+        if isinstance(tool, Tool):
+            _tool = tool
+        elif callable(tool):
             _tool = Tool.from_function(tool, tool_defs)
         if isinstance(tool, ToolWrapper):
             _tool = tool.get_tool(tool_defs)
-        assert _tool is not None, "Tool must be a callable or a ToolWrapper instance"
+        assert _tool is not None, "Tool must be a callable, a ToolWrapper or a Tool instance"
         if isinstance(_tool, list):
             for t in _tool:
                 _tools[t.name] = t
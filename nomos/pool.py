@@ -0,0 +1,136 @@
+"""Process pool running agent turns on all cores."""
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar, Union
+
+from .core import Agent
+from .models.agent import State
+
+T = TypeVar("T")
+
+# Agent of the current worker process, inherited from the process that created the pool
+_worker_agent: Optional[Agent] = None
+
+
+def _init_worker(agent: Agent, workers: int) -> None:
+    """Keep the preloaded agent for the turns run in this worker."""
+    global _worker_agent
+    # Each worker has its own copy of the limiter, so together they stay under the configured rate
+    if agent.rate_limiter is not None:
+        agent.rate_limiter.split(workers)
+    _worker_agent = agent
+
+
+def _call(fn: Callable[..., T], args: tuple) -> T:
+    """Call a function with the worker's agent."""
+    assert _worker_agent is not None, "Agent pool worker not initialized"
+    return fn(_worker_agent, *args)
+
+
+def _next_turn(
+    agent: Agent,
+    user_input: Optional[str],
+    session_data: Optional[Union[str, bytes, dict, State]],
+    kwargs: Dict[str, Any],
+) -> Dict[str, Any]:
+    """Run a stateless turn and return the response as JSON-compatible data."""
+    if isinstance(session_data, (str, bytes)):
+        session_data = State.model_validate_json(session_data)
+    res = agent.next(user_input=user_input, session_data=session_data, **kwargs)
+    return res.model_dump(mode="json")
+
+
+class AgentPool:
+    """
+    Run stateless turns of an agent in a pool of worker processes.
+
+    Schema building, prompt formatting, (de)serialization and CPU-bound tools
+    all hold the GIL, so a single process cannot keep more than one core busy.
+    The pool forks workers from the current process: each of them starts with
+    the already loaded agent (compiled tables, tools, LLM clients) without
+    rebuilding or pickling it, and keeps its own warm caches. The agent's
+    ``llm_requests_per_minute`` limit is split evenly between the workers.
+
+    Only the turn inputs and JSON-compatible results cross process
+    boundaries. Session state can be passed as a JSON string, which is parsed
+    in the worker.
+    """
+
+    def __init__(self, agent: Agent, workers: Optional[int] = None) -> None:
+        """
+        Start the worker processes.
+
+        :param agent: The agent to run turns of.
+        :param workers: Number of worker processes. Defaults to the number of CPUs.
+        :raises RuntimeError: If the platform cannot fork processes.
+        """
+        if "fork" not in multiprocessing.get_all_start_methods():
+            raise RuntimeError("AgentPool requires the 'fork' start method")
+        self.agent = agent
+        self.workers = workers or os.cpu_count() or 1
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("fork"),
+            initializer=_init_worker,
+            initargs=(agent, self.workers),
+        )
+        # Fork all workers now, before the caller starts any threads
+        self._executor.submit(os.getpid).result()
+
+    def run(self, fn: Callable[..., T], *args: Any) -> T:  # noqa: ANN401
+        """
+        Call ``fn(agent, *args)`` in a worker process.
+
+        :param fn: Module level function; its arguments and result must be picklable.
+        :param args: Arguments passed after the worker's agent.
+        :return: The result of the call.
+        """
+        return self._executor.submit(_call, fn, args).result()
+
+    async def arun(self, fn: Callable[..., T], *args: Any) -> T:  # noqa: ANN401
+        """Asynchronously call ``fn(agent, *args)`` in a worker process."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, _call, fn, args)
+
+    def next(
+        self,
+        user_input: Optional[str] = None,
+        session_data: Optional[Union[str, bytes, dict, State]] = None,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> Dict[str, Any]:
+        """
+        Run a turn of :meth:`Agent.next` in a worker process.
+
+        :param user_input: Optional user input string.
+        :param session_data: Optional session state, as a State, dictionary or JSON string.
+        :param kwargs: Other arguments of :meth:`Agent.next`.
+        :return: The response dumped in JSON mode, with the updated session state.
+        """
+        return self.run(_next_turn, user_input, session_data, kwargs)
+
+    async def anext(
+        self,
+        user_input: Optional[str] = None,
+        session_data: Optional[Union[str, bytes, dict, State]] = None,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> Dict[str, Any]:
+        """Asynchronously run a turn in a worker process (see :meth:`next`)."""
+        return await self.arun(_next_turn, user_input, session_data, kwargs)
+
+    def close(self) -> None:
+        """Stop the worker processes, waiting for running turns to finish."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> "AgentPool":
+        """Use the pool as a context manager."""
+        return self
+
+    def __exit__(self, *exc: Any) -> None:  # noqa: ANN401
+        """Stop the pool when leaving the context."""
+        self.close()
+
+
+__all__ = ["AgentPool"]
@@ -0,0 +1,170 @@
+"""Bounded registry of an agent's decision models."""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple, Type
+
+from pydantic import BaseModel
+
+from .compiled import CompiledAgent
+from .llms.base import LLMBase
+from .models.agent import DecisionConstraints, ReasoningMode, Step
+from .models.tool import Tool
+
+
+class SchemaRegistry:
+    """
+    Bounded cache of the decision models of a single agent.
+
+    Entries are keyed by the step's ID and the settings its schema depends on,
+    the tool names, constraints and reasoning options. Each agent has its own
+    registry, so agents sharing step IDs never see each other's models. The
+    least recently used entries are dropped once ``maxsize`` is reached. The
+    JSON schema of a new model is serialized into the cache of
+    :meth:`LLMBase.get_json_schema`, which providers read it from.
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        """
+        Initialize the registry.
+
+        :param maxsize: Maximum number of decision models kept.
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Type[BaseModel]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Get the number of cached decision models."""
+        return len(self._entries)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Pickle the registry without its entries, which hold generated models."""
+        return {"maxsize": self.maxsize}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Restore an empty registry; models are rebuilt on first use."""
+        self.__init__(state["maxsize"])
+
+    def get(
+        self,
+        step: Step,
+        tools: Iterable[Tool],
+        constraints: Optional[DecisionConstraints] = None,
+        move_targets: Optional[Tuple[str, ...]] = None,
+        reasoning: ReasoningMode = "full",
+        max_reasoning_steps: int = 3,
+    ) -> Type[BaseModel]:
+        """
+        Get the decision model of a step, building it on first use.
+
+        :param step: The step to decide in.
+        :param tools: Tools available in the step.
+        :param constraints: Optional constraints for a retried decision.
+        :param move_targets: Optional step IDs a MOVE may target, instead of the direct routes.
+        :param reasoning: Reasoning asked for in the decision.
+        :param max_reasoning_steps: Maximum number of bullets in ``brief`` mode.
+        :return: The decision model.
+        """
+        tools = tuple(tools)
+        key = (
+            self._step_key(step),
+            tuple(sorted(tool.name for tool in tools)),
+            constraints,
+            move_targets,
+            reasoning,
+            max_reasoning_steps,
+        )
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+        model = LLMBase._create_decision_model(
+            current_step=step,
+            current_step_tools=tools,
+            constraints=constraints,
+            move_targets=move_targets,
+            reasoning=reasoning,
+            max_reasoning_steps=max_reasoning_steps,
+        )
+        LLMBase.get_json_schema(model)
+        with self._lock:
+            entry = self._entries.setdefault(key, model)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return entry
+
+    @staticmethod
+    def _step_key(step: Step) -> Hashable:
+        """Identify a step by its ID and the settings its decision model depends on."""
+        return (
+            step.step_id,
+            tuple(route.target for route in step.routes),
+            step.auto_flow,
+            step.quick_suggestions,
+            step.parallel_tool_calls,
+            id(step.answer_model),
+        )
+
+    def warm(
+        self,
+        compiled: CompiledAgent,
+        max_move_hops: int = 1,
+        reasoning: ReasoningMode = "full",
+        max_reasoning_steps: int = 3,
+    ) -> None:
+        """
+        Build the decision models of every step and every retry constraint up front.
+
+        Models of steps with deferred tools are built for their regular tools only;
+        the others are built on the first turn that loads them.
+
+        :param compiled: The agent's compiled steps.
+        :param max_move_hops: Maximum number of steps a single MOVE may cross.
+        :param reasoning: Default reasoning asked for in decisions.
+        :param max_reasoning_steps: Maximum number of bullets in ``brief`` mode.
+        """
+        for step_id, compiled_step in compiled.steps.items():
+            step = compiled_step.step
+            move_targets = (
+                tuple(compiled.reachable(step_id, max_move_hops)) if max_move_hops > 1 else None
+            )
+            for constraints in self._constraint_variants(
+                step, compiled_step.routes, compiled_step.tools
+            ):
+                self.get(
+                    step,
+                    compiled_step.tools,
+                    constraints=constraints,
+                    move_targets=move_targets,
+                    reasoning=step.reasoning or reasoning,
+                    max_reasoning_steps=max_reasoning_steps,
+                )
+
+    @staticmethod
+    def _constraint_variants(
+        step: Step, routes: Tuple[str, ...], tools: Tuple[Tool, ...]
+    ) -> List[Optional[DecisionConstraints]]:
+        """List the constraints a step's decisions may be retried with."""
+        variants: List[Optional[DecisionConstraints]] = [None]
+        if not step.auto_flow:
+            variants.append(DecisionConstraints(actions=["RESPOND"], fields=["response"]))
+        if routes:
+            variants.append(DecisionConstraints(actions=["MOVE"], fields=["step_id"]))
+        if tools:
+            variants.append(DecisionConstraints(actions=["TOOL_CALL"], fields=["tool_call"]))
+            variants.extend(
+                DecisionConstraints(
+                    actions=["TOOL_CALL"], fields=["tool_call"], tool_name=tool.name
+                )
+                for tool in tools
+            )
+        return variants
+
+
+__all__ = ["SchemaRegistry"]
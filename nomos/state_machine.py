@@ -1,10 +1,12 @@
 """State machine for managing steps and flow transitions in Nomos."""
 
-from typing import Dict, List, Optional, Tuple
+import asyncio
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
 
 import colorama
 from colorama import Fore, Style
 
+from .compiled import CompiledAgent
 from .config import AgentConfig
 from .memory.base import Memory
 from .memory.flow import FlowMemoryComponent
@@ -24,6 +26,7 @@ class StateMachine:
         flows: Optional[List[Flow]] = None,
         config: Optional[AgentConfig] = None,
         start_step_id: Optional[str] = None,
+        compiled: Optional[CompiledAgent] = None,
     ) -> None:
         """
         Initialize the state machine with steps, flows, and memory.
@@ -34,15 +37,15 @@ class StateMachine:
         :param config: Optional AgentConfig containing flow definitions.
         :param memory: Optional Memory instance to store session history.
         :param start_step_id: Optional starting step ID. If not provided, defaults to the first step in `steps`.
+        :param compiled: Optional precompiled agent whose route tables are shared instead of rebuilt.
         """
-        # Map of step -> allowed next step ids
         self.steps = steps
-        self.transitions: Dict[str, List[str]] = {
-            step_id: step.get_available_routes() for step_id, step in steps.items()
-        }
+        # Shared route tables (step -> allowed next step ids)
+        self.compiled = compiled or CompiledAgent.compile(steps)
 
         self.memory = memory
-        self.current_step_id = start_step_id or next(iter(steps))
+        self.start_step_id = start_step_id or next(iter(steps))
+        self.current_step_id = self.start_step_id
 
         if not flow_manager:
             if flows:
@@ -69,6 +72,11 @@ class StateMachine:
                     flow.flow_id for flow in flow_manager.find_exit_flows(step_id)
                 ]
 
+    @property
+    def transitions(self) -> Mapping[str, Sequence[str]]:
+        """Return the map of step -> allowed next step ids."""
+        return self.compiled.transitions
+
     @property
     def current_step(self) -> Step:
         """Return the current step object."""
@@ -76,9 +84,10 @@ class StateMachine:
 
     def can_transition(self, current: str, target: str) -> bool:
         """Return True if transition is allowed."""
-        if current not in self.transitions:
+        routes = self.compiled.route_sets.get(current)
+        if routes is None:
             raise ValueError(f"Unknown step: {current}")
-        return target in self.transitions[current]
+        return target in routes
 
     def move(self, target: str) -> str:
         """Move to the target step if allowed and return new step id."""
@@ -87,6 +96,13 @@ class StateMachine:
         self.current_step_id = target
         return target
 
+    def path_to(self, target: str, max_hops: int = 1) -> Optional[Tuple[str, ...]]:
+        """Return the steps to pass through to reach target, or None if not within max_hops."""
+        if self.can_transition(self.current_step_id, target):
+            return (target,)
+        path = self.compiled.paths.get(self.current_step_id, {}).get(target)
+        return path if path is not None and len(path) <= max_hops else None
+
     def transition(self, current: str, target: str) -> str:
         """Validate transition and return next state."""
         if not self.can_transition(current, target):
@@ -152,6 +168,24 @@ class StateMachine:
             if verbose:
                 self.pp_flow_transitions("exit", step_id, self.current_flow.flow_id)
 
+    async def ahandle_flow_transitions(
+        self, step_id: str, session_id: str, verbose: bool = False
+    ) -> None:
+        """Enter or exit flows without blocking the event loop.
+
+        Flow components may summarize or embed context on enter and exit, so the
+        transition is run in a worker thread.
+        """
+        if not self.flow_manager:
+            return
+        await asyncio.to_thread(self.handle_flow_transitions, step_id, session_id, verbose)
+
+    async def aexit_flow(self, exit_step: str) -> None:
+        """Exit the current flow without blocking the event loop."""
+        if not self.current_flow or not self.flow_context:
+            return
+        await asyncio.to_thread(self._exit_flow, exit_step)
+
     @staticmethod
     def pp_flow_transitions(type: str, step_id: str, flow_id: str) -> None:
         """Pretty print flow transitions for debugging with colors."""
@@ -181,6 +215,12 @@ class StateMachine:
             )
         return None
 
+    def reset(self) -> None:
+        """Return to the start step, dropping any active flow."""
+        self.current_step_id = self.start_step_id
+        self.current_flow = None
+        self.flow_context = None
+
     def load_state(self, state: Optional[State]) -> None:
         """Restore step, memory, and flow state."""
         if not state:
@@ -8,6 +8,7 @@ from pydantic import BaseModel, Field
 
 from nomos.llms import LLMBase
 from nomos.models.agent import Message
+from nomos.testing.tape import RecordedError, Tape, TapeLLM, TapeMissError
 
 
 class AssertionResult(BaseModel):
@@ -50,4 +51,11 @@ def smart_assert(result: BaseModel, expectation: str, llm: LLMBase) -> None:
         raise AssertionError(err_msg)
 
 
-__all__ = ["smart_assert", "AssertionResult"]
+__all__ = [
+    "smart_assert",
+    "AssertionResult",
+    "Tape",
+    "TapeLLM",
+    "TapeMissError",
+    "RecordedError",
+]
@@ -0,0 +1,328 @@
+"""Record and replay LLM, embedding and tool I/O for deterministic re-runs."""
+
+import gzip
+import hashlib
+import json
+import threading
+from collections import defaultdict, deque
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from pydantic import BaseModel
+
+from ..llms.base import LLMBase
+from ..models.agent import Message
+from ..models.tool import FallbackError
+
+
+class TapeMissError(KeyError):
+    """Raised in replay mode when a request was not recorded on the tape."""
+
+
+class RecordedError(Exception):
+    """An error recorded on the tape, raised again on replay."""
+
+
+def _request_key(kind: str, request: Any) -> str:  # noqa: ANN401
+    """Hash a request into a short, stable key."""
+    payload = json.dumps(request, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(f"{kind}:{payload}".encode()).hexdigest()[:24]
+
+
+def _encode_error(error: Exception) -> Dict[str, Any]:
+    """Encode an exception so it can be raised again on replay."""
+    if isinstance(error, FallbackError):
+        return {"type": "FallbackError", "error": error.error, "fallback": error.fallback}
+    return {"type": type(error).__name__, "message": str(error)}
+
+
+def _decode_error(data: Dict[str, Any]) -> Exception:
+    """Recreate a recorded exception."""
+    if data["type"] == "FallbackError":
+        return FallbackError(data["error"], data["fallback"])
+    return RecordedError(data["message"])
+
+
+class Tape:
+    """
+    Recorded request/response pairs of a conversation.
+
+    In ``record`` mode every call is performed and its result appended to the
+    tape. In ``replay`` mode results are served from the tape instead: calls
+    are matched by a hash of their request, and repeated identical requests
+    get their results in the order they were recorded.
+
+    Tapes are stored as JSON lines, gzip-compressed when the path ends in ``.gz``.
+    """
+
+    def __init__(
+        self,
+        entries: Optional[List[Dict[str, Any]]] = None,
+        mode: Literal["record", "replay"] = "record",
+    ) -> None:
+        """
+        Initialize a tape.
+
+        :param entries: Recorded entries, each with a ``kind``, ``key`` and ``value`` or ``error``.
+        :param mode: ``record`` to perform and record calls, ``replay`` to serve them from the tape.
+        """
+        self.entries: List[Dict[str, Any]] = list(entries or [])
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._pending: Dict[Tuple[str, str], Deque[Dict[str, Any]]] = defaultdict(deque)
+        for entry in self.entries:
+            self._pending[(entry["kind"], entry["key"])].append(entry)
+
+    @classmethod
+    def load(cls, path: str) -> "Tape":
+        """
+        Load a tape for replay.
+
+        :param path: Path of the tape file.
+        :return: Tape in replay mode.
+        """
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8") as f:
+            entries = [json.loads(line) for line in f if line.strip()]
+        return cls(entries, mode="replay")
+
+    def save(self, path: str) -> None:
+        """
+        Save the recorded entries.
+
+        :param path: Path of the tape file.
+        """
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "wt", encoding="utf-8") as f:
+            for entry in self.entries:
+                f.write(json.dumps(entry, default=str, separators=(",", ":")) + "\n")
+
+    def _take(self, kind: str, key: str) -> Any:  # noqa: ANN401
+        """Take the next recorded result for a request, raising recorded errors."""
+        with self._lock:
+            pending = self._pending.get((kind, key))
+            if not pending:
+                raise TapeMissError(f"No recorded {kind} call for request {key}")
+            entry = pending.popleft()
+        if "error" in entry:
+            raise _decode_error(entry["error"])
+        return entry["value"]
+
+    def _append(self, kind: str, key: str, **data: Any) -> None:
+        """Append a recorded result."""
+        with self._lock:
+            self.entries.append({"kind": kind, "key": key, **data})
+
+    def call(
+        self,
+        kind: str,
+        request: Any,  # noqa: ANN401
+        compute: Callable[[], Any],
+        encode: Callable[[Any], Any] = lambda value: value,
+        decode: Callable[[Any], Any] = lambda value: value,
+    ) -> Any:  # noqa: ANN401
+        """
+        Perform and record a call, or replay its recorded result.
+
+        :param kind: Kind of call (``llm``, ``generate``, ``embed``, ``tool``).
+        :param request: JSON-serializable description of the request.
+        :param compute: Performs the call when recording.
+        :param encode: Converts the result to JSON-serializable data.
+        :param decode: Converts recorded data back to the result.
+        :return: The result of the call.
+        """
+        key = _request_key(kind, request)
+        if self.mode == "replay":
+            return decode(self._take(kind, key))
+        try:
+            result = compute()
+        except Exception as e:
+            self._append(kind, key, error=_encode_error(e))
+            raise
+        self._append(kind, key, value=encode(result))
+        return result
+
+    async def acall(
+        self,
+        kind: str,
+        request: Any,  # noqa: ANN401
+        compute: Callable[[], Awaitable[Any]],
+        encode: Callable[[Any], Any] = lambda value: value,
+        decode: Callable[[Any], Any] = lambda value: value,
+    ) -> Any:  # noqa: ANN401
+        """Asynchronously perform and record a call, or replay its recorded result."""
+        key = _request_key(kind, request)
+        if self.mode == "replay":
+            return decode(self._take(kind, key))
+        try:
+            result = await compute()
+        except Exception as e:
+            self._append(kind, key, error=_encode_error(e))
+            raise
+        self._append(kind, key, value=encode(result))
+        return result
+
+
+def _output_request(
+    messages: List[Message], response_format: BaseModel, kwargs: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Describe a structured output request."""
+    return {
+        "messages": [message.model_dump(mode="json") for message in messages],
+        "schema": LLMBase.get_json_schema(response_format),
+        "kwargs": kwargs,
+    }
+
+
+class TapeLLM(LLMBase):
+    """LLM wrapper that records its calls on a tape or replays them from it."""
+
+    def __init__(self, llm: LLMBase, tape: Tape) -> None:
+        """
+        Wrap an LLM.
+
+        :param llm: The wrapped LLM, only called when recording.
+        :param tape: The tape to record to or replay from.
+        """
+        self.llm = llm
+        self.tape = tape
+        self.__provider__ = llm.__provider__
+
+    def __getattr__(self, name: str) -> Any:  # noqa: ANN401
+        """Delegate provider specific attributes to the wrapped LLM."""
+        if name in ("llm", "tape"):
+            raise AttributeError(name)
+        return getattr(self.llm, name)
+
+    def get_output(
+        self, messages: List[Message], response_format: BaseModel, **kwargs: dict
+    ) -> BaseModel:
+        """Get a structured response, through the tape."""
+        return self.tape.call(
+            "llm",
+            _output_request(messages, response_format, kwargs),
+            lambda: self.llm.get_output(
+                messages=messages, response_format=response_format, **kwargs
+            ),
+            encode=lambda output: output.model_dump(mode="json"),
+            decode=response_format.model_validate,
+        )
+
+    async def aget_output(
+        self, messages: List[Message], response_format: BaseModel, **kwargs: dict
+    ) -> BaseModel:
+        """Asynchronously get a structured response, through the tape."""
+        return await self.tape.acall(
+            "llm",
+            _output_request(messages, response_format, kwargs),
+            lambda: self.llm.aget_output(
+                messages=messages, response_format=response_format, **kwargs
+            ),
+            encode=lambda output: output.model_dump(mode="json"),
+            decode=response_format.model_validate,
+        )
+
+    def stream_output(
+        self, messages: List[Message], response_format: BaseModel, **kwargs: dict
+    ) -> Iterator[Union[str, BaseModel]]:
+        """Stream a structured response, through the tape. Replays yield the JSON in one chunk."""
+        request = _output_request(messages, response_format, kwargs)
+        if self.tape.mode == "replay":
+            output = self.tape.call(
+                "llm", request, lambda: None, decode=response_format.model_validate
+            )
+            yield output.model_dump_json()
+            yield output
+            return
+        chunks: List[Union[str, BaseModel]] = []
+
+        def stream() -> BaseModel:
+            for chunk in self.llm.stream_output(
+                messages=messages, response_format=response_format, **kwargs
+            ):
+                chunks.append(chunk)
+            return chunks[-1]  # type: ignore[return-value]
+
+        # Streaming is buffered while recording so the tape only holds the final output
+        self.tape.call("llm", request, stream, encode=lambda output: output.model_dump(mode="json"))
+        yield from chunks
+
+    async def astream_output(
+        self, messages: List[Message], response_format: BaseModel, **kwargs: dict
+    ) -> AsyncIterator[Union[str, BaseModel]]:
+        """Asynchronously stream a structured response, through the tape."""
+        request = _output_request(messages, response_format, kwargs)
+        if self.tape.mode == "replay":
+            output = self.tape.call(
+                "llm", request, lambda: None, decode=response_format.model_validate
+            )
+            yield output.model_dump_json()
+            yield output
+            return
+        chunks: List[Union[str, BaseModel]] = []
+
+        async def stream() -> BaseModel:
+            async for chunk in self.llm.astream_output(
+                messages=messages, response_format=response_format, **kwargs
+            ):
+                chunks.append(chunk)
+            return chunks[-1]  # type: ignore[return-value]
+
+        await self.tape.acall(
+            "llm", request, stream, encode=lambda output: output.model_dump(mode="json")
+        )
+        for chunk in chunks:
+            yield chunk
+
+    def generate(self, messages: List[Message], **kwargs: dict) -> str:
+        """Generate a response, through the tape."""
+        request = {"messages": [m.model_dump(mode="json") for m in messages], "kwargs": kwargs}
+        return self.tape.call(
+            "generate", request, lambda: self.llm.generate(messages=messages, **kwargs)
+        )
+
+    async def agenerate(self, messages: List[Message], **kwargs: dict) -> str:
+        """Asynchronously generate a response, through the tape."""
+        request = {"messages": [m.model_dump(mode="json") for m in messages], "kwargs": kwargs}
+        return await self.tape.acall(
+            "generate", request, lambda: self.llm.agenerate(messages=messages, **kwargs)
+        )
+
+    def embed_text(self, text: str) -> List[float]:
+        """Embed a text, through the tape."""
+        return self.tape.call("embed", [text], lambda: [self.llm.embed_text(text)])[0]
+
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embed a batch of texts, through the tape."""
+        return self.tape.call("embed", list(texts), lambda: self.llm.embed_batch(texts))
+
+    async def aembed_text(self, text: str) -> List[float]:
+        """Asynchronously embed a text, through the tape."""
+
+        async def embed() -> List[List[float]]:
+            return [await self.llm.aembed_text(text)]
+
+        return (await self.tape.acall("embed", [text], embed))[0]
+
+    async def aembed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Asynchronously embed a batch of texts, through the tape."""
+        return await self.tape.acall("embed", list(texts), lambda: self.llm.aembed_batch(texts))
+
+    def token_counter(self, text: str) -> int:
+        """Count tokens with the wrapped LLM."""
+        return self.llm.token_counter(text)
+
+
+__all__ = ["Tape", "TapeLLM", "TapeMissError", "RecordedError"]
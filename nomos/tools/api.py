@@ -3,6 +3,7 @@
 import re
 from typing import Dict, List, Optional
 
+import httpx
 import requests
 from pydantic import BaseModel
 
@@ -21,6 +22,20 @@ class APITool(BaseModel):
 
     def run(self, **kwargs) -> str:
         """Run the API tool."""
+        response = requests.request(**self._request(kwargs))
+        response.raise_for_status()
+        return response.text
+
+    async def arun(self, **kwargs) -> str:
+        """Asynchronously run the API tool."""
+        request = self._request(kwargs)
+        async with httpx.AsyncClient() as client:
+            response = await client.request(**request)
+        response.raise_for_status()
+        return response.text
+
+    def _request(self, kwargs: dict) -> dict:
+        """Build the request arguments from the tool arguments."""
         body = kwargs.pop("body", None)
         headers = self.headers or {}
         if body is not None:
@@ -33,15 +48,13 @@ class APITool(BaseModel):
                 del kwargs[param]
             else:
                 raise ValueError(f"Missing required parameter: {param}")
-        response = requests.request(
-            method=self.method,
-            url=url_copy,
-            json=body,
-            headers=headers,
-            params=kwargs,
-        )
-        response.raise_for_status()
-        return response.text
+        return {
+            "method": self.method,
+            "url": url_copy,
+            "json": body,
+            "headers": headers,
+            "params": kwargs,
+        }
 
 
 class APIWrapper(BaseModel):
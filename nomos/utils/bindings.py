@@ -0,0 +1,95 @@
+"""Resolution of step tool argument bindings."""
+
+import ast
+import json
+from typing import Any, Dict, List, Union
+
+from ..models.agent import Event, StepIdentifier, Summary
+
+TOOL_RESULTS_MARKER = "\nResults: "
+
+
+class UnresolvedBinding(KeyError):
+    """Raised when a binding refers to a value that is not available."""
+
+
+def parse_output(output: str) -> Any:  # noqa: ANN401
+    """
+    Parse a tool output string back to a value, if possible.
+
+    :param output: Tool output, as recorded in the history.
+    :return: The JSON or Python literal value, or the string itself.
+    """
+    try:
+        return json.loads(output)
+    except ValueError:
+        pass
+    try:
+        return ast.literal_eval(output)
+    except (ValueError, SyntaxError):
+        return output
+
+
+def _last_tool_output(tool_name: str, history: List[Union[Event, StepIdentifier, Summary]]) -> str:
+    """Find the output of the latest successful call of a tool in the history."""
+    prefix = f"Tool {tool_name} executed successfully"
+    for item in reversed(history):
+        if isinstance(item, Event) and item.type == "tool" and item.content.startswith(prefix):
+            _, found, output = item.content.partition(TOOL_RESULTS_MARKER)
+            if found:
+                return output
+    raise UnresolvedBinding(f"No output of tool '{tool_name}' in the history")
+
+
+def _last_user_input(history: List[Union[Event, StepIdentifier, Summary]]) -> str:
+    """Find the latest user input in the history."""
+    for item in reversed(history):
+        if isinstance(item, Event) and item.type == "user":
+            return item.content
+    raise UnresolvedBinding("No user input in the history")
+
+
+def _select(value: Any, path: List[str], expression: str) -> Any:  # noqa: ANN401
+    """Follow a path of keys and list indexes into a value."""
+    for key in path:
+        try:
+            value = value[int(key)] if isinstance(value, (list, tuple)) else value[key]
+        except (KeyError, IndexError, TypeError, ValueError):
+            raise UnresolvedBinding(f"'{expression}' not found")
+    return value
+
+
+def resolve_binding(
+    expression: Any,  # noqa: ANN401
+    history: List[Union[Event, StepIdentifier, Summary]],
+    state: Dict[str, Any],
+) -> Any:  # noqa: ANN401
+    """
+    Resolve a single argument binding.
+
+    References start with ``$``; anything else is used as a literal value:
+
+    - ``$input``: the latest user input.
+    - ``$tools.<tool>``: the latest output of a tool, ``$tools.<tool>.<key>...`` a field of it.
+    - ``$state.<key>...``: a value of the flow state (``flow_id`` and flow context metadata).
+
+    :param expression: The binding.
+    :param history: Conversation history to look up user inputs and tool outputs in.
+    :param state: Current flow state values.
+    :return: The bound value.
+    :raises UnresolvedBinding: If the referenced value is not available.
+    """
+    if not isinstance(expression, str) or not expression.startswith("$"):
+        return expression
+    source, *path = expression[1:].split(".")
+    if source == "input" and not path:
+        return _last_user_input(history)
+    if source == "tools" and path:
+        output = _last_tool_output(path[0], history)
+        return _select(parse_output(output), path[1:], expression) if path[1:] else output
+    if source == "state" and path:
+        return _select(state, path, expression)
+    raise ValueError(f"Invalid binding '{expression}'")
+
+
+__all__ = ["resolve_binding", "parse_output", "UnresolvedBinding"]
@@ -0,0 +1,69 @@
+"""Thread pool shared by the sessions of an agent."""
+
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+
+class SharedExecutor:
+    """
+    Thread pool created on first use and shared by every session of an agent.
+
+    Forked processes (such as :class:`~nomos.pool.AgentPool` workers) inherit
+    a copy without its threads, so each process creates its own pool. The pool
+    is left out when pickled.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, name: str = "nomos") -> None:
+        """
+        Initialize the executor.
+
+        :param max_workers: Maximum number of threads. Defaults to the ThreadPoolExecutor default.
+        :param name: Prefix of the names of the threads.
+        """
+        self.max_workers = max_workers
+        self.name = name
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Pickle the settings only; the pool is created again on first use."""
+        return {"max_workers": self.max_workers, "name": self.name}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Restore the executor without a pool."""
+        self.__init__(state["max_workers"], state["name"])
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        """Get the pool of the current process, creating it if needed."""
+        with self._lock:
+            if self._pool is None or self._pid != os.getpid():
+                self._pool = ThreadPoolExecutor(self.max_workers, thread_name_prefix=self.name)
+                self._pid = os.getpid()
+            return self._pool
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:  # noqa: ANN401
+        """
+        Run a function on the pool.
+
+        :param fn: The function.
+        :param args: Its arguments.
+        :return: Future of its result.
+        """
+        return self._get_pool().submit(fn, *args)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop the pool's threads. A later submit creates a new pool.
+
+        :param wait: Wait for running calls to finish.
+        """
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None and self._pid == os.getpid():
+            pool.shutdown(wait=wait)
+
+
+__all__ = ["SharedExecutor"]
@@ -81,14 +81,12 @@ def pp_response(response: "Response") -> None:
         console.print(Panel(content, style="blue", expand=False))
 
     elif decision.action == Action.TOOL_CALL and decision.tool_call:
-        tool_args = decision.tool_call.tool_kwargs.model_dump_json()
-        if len(tool_args) > 100:
-            tool_args = tool_args[:97] + "..."
-        content = (
-            f"[bold magenta]Running Tool:[/bold magenta]\n"
-            f"Tool: [bold]{decision.tool_call.tool_name}[/bold]\n"
-            f"Args: {tool_args}"
-        )
+        content = "[bold magenta]Running Tool:[/bold magenta]"
+        for tool_call in decision.tool_calls or [decision.tool_call]:
+            tool_args = tool_call.tool_kwargs.model_dump_json()
+            if len(tool_args) > 100:
+                tool_args = tool_args[:97] + "..."
+            content += f"\nTool: [bold]{tool_call.tool_name}[/bold]\nArgs: {tool_args}"
         console.print(Panel(content, style="magenta", expand=False))
 
     elif decision.action == Action.MOVE:
@@ -0,0 +1,142 @@
+"""Per-turn timing and token accounting."""
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Iterator, Optional, TypeVar
+
+from ..models.agent import TurnMetrics
+
+T = TypeVar("T")
+
+_current_metrics: ContextVar[Optional[TurnMetrics]] = ContextVar("nomos_turn_metrics", default=None)
+# Effects of a timed out turn may still be running in an abandoned thread
+_lock = threading.Lock()
+
+
+def _add_time(metrics: TurnMetrics, stage: str, seconds: float) -> None:
+    """Add wall time to a stage of the given metrics."""
+    with _lock:
+        metrics.timings[stage] = metrics.timings.get(stage, 0.0) + seconds
+
+
+@contextmanager
+def collect(metrics: Optional[TurnMetrics]) -> Iterator[None]:
+    """
+    Record timings and token usage of the enclosed code in the given metrics.
+
+    :param metrics: Metrics of the running turn, or None to record nothing.
+    """
+    token = _current_metrics.set(metrics)
+    try:
+        yield
+    finally:
+        _current_metrics.reset(token)
+
+
+@contextmanager
+def timed(stage: str) -> Iterator[None]:
+    """
+    Add the wall time of the enclosed code to a stage of the current turn.
+
+    :param stage: Name of the stage (e.g. ``llm``, ``tool``).
+    """
+    metrics = _current_metrics.get()
+    if metrics is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _add_time(metrics, stage, time.perf_counter() - start)
+
+
+def timed_iter(metrics: Optional[TurnMetrics], stage: str, iterator: Iterator[T]) -> Iterator[T]:
+    """
+    Iterate, adding the time spent producing items to a stage.
+
+    Time spent by the consumer between items is not counted.
+
+    :param metrics: Metrics of the running turn, or None to record nothing.
+    :param stage: Name of the stage.
+    :param iterator: The iterator to time.
+    :return: Iterator over the same items.
+    """
+    if metrics is None:
+        yield from iterator
+        return
+    iterator = iter(iterator)
+    elapsed = 0.0
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                with collect(metrics):
+                    item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                elapsed += time.perf_counter() - start
+            yield item
+    finally:
+        _add_time(metrics, stage, elapsed)
+
+
+async def atimed_iter(
+    metrics: Optional[TurnMetrics], stage: str, iterator: AsyncIterator[T]
+) -> AsyncIterator[T]:
+    """Asynchronously iterate, adding the time spent producing items to a stage."""
+    if metrics is None:
+        async for item in iterator:
+            yield item
+        return
+    iterator = iterator.__aiter__()
+    elapsed = 0.0
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                with collect(metrics):
+                    item = await iterator.__anext__()
+            except StopAsyncIteration:
+                return
+            finally:
+                elapsed += time.perf_counter() - start
+            yield item
+    finally:
+        _add_time(metrics, stage, elapsed)
+
+
+def record_usage(
+    prompt_tokens: Optional[int],
+    completion_tokens: Optional[int],
+    cached_tokens: Optional[int] = None,
+) -> None:
+    """
+    Add provider reported token usage to the current turn.
+
+    :param prompt_tokens: Input tokens of the request, including cached ones.
+    :param completion_tokens: Output tokens of the request.
+    :param cached_tokens: Input tokens read from the provider's prompt cache.
+    """
+    metrics = _current_metrics.get()
+    if metrics is None:
+        return
+    with _lock:
+        metrics.prompt_tokens += prompt_tokens or 0
+        metrics.completion_tokens += completion_tokens or 0
+        metrics.cached_tokens += cached_tokens or 0
+
+
+def record_cache_hit() -> None:
+    """Count a decision served from a cache in the current turn."""
+    metrics = _current_metrics.get()
+    if metrics is None:
+        return
+    with _lock:
+        metrics.cache_hits += 1
+
+
+__all__ = ["collect", "timed", "timed_iter", "atimed_iter", "record_usage", "record_cache_hit"]
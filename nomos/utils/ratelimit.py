@@ -0,0 +1,63 @@
+"""Client-side rate limiting for provider calls."""
+
+import asyncio
+import threading
+import time
+
+
+class RateLimiter:
+    """
+    Space out calls to stay under a number of calls per minute.
+
+    The limiter is shared by threads and event loops alike: each caller
+    reserves the next free slot under a lock and then waits for it, blocking
+    with :meth:`acquire` or asynchronously with :meth:`aacquire`.
+    """
+
+    def __init__(self, per_minute: float) -> None:
+        """
+        Initialize the rate limiter.
+
+        :param per_minute: Maximum number of calls per minute.
+        """
+        if per_minute <= 0:
+            raise ValueError("per_minute must be positive")
+        self.interval = 60.0 / per_minute
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def per_minute(self) -> float:
+        """Maximum number of calls per minute."""
+        return 60.0 / self.interval
+
+    def split(self, parts: int) -> None:
+        """
+        Keep an equal share of the limit, for one of several processes calling the same provider.
+
+        :param parts: Number of processes sharing the limit.
+        """
+        self.interval *= parts
+
+    def _reserve(self) -> float:
+        """Reserve the next slot and return the seconds to wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+            return start - now
+
+    def acquire(self) -> None:
+        """Block until a call may be made."""
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def aacquire(self) -> None:
+        """Wait until a call may be made without blocking the event loop."""
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+__all__ = ["RateLimiter"]
@@ -0,0 +1,201 @@
+"""Local repair of invalid decisions, saving an LLM retry round-trip."""
+
+import json
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+from ..models.agent import Action, Decision, Step, ToolCall
+from ..models.tool import Tool
+from ..tools.models import ToolDef
+
+
+@dataclass
+class RepairContext:
+    """What a repairer may use to fix a decision."""
+
+    step: Step  # Current step
+    routes: List[str]  # Step ids a MOVE may target
+    tools: Dict[str, Tool]  # Tools available in the step
+    error: str  # Why the decision is invalid
+    tool_defs: Dict[str, ToolDef] = field(default_factory=dict)  # Configured tool definitions
+
+
+# A repairer returns a fixed copy of the decision, or None if it cannot fix it
+DecisionRepairer = Callable[[Decision, RepairContext], Optional[Decision]]
+
+
+def _tool_defaults(tool_name: str, context: RepairContext) -> Dict[str, Any]:
+    """Get the argument defaults configured for a tool."""
+    tool_def = context.tool_defs.get(tool_name)
+    if not tool_def:
+        return {}
+    return {arg.key: arg.default for arg in tool_def.args if arg.default is not None}
+
+
+def _coerce(value: Any, annotation: Any) -> Any:  # noqa: ANN401
+    """Convert a value to the annotated type, raising ValueError if no conversion fits."""
+    candidates = []
+    if isinstance(value, str):
+        try:
+            candidates.append(json.loads(value))
+        except ValueError:
+            pass
+        candidates.append(value.strip())
+    elif isinstance(value, (int, float, bool)):
+        candidates.append(str(value))
+    if isinstance(value, list) and len(value) == 1:
+        candidates.append(value[0])
+    elif not isinstance(value, list):
+        candidates.append([value])
+    adapter = TypeAdapter(annotation)
+    for candidate in candidates:
+        try:
+            return adapter.validate_python(candidate)
+        except ValidationError:
+            continue
+    raise ValueError(f"Cannot convert {value!r} to {annotation}")
+
+
+def fix_tool_args(
+    tool: Tool, kwargs: Dict[str, Any], defaults: Dict[str, Any]
+) -> Optional[BaseModel]:
+    """
+    Make tool arguments valid by filling in defaults and coercing types.
+
+    :param tool: The tool to call.
+    :param kwargs: Arguments as decided by the LLM.
+    :param defaults: Default values of arguments the LLM left out.
+    :return: The validated arguments, or None if they cannot be fixed.
+    """
+    args_model = tool.get_args_model()
+    args = {key: value for key, value in kwargs.items() if key in args_model.model_fields}
+    for key, value in defaults.items():
+        if args.get(key) is None:
+            args[key] = value
+    try:
+        return args_model.model_validate(args)
+    except ValidationError as e:
+        errors = e.errors()
+    for error in errors:
+        key = error["loc"][0] if error["loc"] else None
+        if key not in args:
+            return None
+        try:
+            args[key] = _coerce(args[key], args_model.model_fields[key].annotation)
+        except ValueError:
+            return None
+    try:
+        return args_model.model_validate(args)
+    except ValidationError:
+        return None
+
+
+def repair_move_target(decision: Decision, context: RepairContext) -> Optional[Decision]:
+    """Fill in the target of a MOVE when only one step can be moved to."""
+    if decision.action != Action.MOVE or decision.step_id is not None:
+        return None
+    if len(context.routes) != 1:
+        return None
+    return decision.model_copy(update={"step_id": context.routes[0]})
+
+
+def repair_action(decision: Decision, context: RepairContext) -> Optional[Decision]:
+    """
+    Switch the action when the decision carries the payload of exactly one other action.
+
+    Only switches to RESPOND or MOVE: a tool the model did not choose to call
+    is never run, since it may have side effects.
+    """
+    payloads = {
+        Action.RESPOND: decision.response is not None and not context.step.auto_flow,
+        Action.MOVE: decision.step_id in context.routes,
+        Action.TOOL_CALL: bool(
+            decision.tool_call and decision.tool_call.tool_name in context.tools
+        ),
+    }
+    if decision.action not in payloads or payloads[decision.action]:
+        return None
+    actions = [action for action, present in payloads.items() if present]
+    if len(actions) != 1 or actions[0] == Action.TOOL_CALL:
+        return None
+    return decision.model_copy(update={"action": actions[0]})
+
+
+def repair_tool_call(decision: Decision, context: RepairContext) -> Optional[Decision]:
+    """Fill in a missing tool call when the step has one tool and its arguments all have defaults."""
+    if decision.action != Action.TOOL_CALL or decision.tool_call is not None:
+        return None
+    if len(context.tools) != 1:
+        return None
+    tool = next(iter(context.tools.values()))
+    args = fix_tool_args(tool, {}, _tool_defaults(tool.name, context))
+    if args is None:
+        return None
+    return decision.model_copy(
+        update={"tool_call": ToolCall(tool_name=tool.name, tool_kwargs=args)}
+    )
+
+
+def repair_tool_args(decision: Decision, context: RepairContext) -> Optional[Decision]:
+    """Fill in configured defaults and coerce argument types of invalid tool calls."""
+    if decision.action != Action.TOOL_CALL or decision.tool_call is None:
+        return None
+    calls = decision.tool_calls or [decision.tool_call]
+    fixed = []
+    for call in calls:
+        tool = context.tools.get(call.tool_name)
+        if tool is None:
+            return None
+        if isinstance(call.tool_kwargs, tool.get_args_model()):
+            fixed.append(call)
+            continue
+        args = fix_tool_args(
+            tool, call.tool_kwargs.model_dump(), _tool_defaults(call.tool_name, context)
+        )
+        if args is None:
+            return None
+        fixed.append(ToolCall(tool_name=call.tool_name, tool_kwargs=args))
+    return decision.model_copy(
+        update={"tool_call": fixed[0], "tool_calls": fixed if decision.tool_calls else None}
+    )
+
+
+DEFAULT_REPAIRERS: List[DecisionRepairer] = [
+    repair_move_target,
+    repair_action,
+    repair_tool_call,
+    repair_tool_args,
+]
+
+
+def repair_decision(
+    decision: Decision, context: RepairContext, repairers: List[DecisionRepairer]
+) -> Optional[Decision]:
+    """
+    Try the repairers in order and return the first repaired decision.
+
+    :param decision: The invalid decision.
+    :param context: What the repairers may use.
+    :param repairers: Repairers to try.
+    :return: The repaired decision, or None if no repairer could fix it.
+    """
+    for repairer in repairers:
+        repaired = repairer(decision, context)
+        if repaired is not None:
+            return repaired
+    return None
+
+
+__all__ = [
+    "RepairContext",
+    "DecisionRepairer",
+    "DEFAULT_REPAIRERS",
+    "repair_decision",
+    "fix_tool_args",
+    "repair_move_target",
+    "repair_action",
+    "repair_tool_call",
+    "repair_tool_args",
+]
@@ -0,0 +1,93 @@
+"""Helpers for streaming decisions as they are generated."""
+
+import json
+import re
+from typing import Optional, Tuple
+
+_ACTION_RE = re.compile(r'"action"\s*:\s*"([A-Za-z_]+)"')
+_RESPONSE_RE = re.compile(r'"response"\s*:\s*"')
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+
+def decode_partial_json_string(raw: str) -> Tuple[str, bool]:
+    """
+    Decode the body of a JSON string that may still be incomplete.
+
+    Escape sequences cut off at the end of ``raw`` are held back until more
+    input arrives.
+
+    :param raw: Characters following the opening quote of a JSON string.
+    :return: The decoded prefix and whether the closing quote was reached.
+    """
+    out = []
+    i = 0
+    while i < len(raw):
+        ch = raw[i]
+        if ch == '"':
+            return "".join(out), True
+        if ch != "\\":
+            out.append(ch)
+            i += 1
+            continue
+        if i + 1 >= len(raw):
+            break
+        esc = raw[i + 1]
+        if esc == "u":
+            if i + 6 > len(raw):
+                break
+            code = raw[i + 2 : i + 6]
+            # Surrogate pairs are decoded together
+            if 0xD800 <= int(code, 16) <= 0xDBFF:
+                if i + 12 > len(raw):
+                    break
+                out.append(json.loads(f'"{raw[i : i + 12]}"'))
+                i += 12
+            else:
+                out.append(chr(int(code, 16)))
+                i += 6
+            continue
+        out.append(_ESCAPES.get(esc, esc))
+        i += 2
+    return "".join(out), False
+
+
+class ResponseStreamParser:
+    """
+    Incrementally extract the ``response`` text of a RESPOND decision from streamed JSON.
+
+    Feed raw JSON chunks as the provider produces them; ``feed`` returns the
+    newly available response text once the decision's action is known to be
+    RESPOND. Structured (non-string) responses are not streamed.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the parser."""
+        self.buffer = ""
+        self.action: Optional[str] = None
+        self.emitted = 0
+
+    def feed(self, chunk: str) -> str:
+        """
+        Add a chunk of raw JSON.
+
+        :param chunk: The next chunk of the streamed decision.
+        :return: Response text that has not been returned before (may be empty).
+        """
+        self.buffer += chunk
+        if self.action is None:
+            match = _ACTION_RE.search(self.buffer)
+            if not match:
+                return ""
+            self.action = match.group(1).upper()
+        if self.action != "RESPOND":
+            return ""
+        match = _RESPONSE_RE.search(self.buffer)
+        if not match:
+            return ""
+        text, _ = decode_partial_json_string(self.buffer[match.end() :])
+        delta = text[self.emitted :]
+        self.emitted = len(text)
+        return delta
+
+
+__all__ = ["ResponseStreamParser", "decode_partial_json_string"]
@@ -66,6 +66,14 @@ class MockLLM(LLMBase):
         )
         return response
 
+    def stream_output(self, messages: List[Message], response_format: BaseModel, **kwargs: dict):
+        """Stream the JSON of the next pre-set response in small chunks, then the response."""
+        response = self.get_output(messages, response_format, **kwargs)
+        raw = response.model_dump_json()
+        for i in range(0, len(raw), 4):
+            yield raw[i : i + 4]
+        yield response
+
     def embed_text(self, text: str) -> List[float]:
         """Return a simple letter frequency embedding for the given text."""
         vector = [0.0] * 26
@@ -1,5 +1,6 @@
 """Tests for the API endpoints and functionality."""
 
+import asyncio
 import os
 import shutil
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -7,9 +8,10 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 from fastapi.testclient import TestClient
 
+from nomos.answers import AnswerCache
 from nomos.api.models import ChatRequest, ChatResponse, Message, SessionResponse
 from nomos.core import Session as AgentSession
-from nomos.models.agent import Event, State
+from nomos.models.agent import Action, Decision, Event, State, TurnMetrics
 
 # Set dummy environment variables to avoid OpenAI API key requirement
 os.environ.setdefault("OPENAI_API_KEY", "test-key")
@@ -60,7 +62,7 @@ def mock_agent_session():
     session = MagicMock(spec=AgentSession)
     session.session_id = "test_session_123"
 
-    # Mock response for session.next()
+    # Mock response for session.anext()
     mock_response = MagicMock()
     mock_decision = MagicMock()
     mock_decision.model_dump.return_value = {
@@ -69,7 +71,8 @@ def mock_agent_session():
         "step_id": "start",
     }
     mock_response.decision = mock_decision
-    session.next.return_value = mock_response
+    mock_response.metrics = None
+    session.anext.return_value = mock_response
 
     # Mock session state
     session.get_state.return_value = State(
@@ -147,8 +150,8 @@ class TestSessionEndpoints:
         assert data["session_id"] == session_id
         assert "message" in data
 
-        # Verify session.next was called with the message
-        mock_agent_session.next.assert_called_once_with("Hello, how are you?")
+        # Verify session.anext was called with the message
+        mock_agent_session.anext.assert_called_once_with("Hello, how are you?")
 
     @patch("nomos.api.app.session_store")
     def test_send_message_to_nonexistent_session(self, mock_store, client):
@@ -218,8 +221,9 @@ class TestChatEndpoint:
     @patch("nomos.api.app.agent")
     def test_chat_new_session(self, mock_agent, client, mock_agent_session):
         """Test chat endpoint with new session (no session_data)."""
-        # Mock the agent.next() method response
+        # Mock the agent.anext() method response
         mock_result = MagicMock()
+        mock_result.metrics = None
         mock_result.decision.model_dump.return_value = {
             "action": "respond",
             "response": "Hello! How can I help you today?",
@@ -232,7 +236,7 @@ class TestChatEndpoint:
             history=[Event(type="user", content="Hello there!")],
             flow_state=None,
         )
-        mock_agent.next.return_value = mock_result
+        mock_agent.anext = AsyncMock(return_value=mock_result)
 
         chat_data = {"user_input": "Hello there!", "session_data": None}
 
@@ -247,8 +251,9 @@ class TestChatEndpoint:
     @patch("nomos.api.app.agent")
     def test_chat_existing_session(self, mock_agent, client, mock_agent_session):
         """Test chat endpoint with existing session data."""
-        # Mock the agent.next() method response
+        # Mock the agent.anext() method response
         mock_result = MagicMock()
+        mock_result.metrics = None
         mock_result.decision.model_dump.return_value = {
             "action": "respond",
             "response": "I can help with that follow-up",
@@ -264,7 +269,7 @@ class TestChatEndpoint:
             ],
             flow_state=None,
         )
-        mock_agent.next.return_value = mock_result
+        mock_agent.anext = AsyncMock(return_value=mock_result)
 
         existing_session_data = {
             "session_id": "existing_session",
@@ -285,13 +290,14 @@ class TestChatEndpoint:
         assert "session_data" in data
 
         # Verify the session was handled
-        mock_agent.next.assert_called_once()
+        mock_agent.anext.assert_called_once()
 
     @patch("nomos.api.app.agent")
     def test_chat_no_user_input(self, mock_agent, client, mock_agent_session):
         """Test chat endpoint without user input (session initialization)."""
-        # Mock the agent.next() method response
+        # Mock the agent.anext() method response
         mock_result = MagicMock()
+        mock_result.metrics = None
         mock_result.decision.model_dump.return_value = {
             "action": "initialize",
             "response": "Session initialized",
@@ -301,7 +307,7 @@ class TestChatEndpoint:
         mock_result.state = State(
             session_id="new_session_123", current_step_id="start", history=[], flow_state=None
         )
-        mock_agent.next.return_value = mock_result
+        mock_agent.anext = AsyncMock(return_value=mock_result)
 
         chat_data = {"user_input": None, "session_data": None}
 
@@ -312,6 +318,115 @@ class TestChatEndpoint:
         assert "response" in data
         assert "session_data" in data
 
+    @patch("nomos.api.app.agent")
+    def test_chat_timeout_overrides_turn_budget(self, mock_agent, client):
+        """Test that a per-request timeout is passed to the agent as the turn's deadline."""
+        mock_result = MagicMock()
+        mock_result.metrics = None
+        mock_result.decision.model_dump.return_value = {"action": "RESPOND", "response": "Hi"}
+        mock_result.tool_output = None
+        mock_result.state = State(session_id="s1", current_step_id="start", history=[])
+        mock_agent.anext = AsyncMock(return_value=mock_result)
+
+        response = client.post("/chat", json={"user_input": "Hi", "timeout": 2.5})
+
+        assert response.status_code == 200
+        kwargs = mock_agent.anext.call_args.kwargs
+        assert "timeout" not in kwargs
+        assert kwargs["budget"].timeout == 2.5
+
+    @patch("nomos.api.app.agent")
+    def test_chat_timeout_capped_by_server(self, mock_agent, client):
+        """Test that a per-request timeout cannot extend the configured turn deadline."""
+        from nomos.api.app import config
+
+        mock_result = MagicMock()
+        mock_result.metrics = None
+        mock_result.decision.model_dump.return_value = {"action": "RESPOND", "response": "Hi"}
+        mock_result.tool_output = None
+        mock_result.state = State(session_id="s1", current_step_id="start", history=[])
+        mock_agent.anext = AsyncMock(return_value=mock_result)
+
+        with patch.object(config.turn_budget, "timeout", 10.0):
+            client.post("/chat", json={"user_input": "Hi", "timeout": 3600})
+            assert mock_agent.anext.call_args.kwargs["budget"].timeout == 10.0
+            client.post("/chat", json={"user_input": "Hi", "timeout": 2.5})
+            assert mock_agent.anext.call_args.kwargs["budget"].timeout == 2.5
+
+    @patch("nomos.api.app.agent")
+    def test_chat_server_timing_header(self, mock_agent, client):
+        """Test that stage timings of the turn are returned as a Server-Timing header."""
+        mock_result = MagicMock()
+        mock_result.metrics = TurnMetrics(timings={"llm": 0.8125, "tool": 0.035})
+        mock_result.decision.model_dump.return_value = {"action": "RESPOND", "response": "Hi"}
+        mock_result.tool_output = None
+        mock_result.state = State(session_id="s1", current_step_id="start", history=[])
+        mock_agent.anext = AsyncMock(return_value=mock_result)
+
+        response = client.post("/chat", json={"user_input": "Hi"})
+
+        assert response.status_code == 200
+        assert response.headers["Server-Timing"] == "llm;dur=812.5, tool;dur=35.0"
+
+    @patch("nomos.api.app.agent_pool")
+    def test_chat_runs_in_agent_pool(self, mock_pool, client):
+        """Test that the raw request is handed to a pool worker and its JSON returned as is."""
+        from nomos.api.app import run_chat_turn
+
+        body = b'{"response":{"action":"END"},"tool_output":null,"session_data":{}}'
+        mock_pool.arun = AsyncMock(return_value=(body, "llm;dur=1.0"))
+
+        response = client.post("/chat", json={"user_input": "Hi"})
+
+        assert response.status_code == 200
+        assert response.content == body
+        assert response.headers["Server-Timing"] == "llm;dur=1.0"
+        fn, raw, verbose = mock_pool.arun.call_args.args
+        assert fn is run_chat_turn
+        assert ChatRequest.model_validate_json(raw).user_input == "Hi"
+
+    def test_run_chat_turn(self):
+        """Test the turn run by pool workers."""
+        from nomos.api.app import run_chat_turn
+
+        agent = MagicMock()
+        agent.next.return_value.metrics = TurnMetrics(timings={"llm": 0.5})
+        agent.next.return_value.decision.model_dump.return_value = {"action": "END"}
+        agent.next.return_value.tool_output = None
+        agent.next.return_value.state = State(session_id="s1", current_step_id="start")
+
+        content, server_timing = run_chat_turn(agent, b'{"user_input": "Bye"}', False)
+
+        assert agent.next.call_args.kwargs["user_input"] == "Bye"
+        assert ChatResponse.model_validate_json(content).session_data.session_id == "s1"
+        assert server_timing == "llm;dur=500.0"
+
+    @pytest.mark.asyncio
+    async def test_turn_cancelled_on_disconnect(self, monkeypatch):
+        """Test that in-flight work is cancelled when the client disconnects."""
+        from fastapi import HTTPException
+
+        from nomos.api import app as app_module
+
+        monkeypatch.setattr(app_module, "DISCONNECT_POLL_INTERVAL", 0.01)
+        cancelled = asyncio.Event()
+
+        async def slow_turn():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        request = MagicMock()
+        request.is_disconnected = AsyncMock(return_value=True)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await app_module.run_until_disconnected(request, slow_turn())
+
+        assert exc_info.value.status_code == 499
+        await asyncio.wait_for(cancelled.wait(), 1)
+
 
 # class TestConfigEndpoint:
 #     """Test configuration endpoints."""
@@ -328,6 +443,89 @@ class TestChatEndpoint:
 #         assert data["metadata"]["name"] == "test_agent"
 
 
+class TestAnswerEndpoints:
+    """Test the admin endpoints of the answer cache."""
+
+    @pytest.fixture
+    def client(self):
+        """Create a test client sending the admin key."""
+        from nomos.api.app import config
+
+        with patch.object(config.server.security, "admin_api_key", "admin-secret"):
+            yield TestClient(app, headers={"X-Admin-Key": "admin-secret"})
+
+    @staticmethod
+    def _cache():
+        cache = AnswerCache()
+        decision = Decision(reasoning=[], action=Action.RESPOND, response="9 to 5")
+        pending = cache.add("faq", "Opening hours?", [1.0, 0.0], decision)
+        approved = cache.add("other", "Delivery?", [0.0, 1.0], decision, approved=True)
+        return cache, pending, approved
+
+    @patch("nomos.api.app.agent")
+    def test_list_and_approve(self, mock_agent, client):
+        """Test listing answers and approving a pending one."""
+        mock_agent.answer_cache, pending, _ = self._cache()
+
+        response = client.get("/answers", params={"approved": False})
+        assert response.status_code == 200
+        assert [a["answer_id"] for a in response.json()["answers"]] == [pending.answer_id]
+
+        assert client.post(f"/answers/{pending.answer_id}/approve").status_code == 200
+        assert pending.approved
+        assert client.post("/answers/missing/approve").status_code == 404
+
+    @patch("nomos.api.app.agent")
+    def test_invalidate(self, mock_agent, client):
+        """Test removing answers by ID and by step."""
+        cache, pending, approved = self._cache()
+        mock_agent.answer_cache = cache
+
+        assert client.delete(f"/answers/{pending.answer_id}").json() == {"removed": 1}
+        assert client.delete(f"/answers/{pending.answer_id}").status_code == 404
+        assert client.delete("/answers", params={"step_id": "other"}).json() == {"removed": 1}
+        assert len(cache) == 0
+
+    @patch("nomos.api.app.agent_pool", new=MagicMock())
+    @patch("nomos.api.app.agent")
+    def test_process_workers_require_file(self, mock_agent, client, tmp_path):
+        """Test that with process workers only an answer cache stored in a file is reviewed."""
+        mock_agent.answer_cache, pending, _ = self._cache()
+        assert client.post(f"/answers/{pending.answer_id}/approve").status_code == 409
+
+        mock_agent.answer_cache = AnswerCache(path=str(tmp_path / "answers.db"))
+        assert client.get("/answers").status_code == 200
+
+    @patch("nomos.api.app.agent")
+    def test_admin_key_required(self, mock_agent, client):
+        """Test that chat credentials do not grant access to the admin endpoints."""
+        mock_agent.answer_cache, pending, _ = self._cache()
+
+        for headers in ({}, {"X-Admin-Key": "wrong"}, {"Authorization": "Bearer admin-secret"}):
+            chat_client = TestClient(app, headers=headers)
+            assert chat_client.post(f"/answers/{pending.answer_id}/approve").status_code == 401
+            assert chat_client.delete("/answers").status_code == 401
+        assert not pending.approved
+        assert len(mock_agent.answer_cache) == 2
+
+    @patch("nomos.api.app.agent")
+    def test_disabled_without_admin_key(self, mock_agent):
+        """Test that the endpoints are not served unless an admin key is configured."""
+        mock_agent.answer_cache, pending, _ = self._cache()
+        client = TestClient(app, headers={"X-Admin-Key": ""})
+
+        assert client.get("/answers").status_code == 404
+        assert client.post(f"/answers/{pending.answer_id}/approve").status_code == 404
+        assert not pending.approved
+
+    @patch("nomos.api.app.agent")
+    def test_not_configured(self, mock_agent, client):
+        """Test that the endpoints report a missing answer cache."""
+        mock_agent.answer_cache = None
+
+        assert client.get("/answers").status_code == 404
+
+
 class TestAPIModels:
     """Test API model validation and serialization."""
 
@@ -537,6 +735,7 @@ class TestAPIIntegration:
         """Test stateless chat flow using /chat endpoint."""
         # Mock first chat response
         mock_result1 = MagicMock()
+        mock_result1.metrics = None
         mock_result1.decision.model_dump.return_value = {
             "action": "respond",
             "response": "Hello! How can I help?",
@@ -552,6 +751,7 @@ class TestAPIIntegration:
 
         # Mock second chat response
         mock_result2 = MagicMock()
+        mock_result2.metrics = None
         mock_result2.decision.model_dump.return_value = {
             "action": "respond",
             "response": "Here's more information...",
@@ -568,7 +768,7 @@ class TestAPIIntegration:
             flow_state=None,
         )
 
-        mock_agent.next.side_effect = [mock_result1, mock_result2]
+        mock_agent.anext = AsyncMock(side_effect=[mock_result1, mock_result2])
 
         # Step 1: Initial chat (creates new session)
         response = client.post("/chat", json={"user_input": "Hello", "session_data": None})
@@ -608,7 +808,8 @@ class TestAPIPerformance:
             mock_decision.model_dump.return_value = {"response": "Processed large message"}
             mock_response = MagicMock()
             mock_response.decision = mock_decision
-            mock_session.next.return_value = mock_response
+            mock_response.metrics = None
+            mock_session.anext = AsyncMock(return_value=mock_response)
             mock_store.get = AsyncMock(return_value=mock_session)
             mock_store.set = AsyncMock()
 
@@ -1,9 +1,12 @@
 import asyncio
+import threading
 import time
 
+import pytest
+
 from nomos.config import AgentConfig, ToolsConfig
 from nomos.core import Agent
-from nomos.models.agent import Action, Route, Step
+from nomos.models.agent import Action, Route, Step, TurnBudget
 from nomos.models.tool import Tool
 
 
@@ -54,3 +57,220 @@ def test_async_tool_execution(mock_llm):
     assert res.decision.action == Action.TOOL_CALL
     assert res.tool_output == "async value"
     assert duration < 0.5
+
+
+@pytest.mark.asyncio
+async def test_tool_arun_awaits_coroutine_function():
+    tool = Tool.from_function(async_tool)
+    assert await tool.arun(arg0="value") == "async value"
+
+
+@pytest.mark.asyncio
+async def test_tool_arun_offloads_sync_function():
+    def sync_tool(arg0: str = "test") -> str:
+        """Dummy synchronous tool."""
+        return f"sync {arg0}"
+
+    tool = Tool.from_function(sync_tool)
+    assert await tool.arun(arg0="value") == "sync value"
+
+
+def slow_lookup(key: str = "a") -> str:
+    """Slow synchronous lookup."""
+    time.sleep(0.2)
+    return f"value {key}"
+
+
+async def slow_async_lookup(key: str = "a") -> str:
+    """Slow asynchronous lookup."""
+    await asyncio.sleep(0.2)
+    return f"async value {key}"
+
+
+def _parallel_agent(mock_llm, tool):
+    steps = [
+        Step(
+            step_id="start",
+            description="Gather data",
+            routes=[],
+            available_tools=[tool.__name__],
+            parallel_tool_calls=True,
+        ),
+    ]
+    config = AgentConfig(name="parallel_agent", steps=steps, start_step_id="start")
+    agent = Agent.from_config(config=config, llm=mock_llm, tools=[tool])
+    session = agent.create_session()
+    model = agent.llm._create_decision_model(
+        current_step=session.current_step,
+        current_step_tools=session._get_current_step_tools(),
+    )
+    calls = [{"tool_name": tool.__name__, "tool_kwargs": {"key": k}} for k in "abc"]
+    agent.llm.set_response(
+        model(reasoning=["lookup"], action=Action.TOOL_CALL.value, tool_calls=calls)
+    )
+    agent.llm.set_response(
+        model(reasoning=["done"], action=Action.RESPOND.value, response="done"), append=True
+    )
+    return session
+
+
+def test_parallel_tool_calls(mock_llm):
+    session = _parallel_agent(mock_llm, slow_lookup)
+
+    start = time.monotonic()
+    res = session.next("lookup")
+    duration = time.monotonic() - start
+
+    assert res.decision.response == "done"
+    assert res.stats.llm_calls == 2
+    assert res.stats.tool_calls == 3
+    assert duration < 0.5
+    tool_events = [e.content for e in session.memory.context if getattr(e, "type", "") == "tool"]
+    assert [c.endswith(f"value {k}") for c, k in zip(tool_events, "abc")] == [True] * 3
+
+
+@pytest.mark.asyncio
+async def test_parallel_tool_calls_async(mock_llm):
+    session = _parallel_agent(mock_llm, slow_async_lookup)
+
+    start = time.monotonic()
+    res = await session.anext("lookup", return_tool=True)
+    duration = time.monotonic() - start
+
+    assert res.tool_output == ["async value a", "async value b", "async value c"]
+    assert res.decision.tool_call.tool_name == "slow_async_lookup"
+    assert len(res.decision.tool_calls) == 3
+    assert duration < 0.5
+
+
+def test_parallel_tool_calls_bounded(mock_llm):
+    session = _parallel_agent(mock_llm, slow_lookup)
+    session.config.max_tool_concurrency = 1
+
+    start = time.monotonic()
+    session.next("lookup", return_tool=True)
+    assert time.monotonic() - start >= 0.6
+
+
+def _hanging_agent(mock_llm, tool, timeout):
+    steps = [Step(step_id="start", description="Look up", available_tools=[tool.__name__])]
+    config = AgentConfig(
+        name="hanging_agent",
+        steps=steps,
+        start_step_id="start",
+        turn_budget=TurnBudget(timeout=timeout),
+    )
+    agent = Agent.from_config(config=config, llm=mock_llm, tools=[tool])
+    session = agent.create_session()
+    model = agent.llm._create_decision_model(
+        current_step=session.current_step,
+        current_step_tools=session._get_current_step_tools(),
+    )
+    agent.llm.set_response(
+        model(
+            reasoning=["lookup"],
+            action=Action.TOOL_CALL.value,
+            tool_call={"tool_name": tool.__name__, "tool_kwargs": {}},
+        )
+    )
+    return agent, session
+
+
+def hanging_lookup() -> str:
+    """Lookup that never returns in time."""
+    time.sleep(2)
+    return "late"
+
+
+def test_turn_timeout_returns_fallback(mock_llm):
+    _, session = _hanging_agent(mock_llm, hanging_lookup, timeout=0.2)
+
+    start = time.monotonic()
+    res = session.next("lookup")
+
+    assert time.monotonic() - start < 1
+    assert res.decision.response == TurnBudget().timeout_response
+    assert res.stats.exhausted == "Turn timed out"
+    assert session._deadline is None
+    events = [e for e in session.memory.context if getattr(e, "type", "") == "fallback"]
+    assert events and "timed out" in events[0].content
+
+
+@pytest.mark.asyncio
+async def test_turn_timeout_cancels_async_work(mock_llm):
+    cancelled = asyncio.Event()
+
+    async def hanging_async_lookup() -> str:
+        """Async lookup that never returns in time."""
+        try:
+            await asyncio.sleep(2)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return "late"
+
+    agent, _ = _hanging_agent(mock_llm, hanging_async_lookup, timeout=5)
+
+    start = time.monotonic()
+    res = await agent.anext("lookup", budget=TurnBudget(timeout=0.2))
+
+    assert time.monotonic() - start < 1
+    assert res.decision.response == TurnBudget().timeout_response
+    assert cancelled.is_set()
+
+
+@pytest.mark.asyncio
+async def test_turn_timeout_cancels_hanging_decision(mock_llm):
+    cancelled = asyncio.Event()
+
+    async def hanging_output(*args, **kwargs):
+        try:
+            await asyncio.sleep(2)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    agent, _ = _hanging_agent(mock_llm, hanging_lookup, timeout=0.2)
+    agent.llm.aget_output = hanging_output
+
+    start = time.monotonic()
+    res = await agent.anext("lookup")
+
+    assert time.monotonic() - start < 1
+    assert res.decision.response == TurnBudget().timeout_response
+    assert cancelled.is_set()
+
+
+def test_turn_timeout_runs_bookkeeping_inline(mock_llm):
+    def slow_lookup() -> str:
+        """Lookup finishing after the deadline."""
+        time.sleep(0.5)
+        return "late"
+
+    _, session = _hanging_agent(mock_llm, slow_lookup, timeout=0.2)
+    threads = []
+    remember = session._remember
+
+    def record(item):
+        threads.append(threading.current_thread())
+        remember(item)
+
+    session._remember = record
+    res = session.next("lookup")
+    history = list(session.memory.context)
+    time.sleep(0.6)
+
+    assert res.decision.response == TurnBudget().timeout_response
+    assert threads and all(t is threading.current_thread() for t in threads)
+    assert list(session.memory.context) == history
+    assert session.deferred_tools == {}
+
+
+def test_timed_out_session_not_pooled(mock_llm):
+    agent, _ = _hanging_agent(mock_llm, hanging_lookup, timeout=0.2)
+
+    res = agent.next("lookup")
+
+    assert res.decision.response == TurnBudget().timeout_response
+    # The hanging lookup may still update its session, so it is not reused
+    assert len(agent._session_shells) == 0
@@ -1,29 +1,61 @@
 """Tests for core Nomos agent functionality."""
 
+import asyncio
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import FrozenInstanceError
 from pathlib import Path
 from unittest.mock import MagicMock, Mock, patch
 
 import pytest
 
+from nomos.answers import AnswerCache, CachedAnswer
 from nomos.config import AgentConfig, ToolsConfig
-from nomos.core import Agent, Session
-from nomos.llms import LLMConfig
+from nomos.constants import DEFAULT_SYSTEM_MESSAGE
+from nomos.core import Agent, AgentTool, Session
+from nomos.llms import (
+    CachedEmbeddings,
+    EmbeddingCache,
+    EmbeddingCacheConfig,
+    LLMConfig,
+    LRUResponseCache,
+    ResponseCache,
+    ResponseCacheConfig,
+    SQLiteResponseCache,
+)
 from nomos.llms.base import LLMBase
+from nomos.memory.flow import RetrieverConfig
 from nomos.models.agent import (
     Action,
     Decision,
     DecisionConstraints,
     Event,
+    Message,
+    Response,
     Route,
+    RouteRule,
+    State,
     Step,
     StepIdentifier,
     StepOverrides,
     Summary,
+    TurnBudget,
+    TurnMetrics,
+    TurnStats,
 )
-from nomos.models.tool import Tool, ToolWrapper
+from nomos.models.tool import FallbackError, Tool, ToolWrapper
+from nomos.pool import AgentPool
+from nomos.schemas import SchemaRegistry
+from nomos.testing import Tape, TapeLLM, TapeMissError
 from nomos.tools.mcp import MCPServer
 from nomos.tools.models import ArgDef, ToolDef
+from nomos.utils.bindings import UnresolvedBinding, resolve_binding
+from nomos.utils.metrics import collect, record_usage
+from nomos.utils.ratelimit import RateLimiter
+from nomos.utils.repair import fix_tool_args
+from nomos.utils.utils import create_base_model
 
 
 def test_agent_initialization(basic_agent):
@@ -782,6 +814,861 @@ class TestMaxIterationsBehavior:
         assert res.decision.action == Action.RESPOND
 
 
+class TestTurnBudget:
+    """Test the budgeted decision loop and turn stats."""
+
+    @staticmethod
+    def _models(agent, session):
+        tools = tuple(session._get_current_step_tools())
+        model = agent.llm._create_decision_model(
+            current_step=session.current_step, current_step_tools=tools
+        )
+        if session.current_step.auto_flow:
+            return model, None
+        fallback_model = agent.llm._create_decision_model(
+            current_step=session.current_step,
+            current_step_tools=tools,
+            constraints=DecisionConstraints(actions=["RESPOND"], fields=["response"]),
+        )
+        return model, fallback_model
+
+    def test_turn_stats(self, basic_agent):
+        """Test that a turn reports its iterations, retries and calls."""
+        session = basic_agent.create_session()
+        model, _ = self._models(basic_agent, session)
+        tool_response = model(
+            reasoning=["Use tool"],
+            action=Action.TOOL_CALL.value,
+            tool_call={"tool_name": "test_tool", "tool_kwargs": {"arg0": "x"}},
+        )
+        respond = model(reasoning=["Done"], action=Action.RESPOND.value, response="Done")
+        basic_agent.llm.set_response(tool_response)
+        basic_agent.llm.set_response(respond, append=True)
+
+        res = session.next("Use the tool")
+
+        assert res.stats.iterations == 2
+        assert res.stats.llm_calls == 2
+        assert res.stats.tool_calls == 1
+        assert res.stats.retries == 0
+        assert res.stats.exhausted is None
+        assert res.stats.duration >= 0
+
+    def test_turn_stats_counts_retries(self, basic_agent):
+        """Test that invalid decisions are reported as retries."""
+        session = basic_agent.create_session()
+        model, respond_model = self._models(basic_agent, session)
+        invalid = model(reasoning=["Respond"], action=Action.RESPOND.value)
+        respond = respond_model(reasoning=["Done"], action=Action.RESPOND.value, response="Done")
+        basic_agent.llm.set_response(invalid)
+        basic_agent.llm.set_response(respond, append=True)
+
+        res = session.next("Hi")
+
+        assert res.stats.iterations == 2
+        assert res.stats.retries == 1
+
+    def test_max_tool_calls_falls_back(self, basic_agent):
+        """Test that exhausting the tool budget produces a fallback response."""
+        session = basic_agent.create_session()
+        model, fallback_model = self._models(basic_agent, session)
+        tool_response = model(
+            reasoning=["Use tool"],
+            action=Action.TOOL_CALL.value,
+            tool_call={"tool_name": "test_tool", "tool_kwargs": {"arg0": "x"}},
+        )
+        fallback = fallback_model(
+            reasoning=["Out of budget"], action=Action.RESPOND.value, response="Sorry"
+        )
+        basic_agent.llm.set_response(tool_response)
+        basic_agent.llm.set_response(fallback, append=True)
+
+        res = session.next("Use the tool", budget=TurnBudget(max_tool_calls=1))
+
+        assert res.decision.response == "Sorry"
+        assert res.stats.tool_calls == 1
+        assert res.stats.exhausted == "Maximum tool calls reached"
+        events = [msg for msg in session.memory.context if isinstance(msg, Event)]
+        assert any(
+            e.type == "fallback" and "Maximum tool calls reached" in e.content for e in events
+        )
+
+    def test_budget_exhausted_in_auto_flow_raises(self, basic_agent):
+        """Test that auto_flow steps stop when the budget is exhausted."""
+        session = basic_agent.create_session()
+        session.current_step.auto_flow = True
+        model, _ = self._models(basic_agent, session)
+        basic_agent.llm.set_response(
+            model(
+                reasoning=["Use tool"],
+                action=Action.TOOL_CALL.value,
+                tool_call={"tool_name": "test_tool", "tool_kwargs": {"arg0": "x"}},
+            )
+        )
+
+        with pytest.raises(RecursionError, match="Maximum LLM calls reached"):
+            session.next(budget=TurnBudget(max_llm_calls=3))
+
+    def test_config_turn_budget_is_default(self, basic_agent):
+        """Test that the config's turn budget applies when none is given."""
+        basic_agent.config.turn_budget = TurnBudget(max_time=0)
+        session = basic_agent.create_session()
+        _, fallback_model = self._models(basic_agent, session)
+        basic_agent.llm.set_response(
+            fallback_model(reasoning=["Late"], action=Action.RESPOND.value, response="Sorry")
+        )
+
+        res = session.next("Hi")
+
+        assert res.stats.exhausted == "Maximum turn time reached"
+        assert res.stats.llm_calls == 1
+
+
+class TestTurnMetrics:
+    """Test per-stage timings and token usage reported on responses."""
+
+    @staticmethod
+    def _tool_then_respond(agent, session):
+        model = agent.llm._create_decision_model(
+            current_step=session.current_step,
+            current_step_tools=agent.compiled["start"].tools,
+        )
+        agent.llm.set_response(
+            model(
+                reasoning=["Use tool"],
+                action=Action.TOOL_CALL.value,
+                tool_call={"tool_name": "test_tool", "tool_kwargs": {"arg0": "x"}},
+            )
+        )
+        agent.llm.set_response(
+            model(reasoning=["Done"], action=Action.RESPOND.value, response="Done"), append=True
+        )
+
+    def test_metrics_stage_timings(self, basic_agent):
+        """Test that a turn reports the time spent in each stage."""
+        session = basic_agent.create_session()
+        self._tool_then_respond(basic_agent, session)
+
+        res = session.next("Use the tool")
+
+        assert {"history", "schema", "llm", "parse", "tool", "memory"} <= set(res.metrics.timings)
+        assert all(seconds >= 0 for seconds in res.metrics.timings.values())
+        assert res.metrics.llm_calls == 2
+        assert res.metrics.retries == 0
+        assert res.metrics.model_dump(include=set(TurnStats.model_fields)) == res.stats.model_dump()
+        assert "llm;dur=" in res.metrics.server_timing()
+
+    def test_metrics_token_usage(self, basic_agent):
+        """Test that provider reported token usage is summed over the turn."""
+        session = basic_agent.create_session()
+        self._tool_then_respond(basic_agent, session)
+        get_output = basic_agent.llm.get_output
+
+        def get_output_with_usage(*args, **kwargs):
+            record_usage(100, 20)
+            return get_output(*args, **kwargs)
+
+        basic_agent.llm.get_output = get_output_with_usage
+        res = session.next("Use the tool")
+
+        assert res.metrics.prompt_tokens == 200
+        assert res.metrics.completion_tokens == 40
+        assert res.metrics.total_tokens == 240
+
+    def test_metrics_cached_tokens(self, basic_agent):
+        """Test that prompt tokens read from the provider's cache are reported."""
+        session = basic_agent.create_session()
+        self._tool_then_respond(basic_agent, session)
+        get_output = basic_agent.llm.get_output
+
+        def get_output_with_usage(*args, **kwargs):
+            record_usage(100, 20, cached_tokens=80)
+            return get_output(*args, **kwargs)
+
+        basic_agent.llm.get_output = get_output_with_usage
+        res = session.next("Use the tool")
+
+        assert res.metrics.cached_tokens == 160
+        assert res.metrics.prompt_tokens == 200
+
+    def test_anthropic_prompt_caching(self, basic_agent):
+        """Test that Anthropic requests mark the system prompt as cacheable and report cache hits."""
+        pytest.importorskip("anthropic")
+        from nomos.llms.anthropic import Anthropic
+
+        llm = Anthropic(api_key="test")
+        model = basic_agent.llm._create_decision_model(
+            current_step=basic_agent.steps["start"],
+            current_step_tools=basic_agent.compiled["start"].tools,
+        )
+        usage = Mock(
+            input_tokens=10,
+            output_tokens=5,
+            cache_read_input_tokens=900,
+            cache_creation_input_tokens=0,
+        )
+        tool_use = Mock(type="tool_use", input={"reasoning": ["r"], "action": "END"})
+        tool_use.name = "get_next_decision"
+        llm.client.messages.create = Mock(return_value=Mock(content=[tool_use], usage=usage))
+        messages = [Message(role="system", content="Static"), Message(role="user", content="Hi")]
+
+        metrics = TurnMetrics()
+        with collect(metrics):
+            llm.get_output(messages, model)
+
+        system = llm.client.messages.create.call_args.kwargs["system"]
+        assert system == [
+            {"type": "text", "text": "Static", "cache_control": {"type": "ephemeral"}}
+        ]
+        assert metrics.prompt_tokens == 910
+        assert metrics.cached_tokens == 900
+
+        llm.cache_prompts = False
+        llm.get_output(messages, model)
+        assert llm.client.messages.create.call_args.kwargs["system"] == "Static"
+
+    def test_metrics_when_streaming(self, basic_agent):
+        """Test that streamed turns report their timings too."""
+        session = basic_agent.create_session()
+        self._tool_then_respond(basic_agent, session)
+
+        res = list(session.stream("Use the tool"))[-1]
+
+        assert res.metrics.llm_calls == 2
+        assert {"llm", "parse", "tool"} <= set(res.metrics.timings)
+
+    @pytest.mark.asyncio
+    async def test_metrics_async(self, basic_agent):
+        """Test that asynchronous turns report their timings."""
+        session = basic_agent.create_session()
+        self._tool_then_respond(basic_agent, session)
+
+        res = await session.anext("Use the tool")
+
+        assert {"llm", "parse", "tool"} <= set(res.metrics.timings)
+
+
+class TestResponseCache:
+    """Test serving identical decision requests from the response cache."""
+
+    @staticmethod
+    def _respond(agent, cache=True):
+        agent.steps["start"].overrides = StepOverrides(cache=cache)
+        agent.response_cache = ResponseCache(LRUResponseCache())
+        model = agent.llm._create_decision_model(
+            current_step=agent.steps["start"],
+            current_step_tools=agent.compiled["start"].tools,
+        )
+        agent.llm.set_response(model(reasoning=["Greet"], action="RESPOND", response="Hi"))
+
+    def test_identical_turns_served_from_cache(self, basic_agent):
+        """Test that a repeated request skips the LLM and is counted as a cache hit."""
+        self._respond(basic_agent)
+        first = basic_agent.create_session().next("Hello")
+
+        with patch.object(basic_agent.llm, "get_output") as get_output:
+            second = basic_agent.create_session().next("Hello")
+
+        get_output.assert_not_called()
+        assert second.decision.response == first.decision.response == "Hi"
+        assert first.metrics.cache_hits == 0
+        assert second.metrics.cache_hits == 1
+        assert basic_agent.response_cache.hits == 1
+
+    def test_different_input_is_a_miss(self, basic_agent):
+        """Test that only identical requests are served from the cache."""
+        self._respond(basic_agent)
+        basic_agent.create_session().next("Hello")
+        res = basic_agent.create_session().next("Hello there")
+
+        assert res.metrics.cache_hits == 0
+        assert basic_agent.response_cache.misses == 2
+
+    def test_step_without_cache(self, basic_agent):
+        """Test that steps without caching enabled always ask the LLM."""
+        self._respond(basic_agent, cache=False)
+        basic_agent.create_session().next("Hello")
+        res = basic_agent.create_session().next("Hello")
+
+        assert res.metrics.cache_hits == 0
+        assert len(basic_agent.response_cache.backend) == 0
+
+    def test_streamed_turn_served_from_cache(self, basic_agent):
+        """Test that a cached RESPOND decision is streamed as a single chunk."""
+        self._respond(basic_agent)
+        basic_agent.create_session().next("Hello")
+
+        with patch.object(basic_agent.llm, "stream_output") as stream_output:
+            items = list(basic_agent.create_session().stream("Hello"))
+
+        stream_output.assert_not_called()
+        assert "Hi" in items
+        assert items[-1].decision.response == "Hi"
+
+    def test_lru_backend_ttl_and_eviction(self):
+        """Test that expired and least recently used values are dropped."""
+        backend = LRUResponseCache(maxsize=2)
+        backend.set("a", "1")
+        backend.set("b", "2")
+        backend.get("a")
+        backend.set("c", "3")
+        backend.set("d", "4", ttl=-1)
+
+        assert backend.get("a") is None
+        assert backend.get("b") is None
+        assert backend.get("c") == "3"
+        assert backend.get("d") is None
+
+    def test_sqlite_backend_persists(self, tmp_path):
+        """Test that the SQLite backend keeps values across instances and bounds its size."""
+        path = str(tmp_path / "cache.db")
+        backend = SQLiteResponseCache(path, maxsize=2)
+        backend.set("a", "1")
+        backend.set("b", "2", ttl=-1)
+
+        reopened = ResponseCacheConfig(backend="sqlite", path=path, maxsize=2).get_cache().backend
+        assert reopened.get("a") == "1"
+        assert reopened.get("b") is None
+        reopened.set("c", "3")
+        reopened.set("d", "4")
+        assert reopened.get("a") is None
+        assert reopened.delete("d")
+        reopened.clear()
+        assert reopened.get("c") is None
+
+    def test_generate_cached(self, mock_llm):
+        """Test caching text responses keyed by the request options."""
+        cache = ResponseCache()
+        messages = [Message(role="user", content="Summarize")]
+        mock_llm.set_generate_response("Summary")
+
+        assert cache.generate(mock_llm, messages, temperature=0) == "Summary"
+        mock_llm.set_generate_response("Changed")
+        assert cache.generate(mock_llm, messages, temperature=0) == "Summary"
+        assert cache.generate(mock_llm, messages, temperature=1) == "Changed"
+
+    def test_key_includes_llm_settings(self, mock_llm):
+        """Test that LLMs differing only in sampling settings do not share entries."""
+        messages = [Message(role="user", content="Summarize")]
+        other = type(mock_llm)()
+        assert ResponseCache.key(mock_llm, messages) == ResponseCache.key(other, messages)
+
+        other.temperature = 0.7
+        assert ResponseCache.key(mock_llm, messages) != ResponseCache.key(other, messages)
+
+    @pytest.mark.asyncio
+    async def test_blocking_backend_off_event_loop(self, mock_llm, tmp_path):
+        """Test that the async API runs file and network backends in a worker thread."""
+        cache = ResponseCache(SQLiteResponseCache(str(tmp_path / "cache.db")))
+        messages = [Message(role="user", content="Summarize")]
+        mock_llm.set_generate_response("Summary")
+        loop_thread = threading.current_thread()
+        threads = []
+        get = cache.backend.get
+
+        def record(key):
+            threads.append(threading.current_thread())
+            return get(key)
+
+        cache.backend.get = record
+        assert await cache.agenerate(mock_llm, messages) == "Summary"
+        assert await cache.agenerate(mock_llm, messages) == "Summary"
+
+        assert cache.hits == 1
+        assert threads and loop_thread not in threads
+
+
+class TestAnswerCache:
+    """Test answering similar questions from the semantic answer cache."""
+
+    QUESTION = "What are your opening hours?"
+
+    @staticmethod
+    def _faq(agent, auto_approve=True, path=None):
+        agent.steps["start"].overrides = StepOverrides(answer_cache=True)
+        agent.answer_cache = AnswerCache(threshold=0.95, auto_approve=auto_approve, path=path)
+        model = agent.llm._create_decision_model(
+            current_step=agent.steps["start"],
+            current_step_tools=agent.compiled["start"].tools,
+        )
+        agent.llm.set_response(model(reasoning=["FAQ"], action="RESPOND", response="9 to 5"))
+
+    def test_similar_question_served_from_cache(self, basic_agent):
+        """Test that a paraphrase is answered with the cached decision, without the LLM."""
+        self._faq(basic_agent)
+        first = basic_agent.create_session().next(self.QUESTION)
+
+        with patch.object(basic_agent.llm, "get_output") as get_output:
+            second = basic_agent.create_session().next("what are your opening hours")
+
+        get_output.assert_not_called()
+        assert first.metrics.llm_calls == 1
+        assert second.decision.response == "9 to 5"
+        assert second.metrics.llm_calls == 0
+        assert second.metrics.cache_hits == 1
+        assert basic_agent.answer_cache.hits == 1
+
+    def test_dissimilar_question_asks_llm(self, basic_agent):
+        """Test that questions below the similarity threshold go to the LLM."""
+        self._faq(basic_agent)
+        basic_agent.create_session().next(self.QUESTION)
+        res = basic_agent.create_session().next("Do you deliver to Kandy?")
+
+        assert res.metrics.cache_hits == 0
+        assert res.metrics.llm_calls == 1
+        assert len(basic_agent.answer_cache) == 2
+
+    def test_pending_answers_need_approval(self, basic_agent):
+        """Test that LLM answers are only served once approved."""
+        self._faq(basic_agent, auto_approve=False)
+        basic_agent.create_session().next(self.QUESTION)
+        res = basic_agent.create_session().next(self.QUESTION)
+        assert res.metrics.cache_hits == 0
+
+        (pending,) = basic_agent.answer_cache.answers(approved=False)
+        assert pending.question == self.QUESTION
+        assert basic_agent.answer_cache.approve(pending.answer_id)
+        res = basic_agent.create_session().next(self.QUESTION)
+        assert res.metrics.cache_hits == 1
+
+    def test_invalidate(self, basic_agent):
+        """Test that invalidated answers are no longer served."""
+        self._faq(basic_agent)
+        basic_agent.create_session().next(self.QUESTION)
+
+        assert basic_agent.answer_cache.invalidate(step_id="end") == 0
+        assert basic_agent.answer_cache.invalidate(step_id="start") == 1
+        res = basic_agent.create_session().next(self.QUESTION)
+        assert res.metrics.cache_hits == 0
+
+    @pytest.mark.asyncio
+    async def test_async_and_streamed_hits(self, basic_agent):
+        """Test that cached answers are served by the async and streaming drivers."""
+        self._faq(basic_agent)
+        basic_agent.create_session().next(self.QUESTION)
+
+        res = await basic_agent.create_session().anext(self.QUESTION)
+        items = list(basic_agent.create_session().stream(self.QUESTION))
+
+        assert res.metrics.cache_hits == 1
+        assert items[0] == "9 to 5"
+        assert items[-1].metrics.cache_hits == 1
+
+    def test_eviction_prefers_pending_answers(self):
+        """Test that pending answers are dropped before approved ones."""
+        cache = AnswerCache(maxsize=2)
+        decision = Decision(reasoning=[], action=Action.RESPOND, response="r")
+        approved = cache.add("s", "a", [1.0, 0.0, 0.0], decision, approved=True)
+        cache.add("s", "b", [0.0, 1.0, 0.0], decision)
+        cache.add("s", "c", [0.0, 0.0, 1.0], decision)
+
+        assert [a.question for a in cache.answers()] == ["a", "c"]
+        assert cache.search("s", [0.9, 0.1, 0.0]).response == "r"
+        assert cache.search("other", [1.0, 0.0, 0.0]) is None
+        assert cache.add("s", "a again", [1.0, 0.0, 0.0], decision) is approved
+
+    def test_file_shares_approvals(self, tmp_path):
+        """Test that answers and approvals stored in a file are shared and survive restarts."""
+        path = str(tmp_path / "answers.db")
+        server, worker = AnswerCache(path=path), AnswerCache(path=path)
+        decision = Decision(reasoning=[], action=Action.RESPOND, response="r")
+        pending = worker.add("s", "a", [1.0, 0.0], decision)
+
+        assert worker.search("s", [1.0, 0.0]) is None
+        assert server.approve(pending.answer_id)
+        assert worker.search("s", [1.0, 0.0]).response == "r"
+        assert AnswerCache(path=path).answers(approved=True)[0].answer_id == pending.answer_id
+
+        assert server.invalidate(step_id="s") == 1
+        assert worker.search("s", [1.0, 0.0]) is None
+        assert len(AnswerCache(path=path)) == 0
+
+    def test_file_reload_reads_changed_answers_only(self, tmp_path):
+        """Test that answers written by another process are loaded without reparsing the rest."""
+        path = str(tmp_path / "answers.db")
+        server, worker = AnswerCache(path=path), AnswerCache(path=path)
+        decision = Decision(reasoning=[], action=Action.RESPOND, response="r")
+        first, second, _ = (
+            worker.add("s", q, v, decision)
+            for q, v in (("a", [1, 0, 0]), ("b", [0, 1, 0]), ("c", [0, 0, 1]))
+        )
+        assert len(server) == 3
+
+        worker.add("s", "d", [1.0, 1.0, 0.0], decision)
+        worker.invalidate(answer_id=second.answer_id)
+        assert server.approve(first.answer_id)
+        parse = CachedAnswer.model_validate_json
+        with patch.object(CachedAnswer, "model_validate_json", side_effect=parse) as parsed:
+            questions = [a.question for a in worker.answers()]
+
+        assert parsed.call_count == 1
+        assert questions == ["a", "c", "d"]
+        assert worker.answers(approved=True)[0].answer_id == first.answer_id
+        assert [a.question for a in server.answers()] == ["a", "c", "d"]
+
+    @pytest.mark.asyncio
+    async def test_file_access_off_event_loop(self, basic_agent, tmp_path):
+        """Test that the async driver looks up and stores answers in a worker thread."""
+        self._faq(basic_agent, path=str(tmp_path / "answers.db"))
+        loop_thread = threading.current_thread()
+        threads = []
+        connection = basic_agent.answer_cache._connection
+
+        def record():
+            threads.append(threading.current_thread())
+            return connection()
+
+        basic_agent.answer_cache._connection = record
+        await basic_agent.create_session().anext(self.QUESTION)
+        res = await basic_agent.create_session().anext(self.QUESTION)
+
+        assert res.metrics.cache_hits == 1
+        assert threads and loop_thread not in threads
+
+
+class TestRouteRules:
+    """Test routes taken by local rules, without an LLM call."""
+
+    @staticmethod
+    def _agent(mock_llm, test_tool_0, rule):
+        steps = [
+            Step(
+                step_id="start",
+                description="Start step",
+                routes=[Route(target="end", condition="User agrees", rule=rule)],
+                available_tools=["test_tool"],
+            ),
+            Step(step_id="end", description="End step"),
+        ]
+        return Agent(
+            llm=mock_llm, name="rules", steps=steps, start_step_id="start", tools=[test_tool_0]
+        )
+
+    def test_user_input_rule_moves_without_llm(self, mock_llm, test_tool_0):
+        """Test that a matching user input rule moves without asking the LLM."""
+        agent = self._agent(mock_llm, test_tool_0, RouteRule(user_input=r"^\s*(yes|yep)\b"))
+        session = agent.create_session()
+
+        res = session.next("Yes please", return_step=True)
+
+        assert res.decision.action == Action.MOVE
+        assert res.decision.step_id == "end"
+        assert res.stats.llm_calls == 0
+        assert session.current_step.step_id == "end"
+
+    def test_unmatched_rule_asks_llm(self, mock_llm, test_tool_0):
+        """Test that the LLM decides when no rule matches."""
+        agent = self._agent(mock_llm, test_tool_0, RouteRule(user_input=r"^yes\b"))
+        session = agent.create_session()
+        model = mock_llm._create_decision_model(
+            current_step=session.current_step, current_step_tools=agent.compiled["start"].tools
+        )
+        mock_llm.set_response(model(reasoning=["Ask"], action="RESPOND", response="Sure?"))
+
+        res = session.next("Maybe")
+
+        assert res.decision.response == "Sure?"
+        assert res.stats.llm_calls == 1
+
+    def test_tool_output_rule_moves_after_tool_call(self, mock_llm, test_tool_0):
+        """Test that a rule on the tool output moves right after the tool call."""
+        rule = RouteRule(tool="test_tool", tool_success=True, tool_output="response: ok")
+        agent = self._agent(mock_llm, test_tool_0, rule)
+        session = agent.create_session()
+        model = mock_llm._create_decision_model(
+            current_step=session.current_step, current_step_tools=agent.compiled["start"].tools
+        )
+        mock_llm.set_response(
+            model(
+                reasoning=["Use tool"],
+                action="TOOL_CALL",
+                tool_call={"tool_name": "test_tool", "tool_kwargs": {"arg0": "ok"}},
+            )
+        )
+
+        res = session.next("Check it", return_step=True)
+
+        assert res.decision.step_id == "end"
+        assert res.stats.llm_calls == 1
+        assert res.stats.tool_calls == 1
+
+    def test_rule_matching(self):
+        """Test the individual checks of a rule."""
+        rule = RouteRule(tool_success=False, state={"flow_id": "billing"})
+        failed = {"pay": (ValueError("declined"), False)}
+
+        assert rule.matches(None, failed, {"flow_id": "billing"})
+        assert not rule.matches(None, failed, {"flow_id": None})
+        assert not rule.matches(None, {"pay": ("ok", True)}, {"flow_id": "billing"})
+        assert not rule.matches("anything", {}, {"flow_id": "billing"})
+
+    def test_rules_need_new_observation(self):
+        """Test that state-only rules only fire on new input, and empty rules are rejected."""
+        rule = RouteRule(state={"flow_id": "billing"})
+
+        assert rule.matches("anything", {}, {"flow_id": "billing"})
+        assert not rule.matches(None, {}, {"flow_id": "billing"})
+        with pytest.raises(ValueError):
+            RouteRule()
+
+    def test_state_rules_do_not_bounce(self, mock_llm, test_tool_0):
+        """Test that steps routing to each other by state rules stop after one move."""
+        rule = RouteRule(state={"flow_id": None})
+        steps = [
+            Step(
+                step_id="a",
+                description="A",
+                routes=[Route(target="b", condition="Always", rule=rule)],
+            ),
+            Step(
+                step_id="b",
+                description="B",
+                routes=[Route(target="a", condition="Always", rule=rule)],
+            ),
+        ]
+        agent = Agent(llm=mock_llm, name="bounce", steps=steps, start_step_id="a")
+        session = agent.create_session()
+        model = mock_llm._create_decision_model(
+            current_step=agent.steps["b"], current_step_tools=()
+        )
+        mock_llm.set_response(model(reasoning=["hi"], action="RESPOND", response="In b"))
+
+        res = session.next("Hello")
+
+        assert res.decision.response == "In b"
+        assert res.stats.llm_calls == 1
+
+    def test_invalid_pattern_rejected(self):
+        """Test that invalid regular expressions are rejected at load time."""
+        with pytest.raises(ValueError):
+            Route.model_validate({"to": "end", "when": "Broken", "rule": {"user_input": "(yes"}})
+
+
+class TestToolBindings:
+    """Test auto_flow tool steps run from argument bindings without the LLM."""
+
+    @staticmethod
+    def _agent(mock_llm, charges):
+        def get_order(order_id: str) -> dict:
+            """Look up an order."""
+            return {"id": order_id, "total": 42.5}
+
+        def charge(amount: float) -> str:
+            """Charge an amount."""
+            charges.append(amount)
+            return "charged"
+
+        steps = [
+            Step(
+                step_id="lookup",
+                description="Look up the order",
+                available_tools=["get_order"],
+                routes=[Route(target="charge", condition="Order found")],
+                auto_flow=True,
+                tool_bindings={"order_id": "$input"},
+            ),
+            Step(
+                step_id="charge",
+                description="Charge the order",
+                available_tools=["charge"],
+                routes=[Route(target="done", condition="Charged")],
+                auto_flow=True,
+                tool_bindings={"amount": "$tools.get_order.total"},
+            ),
+            Step(step_id="done", description="Confirm the payment"),
+        ]
+        return Agent(
+            llm=mock_llm,
+            name="checkout",
+            steps=steps,
+            start_step_id="lookup",
+            tools=[get_order, charge],
+        )
+
+    def test_bound_pipeline_runs_without_llm(self, mock_llm):
+        """Test that bound steps call their tool and follow their route locally."""
+        charges = []
+        agent = self._agent(mock_llm, charges)
+        session = agent.create_session()
+        model = mock_llm._create_decision_model(
+            current_step=agent.steps["done"], current_step_tools=()
+        )
+        mock_llm.set_response(model(reasoning=["Done"], action="RESPOND", response="Paid"))
+
+        res = session.next("A1")
+
+        assert res.decision.response == "Paid"
+        assert charges == [42.5]
+        assert res.stats.llm_calls == 1
+        assert res.stats.tool_calls == 2
+        assert session.current_step.step_id == "done"
+
+    def test_unresolved_binding_asks_llm(self, mock_llm):
+        """Test that the LLM decides when a binding cannot be resolved."""
+        charges = []
+        agent = self._agent(mock_llm, charges)
+        session = agent.create_session()
+        session.hydrate(State(current_step_id="charge", history=[]))
+        model = mock_llm._create_decision_model(
+            current_step=session.current_step, current_step_tools=agent.compiled["charge"].tools
+        )
+        mock_llm.set_response(
+            model(
+                reasoning=["Charge"],
+                action="TOOL_CALL",
+                tool_call={"tool_name": "charge", "tool_kwargs": {"amount": 1.0}},
+            )
+        )
+
+        res = session.next(None, return_tool=True)
+
+        assert res.stats.llm_calls == 1
+        assert charges == [1.0]
+
+    def test_bindings_require_single_tool_auto_flow_step(self):
+        """Test that bindings are rejected outside single tool auto_flow steps."""
+        with pytest.raises(ValueError):
+            Step(step_id="s", description="d", available_tools=["a"], tool_bindings={"x": 1})
+        with pytest.raises(ValueError):
+            Step(
+                step_id="s",
+                description="d",
+                available_tools=["a"],
+                auto_flow=True,
+                tool_bindings={"x": "$tools"},
+            )
+
+    def test_resolve_binding(self):
+        """Test resolving references against the history and flow state."""
+        history = [
+            Event(type="user", content="hello"),
+            Event(
+                type="tool",
+                content="Tool get_order executed successfully with args {}.\nResults: "
+                "{'items': [{'sku': 'X'}]}",
+            ),
+        ]
+
+        assert resolve_binding("$input", history, {}) == "hello"
+        assert resolve_binding("$tools.get_order.items.0.sku", history, {}) == "X"
+        assert resolve_binding("$state.tier", history, {"tier": "vip"}) == "vip"
+        assert resolve_binding(3, history, {}) == 3
+        with pytest.raises(UnresolvedBinding):
+            resolve_binding("$tools.other", history, {})
+
+
+class TestDecisionRepair:
+    """Test local repair of invalid decisions instead of LLM retries."""
+
+    @staticmethod
+    def _agent(mock_llm, test_tool_0, repair=True):
+        steps = [
+            Step(
+                step_id="start",
+                description="Start step",
+                routes=[Route(target="end", condition="Done")],
+                available_tools=["test_tool"],
+            ),
+            Step(step_id="end", description="End step"),
+        ]
+        config = AgentConfig(
+            name="repair", steps=steps, start_step_id="start", repair_decisions=repair
+        )
+        return Agent.from_config(config=config, llm=mock_llm, tools=[test_tool_0])
+
+    def test_move_without_target_uses_only_route(self, mock_llm, test_tool_0):
+        """Test that a MOVE without step_id goes to the only route without a retry."""
+        agent = self._agent(mock_llm, test_tool_0)
+        session = agent.create_session()
+        model = mock_llm._create_decision_model(
+            current_step=session.current_step, current_step_tools=agent.compiled["start"].tools
+        )
+        mock_llm.set_response(model(reasoning=["Go"], action="MOVE"))
+
+        res = session.next("Done", return_step=True)
+
+        assert res.decision.step_id == "end"
+        assert res.stats.llm_calls == 1
+        assert res.stats.retries == 0
+        assert (res.stats.repair_attempts, res.stats.repairs) == (1, 1)
+        assert "repair" in res.metrics.timings
+
+    def test_action_follows_payload(self, mock_llm, test_tool_0):
+        """Test that a RESPOND carrying only a route target becomes a MOVE."""
+        agent = self._agent(mock_llm, test_tool_0)
+        session = agent.create_session()
+        decision = Decision(reasoning=["Go"], action=Action.RESPOND, step_id="end")
+
+        repaired = session._repair(decision, TurnStats())
+
+        assert repaired.action == Action.MOVE
+        assert repaired.step_id == "end"
+
+    def test_tool_args_coerced(self, mock_llm, test_tool_0):
+        """Test that tool arguments of the wrong type are converted for the named tool."""
+        agent = self._agent(mock_llm, test_tool_0)
+        session = agent.create_session()
+        other_args = create_base_model("OtherArgs", {"arg0": {"type": int}})
+        decision = Decision(
+            reasoning=["Call"],
+            action=Action.TOOL_CALL,
+            tool_call={"tool_name": "test_tool", "tool_kwargs": other_args(arg0=5)},
+        )
+        stats = TurnStats()
+
+        repaired = session._repair(decision, stats)
+
+        assert repaired.tool_call.tool_kwargs.model_dump() == {"arg0": "5"}
+        assert stats.repairs == 1
+
+    def test_tool_def_defaults_filled(self):
+        """Test that missing arguments are filled from the configured tool defaults."""
+
+        def greet(name: str, greeting: str) -> str:
+            return f"{greeting} {name}"
+
+        tool = Tool.from_function(greet)
+
+        assert fix_tool_args(tool, {"name": "Ada"}, {"greeting": "Hi"}).model_dump() == {
+            "name": "Ada",
+            "greeting": "Hi",
+        }
+        assert fix_tool_args(tool, {"name": "Ada"}, {}) is None
+
+    def test_unrepairable_decision_unchanged(self, mock_llm, test_tool_0):
+        """Test that decisions no repairer can fix are left for an LLM retry."""
+        agent = self._agent(mock_llm, test_tool_0)
+        session = agent.create_session()
+        decision = Decision(reasoning=["Say"], action=Action.RESPOND)
+        stats = TurnStats()
+
+        assert session._repair(decision, stats) is decision
+        assert (stats.repair_attempts, stats.repairs) == (1, 0)
+
+    def test_never_switches_to_tool_call(self, mock_llm, test_tool_0):
+        """Test that a RESPOND carrying only a tool call is not turned into running the tool."""
+        agent = self._agent(mock_llm, test_tool_0)
+        session = agent.create_session()
+        decision = Decision(
+            reasoning=["Say"],
+            action=Action.RESPOND,
+            tool_call={"tool_name": "test_tool", "tool_kwargs": {"arg0": "x"}},
+        )
+
+        assert session._repair(decision, TurnStats()) is decision
+
+    def test_repair_off_by_default(self, mock_llm, test_tool_0):
+        """Test that no repair is tried unless enabled in the config."""
+        assert AgentConfig.model_fields["repair_decisions"].default is False
+
+        agent = self._agent(mock_llm, test_tool_0, repair=False)
+        session = agent.create_session()
+        decision = Decision(reasoning=["Go"], action=Action.MOVE)
+
+        assert session.repairers == []
+        assert session._repair(decision, TurnStats()) is decision
+
+
 class TestToolExecutionScenarios:
     """Test various tool execution scenarios."""
 
@@ -1367,7 +2254,8 @@ class TestStepExamples:
         assert step.examples is not None
         assert all(ex._ctx_embedding is not None for ex in step.examples)
 
-    def test_examples_in_system_prompt(self, example_agent):
+    def test_examples_after_static_prompt(self, example_agent):
+        """Test that examples follow the cacheable system prompt, before the history."""
         session = example_agent.create_session()
         decision_model = example_agent.llm._create_decision_model(
             current_step=session.current_step,
@@ -1377,17 +2265,101 @@ class TestStepExamples:
         response = decision_model(reasoning=["r"], action=Action.RESPOND.value, response="ok")
         example_agent.llm.set_response(response)
         session.next("sqrt 4")
-        system_prompt = session.llm.messages_received[0].content
-        assert "Examples:" in system_prompt
-        assert "time question" in system_prompt
-        assert "sqrt 4" in system_prompt
+        system, user = session.llm.messages_received
+        assert system.content == example_agent.compiled["start"].prompt
+        assert user.content.startswith("Examples:")
+        examples = user.content.split("History:")[0]
+        assert "time question" in examples
+        assert "sqrt 4" in examples
 
         session = example_agent.create_session()
         example_agent.llm.set_response(response)
         session.next("unrelated input")
-        system_prompt = session.llm.messages_received[0].content
-        assert "time question" in system_prompt
-        assert "sqrt 4" not in system_prompt
+        system, user = session.llm.messages_received
+        assert system.content == example_agent.compiled["start"].prompt
+        examples = user.content.split("History:")[0]
+        assert "time question" in examples
+        assert "sqrt 4" not in examples
+
+
+class TestEmbeddingCache:
+    """Test reusing embeddings of texts seen before."""
+
+    def test_examples_embedded_once_across_restarts(
+        self, tmp_path, mock_llm, example_steps, test_tool_0
+    ):
+        """Test that a restarted agent reads example embeddings from the cache file."""
+        path = str(tmp_path / "embeddings.db")
+        with patch.object(mock_llm, "embed_batch", wraps=mock_llm.embed_batch) as embed_batch:
+            for _ in range(2):
+                for example in example_steps[0].examples:
+                    example._ctx_embedding = None
+                agent = Agent(
+                    name="restarted",
+                    llm=mock_llm,
+                    steps=example_steps,
+                    start_step_id="start",
+                    tools=[test_tool_0],
+                    embedding_model=CachedEmbeddings(mock_llm, EmbeddingCache(path=path)),
+                )
+
+        assert embed_batch.call_count == 1
+        assert agent.embedding_model.cache.hits == 2
+        example = example_steps[0].examples[1]
+        assert example._ctx_embedding == mock_llm.embed_text(example.context)
+
+    def test_history_embedded_with_embedding_model(self, example_agent):
+        """Test that the history is embedded with the embedding model, not the decision LLM."""
+        embedder = type(example_agent.llm)()
+        example_agent.embedding_model = CachedEmbeddings(embedder, EmbeddingCache())
+        session = example_agent.create_session()
+        model = example_agent.llm._create_decision_model(
+            current_step=session.current_step,
+            current_step_tools=tuple(session._get_current_step_tools()),
+        )
+        example_agent.llm.set_response(model(reasoning=["r"], action="RESPOND", response="ok"))
+
+        with (
+            patch.object(example_agent.llm, "embed_text", side_effect=AssertionError),
+            patch.object(embedder, "embed_text", wraps=embedder.embed_text) as embed_text,
+        ):
+            session.next("sqrt 4")
+            example_agent.create_session().next("sqrt 4")
+
+        assert embed_text.call_count == 1
+
+    def test_config_shares_cache(
+        self, mock_llm, basic_steps, test_tool_0, test_tool_1, pkg_tool, tool_defs
+    ):
+        """Test that configured caches with the same settings are shared."""
+        config = AgentConfig(
+            name="cached",
+            steps=basic_steps,
+            start_step_id="start",
+            tools=ToolsConfig(tool_defs=tool_defs),
+            embedding_cache=EmbeddingCacheConfig(),
+        )
+        agent = Agent.from_config(config, llm=mock_llm, tools=[test_tool_0, test_tool_1, pkg_tool])
+        retriever = RetrieverConfig(method="embedding", cache=EmbeddingCacheConfig()).get_retriever(
+            mock_llm
+        )
+
+        assert isinstance(agent.embedding_model, CachedEmbeddings)
+        assert retriever.embedding_model.cache is agent.embedding_model.cache
+        assert config.embedding_cache.wrap(agent.embedding_model) is agent.embedding_model
+
+    def test_batch_deduplicated_and_bounded(self, mock_llm):
+        """Test that only unseen texts are embedded and the in-memory cache is bounded."""
+        cache = EmbeddingCache(maxsize=2)
+        with patch.object(mock_llm, "embed_batch", wraps=mock_llm.embed_batch) as embed_batch:
+            embeddings = cache.embed(mock_llm, ["ab", "ab", "cd"])
+            cache.embed(mock_llm, ["cd", "ef"])
+
+        assert embeddings == [mock_llm.embed_text(t) for t in ["ab", "ab", "cd"]]
+        assert embed_batch.call_args_list[0].args == (["ab", "cd"],)
+        assert cache.hits == 1 and cache.misses == 4
+        assert len(cache) == 2
+        assert cache.key(mock_llm, "ab") != cache.key(mock_llm, "cd")
 
 
 class TestDeferredTools:
@@ -1565,3 +2537,988 @@ class TestStepOverrides:
         session = agent.create_session()
         llm = session.llm
         assert llm.model == "gpt-4"
+
+    def test_step_reasoning_mode(self, mock_llm):
+        """Test that steps can override the decision reasoning budget."""
+        steps = [
+            Step(
+                step_id="fast",
+                description="Latency critical step",
+                overrides=StepOverrides(reasoning="none"),
+            ),
+            Step(step_id="slow", description="Careful step"),
+        ]
+        config = AgentConfig(
+            name="agent",
+            steps=steps,
+            start_step_id="fast",
+            reasoning="brief",
+            max_reasoning_steps=2,
+        )
+        agent = Agent.from_config(config=config, llm=mock_llm)
+        session = agent.create_session()
+
+        fast = session._decision_request(())["response_format"]
+        assert "reasoning" not in fast.model_fields
+        response = fast(action=Action.RESPOND.value, response="ok")
+        mock_llm.set_response(response)
+        assert session.next("hi").decision.reasoning == []
+
+        session.hydrate(State(current_step_id="slow", history=[]))
+        brief = session._decision_request(())["response_format"]
+        assert brief.model_json_schema()["properties"]["reasoning"]["maxItems"] == 2
+        extra = brief(reasoning=["a", "b", "c"], action=Action.RESPOND.value, response="ok")
+        assert extra.reasoning == ["a", "b"]
+
+    def test_constrained_retry_drops_reasoning(self, basic_agent):
+        """Test that constrained retries do not ask for reasoning."""
+        step = basic_agent.steps["start"]
+        model = basic_agent.llm._create_decision_model(
+            current_step=step,
+            current_step_tools=(),
+            constraints=DecisionConstraints(actions=["RESPOND"], fields=["response"]),
+        )
+
+        assert "reasoning" not in model.model_fields
+        assert "reasoning" in basic_agent.llm._create_decision_model(step, ()).model_fields
+
+
+class TestAsyncNext:
+    """Test the async decision pipeline."""
+
+    @pytest.mark.asyncio
+    async def test_session_anext_respond(self, basic_agent):
+        """Test Session.anext with a RESPOND decision."""
+        session = basic_agent.create_session()
+        decision_model = basic_agent.llm._create_decision_model(
+            current_step=session.current_step,
+            current_step_tools=session._get_current_step_tools(),
+        )
+        basic_agent.llm.set_response(
+            decision_model(reasoning=["Greet"], action=Action.RESPOND.value, response="Hi!")
+        )
+
+        res = await session.anext("Hello")
+
+        assert res.decision.action == Action.RESPOND
+        assert res.decision.response == "Hi!"
+        events = [msg for msg in session.memory.context if isinstance(msg, Event)]
+        assert [e.type for e in events] == ["user", basic_agent.name]
+
+    @pytest.mark.asyncio
+    async def test_session_anext_tool_call(self, basic_agent):
+        """Test Session.anext runs tools through Tool.arun."""
+        session = basic_agent.create_session()
+        decision_model = basic_agent.llm._create_decision_model(
+            current_step=session.current_step,
+            current_step_tools=session._get_current_step_tools(),
+        )
+        basic_agent.llm.set_response(
+            decision_model(
+                reasoning=["Use tool"],
+                action=Action.TOOL_CALL.value,
+                tool_call={"tool_name": "test_tool", "tool_kwargs": {"arg0": "async"}},
+            )
+        )
+
+        res = await session.anext("Use tool", return_tool=True)
+
+        assert res.tool_output == "Test tool 0 response: async"
+        events = [msg for msg in session.memory.context if isinstance(msg, Event)]
+        assert any(e.type == "tool" for e in events)
+
+    @pytest.mark.asyncio
+    async def test_session_anext_matches_next_on_error(self, basic_agent):
+        """Test Session.anext shares the retry logic of Session.next."""
+        session = basic_agent.create_session()
+        with pytest.raises(ValueError, match="Maximum errors reached"):
+            await session.anext("Hello", no_errors=3)
+
+    @pytest.mark.asyncio
+    async def test_agent_anext_returns_state(self, basic_agent):
+        """Test Agent.anext returns the updated session state."""
+        session = basic_agent.create_session()
+        decision_model = basic_agent.llm._create_decision_model(
+            current_step=session.current_step,
+            current_step_tools=session._get_current_step_tools(),
+        )
+        basic_agent.llm.set_response(
+            decision_model(reasoning=["Greet"], action=Action.RESPOND.value, response="Hi!")
+        )
+
+        res = await basic_agent.anext("Hello")
+
+        assert res.decision.response == "Hi!"
+        assert res.state is not None
+        assert all(item.decision is None for item in res.state.history if isinstance(item, Event))
+
+
+class TestStreaming:
+    """Test streaming RESPOND output."""
+
+    def test_session_stream_yields_text_then_response(self, basic_agent):
+        """Test that Session.stream yields response chunks followed by the Response."""
+        session = basic_agent.create_session()
+        decision_model = basic_agent.llm._create_decision_model(
+            current_step=session.current_step,
+            current_step_tools=session._get_current_step_tools(),
+        )
+        basic_agent.llm.set_response(
+            decision_model(
+                reasoning=["Greet"], action=Action.RESPOND.value, response="Hello, how are you?"
+            )
+        )
+
+        items = list(session.stream("Hi"))
+
+        chunks, res = items[:-1], items[-1]
+        assert len(chunks) > 1
+        assert "".join(chunks) == "Hello, how are you?"
+        assert res.decision.response == "Hello, how are you?"
+        events = [msg for msg in session.memory.context if isinstance(msg, Event)]
+        assert [e.type for e in events] == ["user", basic_agent.name]
+
+    def test_session_stream_runs_tools_without_text(self, basic_agent):
+        """Test that only the final RESPOND decision is streamed."""
+        session = basic_agent.create_session()
+        decision_model = basic_agent.llm._create_decision_model(
+            current_step=session.current_step,
+            current_step_tools=session._get_current_step_tools(),
+        )
+        basic_agent.llm.set_response(
+            decision_model(
+                reasoning=["Use tool"],
+                action=Action.TOOL_CALL.value,
+                tool_call={"tool_name": "test_tool", "tool_kwargs": {"arg0": "x"}},
+            )
+        )
+        basic_agent.llm.set_response(
+            decision_model(reasoning=["Done"], action=Action.RESPOND.value, response="Done"),
+            append=True,
+        )
+
+        items = list(session.stream("Use the tool"))
+
+        assert "".join(i for i in items if isinstance(i, str)) == "Done"
+        assert items[-1].stats.tool_calls == 1
+
+    @pytest.mark.asyncio
+    async def test_agent_astream_attaches_state(self, basic_agent):
+        """Test Agent.astream yields the final Response with the session state attached."""
+        session = basic_agent.create_session()
+        decision_model = basic_agent.llm._create_decision_model(
+            current_step=session.current_step,
+            current_step_tools=session._get_current_step_tools(),
+        )
+        basic_agent.llm.set_response(
+            decision_model(reasoning=["Greet"], action=Action.RESPOND.value, response="Hi!")
+        )
+
+        items = [item async for item in basic_agent.astream("Hello")]
+
+        # MockLLM has no native async streaming, so only the final Response is produced
+        assert len(items) == 1
+        assert items[0].decision.response == "Hi!"
+        assert items[0].state is not None
+
+
+class TestSpeculativeMode:
+    """Test prefetching the next decision's inputs while tools run."""
+
+    @patch("nomos.models.tool.Tool.from_mcp_server")
+    def test_prefetch_overlaps_tool_run(self, from_mcp_server, mcp_agent):
+        """Test that deferred tools for the next decision are fetched during the tool run."""
+
+        def lookup(key: str = "a") -> str:
+            """Slow lookup."""
+            time.sleep(0.3)
+            return f"value {key}"
+
+        tool = Tool.from_function(lookup)
+
+        def list_tools(server):
+            time.sleep(0.3)
+            return [tool]
+
+        from_mcp_server.side_effect = list_tools
+        mcp_agent.config.speculative = True
+        session = mcp_agent.create_session()
+        decision_model = mcp_agent.llm._create_decision_model(
+            current_step=session.current_step, current_step_tools=(tool,)
+        )
+        mcp_agent.llm.set_response(
+            decision_model(
+                reasoning=["Look up"],
+                action=Action.TOOL_CALL.value,
+                tool_call={"tool_name": "lookup", "tool_kwargs": {"key": "a"}},
+            )
+        )
+        mcp_agent.llm.set_response(
+            decision_model(reasoning=["Done"], action=Action.RESPOND.value, response="Done"),
+            append=True,
+        )
+
+        start = time.monotonic()
+        res = session.next("Look it up")
+        duration = time.monotonic() - start
+
+        assert res.decision.response == "Done"
+        assert from_mcp_server.call_count == 2
+        # Sequential execution would take 0.9s (fetch, tool, fetch)
+        assert duration < 0.8
+
+    def test_prefetches_share_agent_executor(self, basic_agent):
+        """Test that prefetches run on the agent's thread pool rather than a new pool."""
+        basic_agent.config.speculative = True
+        sessions = [basic_agent.create_session() for _ in range(2)]
+
+        with patch("nomos.core.ThreadPoolExecutor") as new_pool:
+            results = [s._with_prefetch(lambda: threading.current_thread().name) for s in sessions]
+
+        new_pool.assert_not_called()
+        assert results == [threading.current_thread().name] * 2
+        assert all(s.executor is basic_agent.executor for s in sessions)
+        assert basic_agent.executor._pool is not None
+
+    def test_stale_prefetch_is_ignored(self, basic_agent):
+        """Test that tools prefetched for another step are not used."""
+        session = basic_agent.create_session()
+        session._prefetched = ("end", [])
+
+        assert session._take_prefetched_tools() is None
+        assert session._prefetched is None
+
+
+class TestCompiledAgent:
+    """Test the read-only step tables shared by all sessions of an agent."""
+
+    def test_sessions_share_compiled_tables(self, basic_agent):
+        """Test that sessions reuse the agent's compiled tables instead of rebuilding them."""
+        first = basic_agent.create_session()
+        second = basic_agent.get_session_from_state(first.get_state())
+
+        assert first.compiled is basic_agent.compiled
+        assert second.compiled is basic_agent.compiled
+        assert first.state_machine.transitions is basic_agent.compiled.transitions
+
+        start = basic_agent.compiled["start"]
+        assert start.routes == ("end",)
+        assert start.tool_ids == ("test_tool", "another_test_tool", "combinations")
+        assert [tool.name for tool in start.tools] == list(start.tool_ids)
+
+    def test_compiled_tables_are_immutable(self, basic_agent):
+        """Test that compiled tables cannot be modified."""
+        compiled = basic_agent.compiled
+        with pytest.raises(FrozenInstanceError):
+            compiled["start"].tools = ()
+        with pytest.raises(TypeError):
+            compiled.steps["start"] = compiled["end"]
+        with pytest.raises(TypeError):
+            compiled.transitions["start"] = ()
+
+    @patch("nomos.models.tool.Tool.from_mcp_server")
+    def test_concurrent_sessions_do_not_mutate_steps(
+        self, from_mcp_server, mcp_agent, mcp_server_name
+    ):
+        """Test that deferred tools stay local to the session that loaded them."""
+
+        def list_tools(server):
+            name = threading.current_thread().name
+            return [Tool.from_function(lambda: name, name=f"tool_{name}")]
+
+        from_mcp_server.side_effect = list_tools
+        step = mcp_agent.steps[mcp_agent.start]
+        available = list(step.available_tools)
+
+        def run(index: int) -> list:
+            threading.current_thread().name = f"worker{index}"
+            session = mcp_agent.create_session()
+            return [tool.name for tool in session._get_current_step_tools()]
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(run, range(16)))
+
+        for names in results:
+            assert len(names) == 1
+            assert names[0].startswith("tool_worker")
+        assert step.available_tools == available
+        assert step.deferred_tool_ids == [f"@mcp/{mcp_server_name}"]
+
+    def test_static_prompt_compiled_once(self, basic_agent):
+        """Test that turns reuse the compiled system prompt and only add the history."""
+        prompt = basic_agent.compiled["start"].prompt
+        assert prompt == basic_agent.llm.get_system_prompt(
+            current_step=basic_agent.steps["start"],
+            tools=basic_agent.tools,
+            system_message=DEFAULT_SYSTEM_MESSAGE.strip(),
+            persona=basic_agent.persona,
+        )
+        assert "Available Routes:" in prompt and "test_tool" in prompt
+
+        session = basic_agent.create_session()
+        model = basic_agent.llm._create_decision_model(
+            current_step=session.current_step,
+            current_step_tools=basic_agent.compiled["start"].tools,
+        )
+        basic_agent.llm.set_response(model(reasoning=["r"], action="RESPOND", response="Hi"))
+        with patch.object(LLMBase, "get_system_prompt") as get_system_prompt:
+            session.next("Hello")
+
+        get_system_prompt.assert_not_called()
+        system, user = basic_agent.llm.messages_received
+        assert system.content == prompt
+        assert "Hello" in user.content
+
+    def test_inspect_prompt(self, basic_agent):
+        """Test inspecting a step's compiled prompt and its size."""
+        info = basic_agent.inspect_prompt("start")
+
+        assert info.prompt == basic_agent.compiled["start"].prompt
+        assert info.chars == len(info.prompt)
+        assert info.tokens == basic_agent.llm.token_counter(info.prompt)
+        with pytest.raises(ValueError):
+            basic_agent.inspect_prompt("missing")
+
+
+class TestSchemaRegistry:
+    """Test the per-agent registry of decision models."""
+
+    def test_warmed_at_init(self, basic_agent):
+        """Test that turns reuse the decision models built when the agent is created."""
+        schemas = basic_agent.schemas
+        assert len(schemas) > 0
+        warmed = len(schemas)
+
+        session = basic_agent.create_session()
+        model = session._decision_model(session.current_step, basic_agent.compiled["start"].tools)
+        basic_agent.llm.set_response(model(reasoning=["r"], action="RESPOND", response="Hi"))
+        misses = schemas.misses
+        session.next("Hello")
+
+        assert session.schemas is schemas
+        assert schemas.misses == misses
+        assert len(schemas) == warmed
+
+    def test_agents_do_not_share_models(self, basic_agent):
+        """Test that agents with the same step IDs but different steps get their own models."""
+        other_steps = [
+            Step(step_id="start", description="Start", routes=[], available_tools=[]),
+            Step(step_id="end", description="End", routes=[], available_tools=[]),
+        ]
+        first = basic_agent
+        second = Agent(name="second", llm=first.llm, steps=other_steps, start_step_id="start")
+
+        first_model = first.schemas.get(first.steps["start"], [])
+        second_model = second.schemas.get(second.steps["start"], [])
+
+        assert first_model is not second_model
+        assert "step_id" in first_model.model_fields
+        assert "step_id" not in second_model.model_fields
+
+    def test_bounded(self, basic_steps):
+        """Test that the least recently used models are dropped."""
+        registry = SchemaRegistry(maxsize=2)
+        start, end = basic_steps
+        first = registry.get(start, [])
+        registry.get(end, [])
+        registry.get(start, [])
+        registry.get(start, [], reasoning="none")
+
+        assert len(registry) == 2
+        assert registry.get(start, []) is first
+        assert registry.misses == 3
+        assert registry.hits == 2
+
+    def test_json_schema_computed_once(self, basic_agent):
+        """Test that the JSON schema of a decision model is serialized once."""
+        model = basic_agent.schemas.get(basic_agent.steps["end"], [])
+
+        with patch.object(model, "model_json_schema") as model_json_schema:
+            schema = LLMBase.get_json_schema(model)
+
+        model_json_schema.assert_not_called()
+        assert schema == model.model_json_schema()
+
+
+class TestMultiHopMove:
+    """Test MOVE decisions that cross several steps at once."""
+
+    @staticmethod
+    def _agent(mock_llm, max_hops):
+        steps = [
+            Step(step_id="start", description="Greet", routes=[Route(target="b", condition="Go")]),
+            Step(
+                step_id="b",
+                description="Collect",
+                routes=[Route(target="c", condition="Go")],
+                pass_through=True,
+            ),
+            Step(step_id="c", description="Confirm the order", routes=[]),
+        ]
+        config = AgentConfig(
+            name="hops", steps=steps, start_step_id="start", max_move_hops=max_hops
+        )
+        return Agent.from_config(config=config, llm=mock_llm)
+
+    def test_reachability_table(self, mock_llm):
+        """Test the precomputed shortest paths between steps."""
+        compiled = self._agent(mock_llm, 2).compiled
+
+        assert compiled.paths["start"] == {"b": ("b",), "c": ("b", "c")}
+        assert compiled.reachable("start", 1) == {"b": ("b",)}
+        assert compiled.paths["c"] == {}
+
+    def test_single_decision_crosses_steps(self, mock_llm):
+        """Test that one LLM call moves to a step two hops away through the one between."""
+        agent = self._agent(mock_llm, 2)
+        session = agent.create_session()
+        model = mock_llm._create_decision_model(
+            current_step=session.current_step, current_step_tools=(), move_targets=("b", "c")
+        )
+        mock_llm.set_response(model(reasoning=["Skip ahead"], action="MOVE", step_id="c"))
+
+        res = session.next("I want to confirm", return_step=True)
+
+        assert res.stats.llm_calls == 1
+        assert session.current_step.step_id == "c"
+        visited = [
+            item.step_id
+            for item in session.memory.get_history()
+            if isinstance(item, StepIdentifier)
+        ]
+        assert visited[-2:] == ["b", "c"]
+
+    def test_prompt_lists_distant_targets(self, mock_llm):
+        """Test that the prompt describes targets beyond the direct routes."""
+        agent = self._agent(mock_llm, 2)
+        session = agent.create_session()
+        request = session._decision_request(())
+
+        assert request["move_paths"] == {"b": ("b",), "c": ("b", "c")}
+        messages = mock_llm._prompt_messages(
+            **{k: v for k, v in request.items() if k != "response_format"}
+        )
+        assert "- c: Confirm the order (via b)" in messages[0].content
+
+    def test_distant_target_rejected_by_default(self, mock_llm):
+        """Test that targets beyond the direct routes are invalid with the default hop limit."""
+        agent = self._agent(mock_llm, 1)
+        session = agent.create_session()
+
+        assert session.state_machine.path_to("c") is None
+        assert session.state_machine.path_to("c", max_hops=2) == ("b", "c")
+        model = mock_llm._create_decision_model(
+            current_step=session.current_step, current_step_tools=()
+        )
+        with pytest.raises(ValueError):
+            model(reasoning=["Skip ahead"], action="MOVE", step_id="c")
+
+    def test_paths_never_cross_steps_with_tools(self, mock_llm, test_tool_0):
+        """Test that steps which are not pass-through, such as steps with tools, end a path."""
+        steps = [
+            Step(step_id="start", description="Greet", routes=[Route(target="b", condition="Go")]),
+            Step(
+                step_id="b",
+                description="Charge",
+                routes=[Route(target="c", condition="Go")],
+                available_tools=["test_tool"],
+            ),
+            Step(
+                step_id="c",
+                description="Confirm",
+                routes=[Route(target="d", condition="Go")],
+            ),
+            Step(step_id="d", description="Done", routes=[]),
+        ]
+        config = AgentConfig(name="hops", steps=steps, start_step_id="start", max_move_hops=3)
+        compiled = Agent.from_config(config=config, llm=mock_llm, tools=[test_tool_0]).compiled
+
+        assert compiled.paths["start"] == {"b": ("b",)}
+        assert compiled.paths["b"] == {"c": ("c",)}
+
+    def test_pass_through_requires_plain_step(self):
+        """Test that steps running anything of their own cannot be crossed."""
+        with pytest.raises(ValueError, match="pass_through"):
+            Step(
+                step_id="b",
+                description="Charge",
+                available_tools=["test_tool"],
+                pass_through=True,
+            )
+
+
+class TestSessionFork:
+    """Test branching a live session."""
+
+    def test_fork_shares_history_until_written(self, basic_agent):
+        """Test that branches share the history copy-on-write."""
+        session = basic_agent.create_session()
+        model = basic_agent.llm._create_decision_model(
+            current_step=session.current_step,
+            current_step_tools=basic_agent.compiled["start"].tools,
+        )
+        basic_agent.llm.set_response(model(reasoning=["r"], action="RESPOND", response="Hi"))
+        session.next("Hello")
+        before = list(session.memory.context)
+
+        branches = [session.fork() for _ in range(3)]
+        assert all(b.memory.context is session.memory.context for b in branches)
+        assert len({b.session_id for b in branches} | {session.session_id}) == 4
+
+        for i, branch in enumerate(branches):
+            branch.next(f"Option {i}")
+
+        assert session.memory.context == before
+        for i, branch in enumerate(branches):
+            assert branch.memory.context[: len(before)] == before
+            assert branch.memory.context[len(before)].content == f"Option {i}"
+
+    def test_fork_diverges_in_steps_and_flow_context(self, basic_agent):
+        """Test that moving or changing flow context in a branch leaves the parent alone."""
+        from nomos.models.flow import FlowContext
+
+        session = basic_agent.create_session()
+        session.state_machine.flow_context = FlowContext(
+            flow_id="f", entry_step="start", metadata={"tier": "gold"}
+        )
+        branch = session.fork()
+        model = basic_agent.llm._create_decision_model(
+            current_step=session.current_step,
+            current_step_tools=basic_agent.compiled["start"].tools,
+        )
+        basic_agent.llm.set_response(model(reasoning=["r"], action="MOVE", step_id="end"))
+
+        branch.next("Done", return_step=True)
+        branch.state_machine.flow_context.metadata["tier"] = "silver"
+
+        assert branch.current_step.step_id == "end"
+        assert session.current_step.step_id == "start"
+        assert session.state_machine.flow_context.metadata == {"tier": "gold"}
+        assert session.memory.context == []
+
+    def test_fork_inside_flow_isolates_flow_memory(self, basic_agent):
+        """Test that branches forked inside a flow do not share the flow memory."""
+        from nomos.llms import LLMConfig
+        from nomos.models.flow import Flow, FlowConfig, FlowContext
+
+        config = FlowConfig(flow_id="f", enters=["start"], exits=["end"], components={"memory": {}})
+        with patch.object(LLMConfig, "get_llm", return_value=basic_agent.llm):
+            flow = Flow(config=config, steps=list(basic_agent.steps.values()))
+        session = basic_agent.create_session()
+        session.state_machine.current_flow = flow
+        session.state_machine.flow_context = FlowContext(flow_id="f", entry_step="start")
+        model = basic_agent.llm._create_decision_model(
+            current_step=session.current_step,
+            current_step_tools=basic_agent.compiled["start"].tools,
+        )
+        basic_agent.llm.set_response(model(reasoning=["r"], action="RESPOND", response="Hi"))
+        session.next("Hello")
+        before = list(flow.get_memory().memory.context)
+
+        branches = [session.fork() for _ in range(2)]
+        for i, branch in enumerate(branches):
+            branch.next(f"Option {i}")
+
+        assert flow.get_memory().memory.context == before
+        assert flow.get_memory().memory.retriever.context == [str(item) for item in before]
+        for i, branch in enumerate(branches):
+            context = branch.state_machine.current_flow.get_memory().memory.context
+            assert context[: len(before)] == before
+            assert [
+                e.content for e in context[len(before) :] if getattr(e, "type", "") == "user"
+            ] == [f"Option {i}"]
+
+
+class TestAgentPool:
+    """Test running turns in worker processes."""
+
+    def test_turns_run_in_workers(self, basic_agent):
+        """Test that stateless turns run in forked workers with the preloaded agent."""
+        model = basic_agent.llm._create_decision_model(
+            current_step=basic_agent.steps["start"],
+            current_step_tools=basic_agent.compiled["start"].tools,
+        )
+        basic_agent.llm.set_response(model(reasoning=["r"], action="RESPOND", response="Hi"))
+
+        with AgentPool(basic_agent, workers=2) as pool:
+            first = pool.next("Hello")
+            state = State.model_validate(first["state"])
+            second = pool.next("Again", session_data=state.model_dump_json())
+            pids = {pool.run(_worker_pid) for _ in range(4)}
+
+        assert first["decision"]["response"] == "Hi"
+        assert [e["content"] for e in second["state"]["history"] if e.get("type") == "user"] == [
+            "Hello",
+            "Again",
+        ]
+        assert os.getpid() not in pids
+
+    @pytest.mark.asyncio
+    async def test_async_turn(self, basic_agent):
+        """Test awaiting a turn run in a worker."""
+        model = basic_agent.llm._create_decision_model(
+            current_step=basic_agent.steps["start"],
+            current_step_tools=basic_agent.compiled["start"].tools,
+        )
+        basic_agent.llm.set_response(model(reasoning=["r"], action="RESPOND", response="Hi"))
+
+        with AgentPool(basic_agent, workers=1) as pool:
+            res = await pool.anext("Hello")
+
+        assert res["decision"]["response"] == "Hi"
+
+    def test_rate_limit_split_between_workers(self, basic_agent):
+        """Test that the workers together stay under the agent's LLM rate limit."""
+        basic_agent.rate_limiter = RateLimiter(per_minute=600)
+
+        with AgentPool(basic_agent, workers=3) as pool:
+            limits = [pool.run(_worker_rate_limit) for _ in range(6)]
+
+        assert limits == [pytest.approx(200)] * 6
+        assert basic_agent.rate_limiter.per_minute == pytest.approx(600)
+
+
+def _worker_rate_limit(agent: Agent) -> float:
+    """Return the rate limit of the pool worker's agent."""
+    return agent.rate_limiter.per_minute
+
+
+def _worker_pid(agent: Agent) -> int:
+    """Return the process ID of the pool worker."""
+    return os.getpid()
+
+
+class TestSessionHydration:
+    """Test reusing session shells for stateless requests."""
+
+    def _respond(self, agent, text: str) -> None:
+        decision_model = agent.llm._create_decision_model(
+            current_step=agent.steps["start"],
+            current_step_tools=agent.compiled["start"].tools,
+        )
+        agent.llm.set_response(
+            decision_model(reasoning=["Reply"], action=Action.RESPOND.value, response=text)
+        )
+
+    def test_stateless_requests_reuse_session_shell(self, basic_agent):
+        """Test that stateless requests hydrate a pooled session instead of building one."""
+        first_state = State(
+            session_id="first", current_step_id="start", history=[Event(type="user", content="a")]
+        )
+        second_state = State(session_id="second", current_step_id="start", history=[])
+
+        with patch.object(basic_agent, "create_session", wraps=basic_agent.create_session) as spy:
+            self._respond(basic_agent, "One")
+            first = basic_agent.next("Hi", session_data=first_state)
+            self._respond(basic_agent, "Two")
+            second = basic_agent.next("Hello", session_data=second_state.model_dump())
+
+        assert spy.call_count == 1
+        assert first.state.session_id == "first"
+        assert second.state.session_id == "second"
+        # Nothing from the first conversation leaks into the second
+        contents = [item.content for item in second.state.history if isinstance(item, Event)]
+        assert contents == ["Hello", "Two"]
+
+    def test_session_pool_is_bounded(self, basic_agent):
+        """Test that no more idle shells than the pool size are kept."""
+        basic_agent.session_pool_size = 1
+        sessions = [basic_agent._get_session() for _ in range(3)]
+        for session in sessions:
+            basic_agent._release_session(session)
+
+        assert len(basic_agent._session_shells) == 1
+
+    def test_hydrate_resets_session(self, basic_agent):
+        """Test that hydrating a session drops the previous conversation."""
+        session = basic_agent.create_session()
+        session.memory.add(Event(type="user", content="old"))
+        session.state_machine.current_step_id = "end"
+        session.set_deferred_tools([Tool.from_function(lambda: None, name="extra")])
+
+        session.hydrate(None)
+
+        assert session.current_step.step_id == "start"
+        assert session.memory.context == []
+        assert session.deferred_tools == {}
+
+
+class TestNextMany:
+    """Test running many independent turns concurrently."""
+
+    @staticmethod
+    def _slow_responses(agent, delay: float) -> None:
+        decision_model = agent.llm._create_decision_model(
+            current_step=agent.steps["start"],
+            current_step_tools=agent.compiled["start"].tools,
+        )
+        agent.llm.set_response(
+            decision_model(reasoning=["Reply"], action=Action.RESPOND.value, response="Hi")
+        )
+        get_output = agent.llm.get_output
+
+        def slow_get_output(*args, **kwargs):
+            time.sleep(delay)
+            return get_output(*args, **kwargs)
+
+        agent.llm.get_output = slow_get_output
+
+    def test_next_many_runs_concurrently_in_order(self, basic_agent):
+        """Test that turns run concurrently and results keep the input order."""
+        self._slow_responses(basic_agent, 0.2)
+        inputs = [
+            (f"Hello {i}", State(session_id=f"s{i}", current_step_id="start", history=[]))
+            for i in range(8)
+        ]
+
+        start = time.monotonic()
+        results = basic_agent.next_many(inputs, concurrency=8)
+        duration = time.monotonic() - start
+
+        assert [res.state.session_id for res in results] == [f"s{i}" for i in range(8)]
+        assert all(res.decision.response == "Hi" for res in results)
+        # Sequential execution would take 1.6s
+        assert duration < 1.0
+
+    def test_next_many_return_exceptions(self, basic_agent):
+        """Test that failed turns are returned in place when requested."""
+        self._slow_responses(basic_agent, 0)
+        inputs = [("Hi", None), ("Hi", {"current_step_id": "missing"}), ("Hi", None)]
+
+        results = basic_agent.next_many(inputs, concurrency=2, return_exceptions=True)
+
+        assert isinstance(results[0], Response)
+        assert isinstance(results[1], Exception)
+        assert isinstance(results[2], Response)
+
+        with pytest.raises(Exception):
+            basic_agent.next_many(inputs, concurrency=2)
+
+    @pytest.mark.asyncio
+    async def test_anext_many_bounds_concurrency(self, basic_agent):
+        """Test that no more than ``concurrency`` turns run at once."""
+        running = 0
+        peak = 0
+        anext = basic_agent.anext
+
+        async def tracked_anext(*args, **kwargs):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            try:
+                await asyncio.sleep(0.05)
+                return await anext(*args, **kwargs)
+            finally:
+                running -= 1
+
+        self._slow_responses(basic_agent, 0)
+        basic_agent.anext = tracked_anext
+        results = [res async for res in basic_agent.anext_many([("Hi", None)] * 10, concurrency=3)]
+
+        assert len(results) == 10
+        assert peak == 3
+
+    def test_rate_limiter_spaces_out_decisions(self, basic_agent):
+        """Test that the shared rate limiter spaces out LLM decision requests."""
+        basic_agent.rate_limiter = RateLimiter(per_minute=600)  # one request per 0.1s
+        self._slow_responses(basic_agent, 0)
+
+        start = time.monotonic()
+        basic_agent.next_many([("Hi", None)] * 4, concurrency=4)
+
+        assert time.monotonic() - start >= 0.3
+
+
+class TestTape:
+    """Test recording and replaying a conversation."""
+
+    @staticmethod
+    def _record(agent, session, path):
+        model = agent.llm._create_decision_model(
+            current_step=session.current_step,
+            current_step_tools=agent.compiled["start"].tools,
+        )
+        agent.llm.set_response(
+            model(
+                reasoning=["Use tool"],
+                action=Action.TOOL_CALL.value,
+                tool_call={"tool_name": "test_tool", "tool_kwargs": {"arg0": "x"}},
+            )
+        )
+        agent.llm.set_response(
+            model(reasoning=["Done"], action=Action.RESPOND.value, response="Done"),
+            append=True,
+        )
+        with session.record(str(path)) as tape:
+            res = session.next("Use the tool")
+        return res, tape
+
+    def test_replay_without_llm_or_tools(self, basic_agent, tmp_path, monkeypatch):
+        """Test that a recorded conversation replays with zero LLM or tool calls."""
+        path = tmp_path / "tape.jsonl.gz"
+        recorded, tape = self._record(basic_agent, basic_agent.create_session(), path)
+        assert [entry["kind"] for entry in tape.entries] == ["llm", "tool", "llm"]
+
+        def fail(*args, **kwargs):
+            raise AssertionError("No calls expected during replay")
+
+        monkeypatch.setattr(basic_agent.llm, "get_output", fail)
+        monkeypatch.setattr(Tool, "run", fail)
+        session = basic_agent.create_session()
+        with session.replay(str(path)):
+            replayed = session.next("Use the tool")
+
+        assert replayed.decision == recorded.decision
+        assert replayed.tool_output == recorded.tool_output
+        assert session.llm_dict["global"] is basic_agent.llm
+
+    def test_caches_bypassed_while_recording(self, basic_agent, tmp_path):
+        """Test that a turn recorded with warm caches still replays against cold ones."""
+        basic_agent.steps["start"].overrides = StepOverrides(cache=True, answer_cache=True)
+        basic_agent.response_cache = ResponseCache()
+        basic_agent.answer_cache = AnswerCache(auto_approve=True)
+        self._record(basic_agent, basic_agent.create_session(), tmp_path / "warm.jsonl")
+        _, tape = self._record(basic_agent, basic_agent.create_session(), tmp_path / "t.jsonl")
+        assert [entry["kind"] for entry in tape.entries] == ["llm", "tool", "llm"]
+
+        basic_agent.response_cache = ResponseCache()
+        basic_agent.answer_cache = AnswerCache(auto_approve=True)
+        session = basic_agent.create_session()
+        with session.replay(tape):
+            assert session.next("Use the tool").decision.response == "Done"
+
+    def test_replay_miss_raises(self, basic_agent, tmp_path):
+        """Test that requests missing from the tape raise instead of calling out."""
+        _, tape = self._record(basic_agent, basic_agent.create_session(), tmp_path / "t.jsonl")
+        session = basic_agent.create_session()
+        with session.replay(tape):
+            with pytest.raises(TapeMissError):
+                session.llm.get_output(
+                    messages=[Message(role="user", content="Not recorded")],
+                    response_format=Summary,
+                )
+
+    def test_tool_errors_replayed(self, basic_agent):
+        """Test that recorded tool errors are raised again on replay."""
+
+        def failing(*args, **kwargs):
+            raise FallbackError("down", "Apologize")
+
+        session = basic_agent.create_session()
+        tool = session._get_tool("test_tool")
+        with patch.object(tool, "function", failing):
+            with session.record() as tape:
+                with pytest.raises(FallbackError):
+                    session._run_tool("test_tool", {"arg0": "x"})
+
+        with session.replay(tape):
+            with pytest.raises(FallbackError) as exc:
+                session._run_tool("test_tool", {"arg0": "x"})
+        assert exc.value.fallback == "Apologize"
+
+    @pytest.mark.asyncio
+    async def test_async_embedding_round_trip(self, mock_llm):
+        """Test that async embeddings are served from the tape."""
+        tape = Tape()
+        vector = await TapeLLM(mock_llm, tape).aembed_text("hello")
+        mock_llm.embed_text = Mock(side_effect=AssertionError("No calls expected"))
+        replayed = await TapeLLM(mock_llm, Tape(tape.entries, mode="replay")).aembed_text("hello")
+        assert replayed == vector
+
+
+class TestAgentTool:
+    """Test delegating to another agent in the same process."""
+
+    def _router(self, basic_agent, **kwargs):
+        """Build a router agent delegating to the basic agent."""
+        specialist = basic_agent.as_tool("specialist", "Handles refunds", **kwargs)
+        router = Agent(
+            llm=type(basic_agent.llm)(),
+            name="router",
+            steps=[Step(step_id="start", description="Route", available_tools=["specialist"])],
+            start_step_id="start",
+            tools=[specialist],
+        )
+        model = router.llm._create_decision_model(
+            current_step=router.steps["start"], current_step_tools=router.compiled["start"].tools
+        )
+        delegate = basic_agent.llm._create_decision_model(
+            current_step=basic_agent.steps["start"],
+            current_step_tools=basic_agent.compiled["start"].tools,
+        )
+        basic_agent.llm.set_response(
+            delegate(reasoning=["r"], action="RESPOND", response="Refund approved")
+        )
+        return router, model, specialist.function.__self__
+
+    def _delegate(self, router, model, query):
+        """Queue a router decision delegating the query, then a response."""
+        router.llm.set_response(
+            model(
+                reasoning=["Ask the specialist"],
+                action="TOOL_CALL",
+                tool_call={"tool_name": "specialist", "tool_kwargs": {"query": query}},
+            )
+        )
+        router.llm.set_response(
+            model(reasoning=["Done"], action="RESPOND", response="Done"), append=True
+        )
+
+    def test_as_tool(self, basic_agent):
+        """Test that the agent is wrapped as a tool taking a query."""
+        tool = basic_agent.as_tool(budget=TurnBudget(max_llm_calls=2))
+
+        assert tool.name == "test_agent"
+        assert tool.description == "Test persona"
+        assert list(tool.get_args_model().model_fields) == ["query"]
+        assert isinstance(tool.function.__self__, AgentTool)
+        assert tool.function.__self__.budget.max_llm_calls == 2
+
+    def test_delegate_session_kept_per_caller(self, basic_agent):
+        """Test that each calling session keeps its own live delegate session."""
+        router, model, delegate = self._router(basic_agent)
+        session = router.create_session()
+
+        self._delegate(router, model, "Refund order 1")
+        session.next("I want a refund")
+        self._delegate(router, model, "Refund order 2")
+        session.next("And another one")
+        other = router.create_session()
+        self._delegate(router, model, "Refund order 3")
+        other.next("Refund please")
+
+        assert list(delegate.sessions) == [session.session_id, other.session_id]
+        queries = [
+            e.content
+            for e in delegate.sessions[session.session_id].memory.context
+            if isinstance(e, Event) and e.type == "user"
+        ]
+        assert queries == ["Refund order 1", "Refund order 2"]
+        assert any(
+            "Refund approved" in e.content
+            for e in session.memory.context
+            if isinstance(e, Event) and e.type == "tool"
+        )
+
+    @pytest.mark.asyncio
+    async def test_async_delegation(self, basic_agent):
+        """Test delegating from an async turn."""
+        router, model, delegate = self._router(basic_agent)
+        session = router.create_session()
+        self._delegate(router, model, "Refund order 1")
+
+        res = await session.anext("I want a refund")
+
+        assert res.decision.response == "Done"
+        assert session.session_id in delegate.sessions
+
+    def test_least_recently_used_sessions_dropped(self, basic_agent):
+        """Test that delegate sessions beyond the limit are dropped."""
+        delegate = AgentTool(basic_agent, max_sessions=2)
+        a = delegate.session("a")
+        delegate.session("b")
+        assert delegate.session("a") is a
+        delegate.session("c")
+
+        assert list(delegate.sessions) == ["a", "c"]
+        assert delegate.session(None) not in delegate.sessions.values()
@@ -1,3 +1,5 @@
+import pytest
+
 from nomos.llms.base import LLMBase
 from nomos.memory.base import Memory
 from nomos.memory.flow import FlowMemory, Retriver
@@ -56,3 +58,25 @@ def test_flow_memory_enter_appends_summary():
 
     assert len(memory.context) == 1
     assert isinstance(memory.context[0], Summary)
+
+
+@pytest.mark.asyncio
+async def test_memory_aadd_appends():
+    memory = Memory()
+    event = Event(type="user", content="hi")
+    await memory.aadd(event)
+    assert memory.context == [event]
+
+
+def test_memory_spawn_shares_clients():
+    llm = CounterLLM()
+    mem = PeriodicalSummarizationMemory(llm=llm, N_max=5)
+    mem.add(Event(type="user", content="hi"))
+
+    spawned = mem.spawn()
+
+    assert isinstance(spawned, PeriodicalSummarizationMemory)
+    assert spawned.llm is llm
+    assert spawned.N_max == 5
+    assert spawned.context == []
+    assert len(mem.context) == 1
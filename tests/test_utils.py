@@ -1,6 +1,7 @@
 from enum import Enum
 
 from nomos.utils.misc import join_urls
+from nomos.utils.streaming import ResponseStreamParser, decode_partial_json_string
 from nomos.utils.utils import create_base_model, create_enum
 
 
@@ -43,3 +44,27 @@ class TestJoinUrls:
         """Test joining multiple URL components."""
         result = join_urls("https://example.com", "api", "v1", "tools")
         assert result == "https://example.com/api/v1/tools"
+
+
+class TestResponseStreamParser:
+    """Test extracting RESPOND text from streamed decision JSON."""
+
+    def test_streams_response_text(self):
+        """Test that response text is emitted incrementally once the action is known."""
+        raw = '{"reasoning": ["say hi"], "action": "RESPOND", "response": "Hello \\"there\\"\\n!"}'
+        parser = ResponseStreamParser()
+        deltas = [parser.feed(raw[i : i + 3]) for i in range(0, len(raw), 3)]
+        assert "".join(deltas) == 'Hello "there"\n!'
+        assert len([d for d in deltas if d]) > 1
+
+    def test_ignores_other_actions(self):
+        """Test that nothing is emitted for non-RESPOND decisions."""
+        parser = ResponseStreamParser()
+        assert parser.feed('{"reasoning": [], "action": "MOVE", "response": "x", ') == ""
+        assert parser.feed('"step_id": "end"}') == ""
+
+    def test_holds_back_partial_escapes(self):
+        """Test that cut-off escape sequences wait for more input."""
+        assert decode_partial_json_string("ab\\") == ("ab", False)
+        assert decode_partial_json_string("ab\\u00e") == ("ab", False)
+        assert decode_partial_json_string('ab\\u00e9"') == ("ab\u00e9", True)